@@ -11,9 +11,18 @@ class BaseApplicationError(Exception):
 
 
 class InvalidCredentialsError(BaseApplicationError):
-    """Raised when authentication credentials are invalid."""
-
-    def __init__(self, message: str = "Invalid email or password"):
+    """Raised when authentication credentials are invalid.
+
+    ``reason`` tells internal consumers such as the traffic recorder why
+    the credentials were rejected; it is never shown to the client.
+    """
+
+    def __init__(
+        self,
+        message: str = "Invalid email or password",
+        reason: str | None = None,
+    ):
+        self.reason = reason
         super().__init__(message, code="INVALID_CREDENTIALS")
 
 
@@ -37,3 +46,17 @@ class ValidationError(BaseApplicationError):
     def __init__(self, message: str, field: str | None = None):
         self.field = field
         super().__init__(message, code="VALIDATION_ERROR")
+
+
+class DeadlineExceededError(BaseApplicationError):
+    """Raised when a request runs past its deadline."""
+
+    def __init__(self, message: str = "Request deadline exceeded"):
+        super().__init__(message, code="DEADLINE_EXCEEDED")
+
+
+class CircuitOpenError(BaseApplicationError):
+    """Raised when a dependency's circuit breaker is rejecting calls."""
+
+    def __init__(self, message: str = "Service temporarily unavailable"):
+        super().__init__(message, code="CIRCUIT_OPEN")
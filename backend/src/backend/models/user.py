@@ -2,11 +2,48 @@
 
 from dataclasses import dataclass
 from datetime import datetime
+from operator import attrgetter
+from typing import TypedDict, cast
+
+
+class UserUpdate(TypedDict, total=False):
+    """Partial update of a user; only the keys present are written."""
+
+    email: str
+    name: str
+    hashed_password: str
+    is_active: bool
+    updated_at: datetime | None
+    last_login: datetime | None
+
+
+UPDATABLE_FIELDS = frozenset(UserUpdate.__annotations__)
+_TRACKED_FIELDS = tuple(UserUpdate.__annotations__)
+_tracked_values = attrgetter(*_TRACKED_FIELDS)
+
+
+def merge_updates(*updates: UserUpdate) -> UserUpdate:
+    """Merge pending updates into one, later values winning.
+
+    Args:
+        *updates: Updates in the order they were made
+
+    Returns:
+        A single update covering every field touched
+    """
+    merged: UserUpdate = {}
+    for update in updates:
+        merged.update(update)
+    return merged
 
 
 @dataclass
 class User:
-    """User model representing an authenticated user."""
+    """User model representing an authenticated user.
+
+    Updatable fields are compared against their values at load, so
+    callers can write back only what changed with ``changes()``.
+    """
 
     id: str
     email: str
@@ -17,6 +54,36 @@ class User:
     updated_at: datetime | None = None
     last_login: datetime | None = None
 
+    def __post_init__(self) -> None:
+        """Remember the loaded values of the updatable fields."""
+        self._loaded: tuple[object, ...] = _tracked_values(self)
+
+    @property
+    def dirty_fields(self) -> frozenset[str]:
+        """Updatable fields changed since load or the last ``mark_clean``."""
+        return frozenset(self.changes())
+
+    def changes(self) -> UserUpdate:
+        """Return the changed updatable fields as a partial update.
+
+        Returns:
+            UserUpdate holding only fields whose value differs from load
+        """
+        return cast(
+            "UserUpdate",
+            {
+                name: value
+                for name, value, loaded in zip(
+                    _TRACKED_FIELDS, _tracked_values(self), self._loaded, strict=True
+                )
+                if value != loaded
+            },
+        )
+
+    def mark_clean(self) -> None:
+        """Treat the current values as loaded, e.g. after they were persisted."""
+        self._loaded = _tracked_values(self)
+
     def to_dict(self) -> dict[str, str | bool | None]:
         """Convert user to dictionary representation."""
         return {
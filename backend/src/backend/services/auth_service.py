@@ -1,20 +1,27 @@
 """Authentication service for user login and token management."""
 
+import dataclasses
 import re
 from dataclasses import dataclass
 from datetime import UTC, datetime
+from typing import Literal
 
 from backend.exceptions import (
+    BaseApplicationError,
     InvalidCredentialsError,
     TokenExpiredError,
     ValidationError,
 )
 from backend.models.user import User
+from backend.services.deadline import check_deadline, within_deadline
 from backend.services.protocols import (
+    BreachedPasswordProtocol,
     DatabaseProtocol,
     EmailServiceProtocol,
     TokenServiceProtocol,
 )
+from backend.services.tracing import span, traced
+from backend.services.traffic import TrafficRecorder, recorded
 
 
 @dataclass
@@ -28,6 +35,43 @@ class LoginResult:
     message: str | None = None
 
 
+@dataclass(frozen=True, slots=True)
+class LoginFailure:
+    """Rejected login attempt, carrying the matching exception's code.
+
+    ``reason`` separates failures that share a public code and message,
+    such as an unknown email and a wrong password, for internal consumers
+    like the traffic recorder. It is ignored when comparing failures.
+    """
+
+    code: str
+    message: str
+    field: str | None = None
+    success: Literal[False] = False
+    reason: str | None = dataclasses.field(default=None, compare=False)
+
+    def to_exception(self) -> BaseApplicationError:
+        """Return the exception ``login`` raises for this failure."""
+        if self.code == "VALIDATION_ERROR":
+            return ValidationError(self.message, field=self.field)
+        return InvalidCredentialsError(self.message, reason=self.reason)
+
+
+INVALID_CREDENTIALS = LoginFailure("INVALID_CREDENTIALS", "Invalid email or password")
+UNKNOWN_EMAIL = LoginFailure(
+    "INVALID_CREDENTIALS", "Invalid email or password", reason="USER_NOT_FOUND"
+)
+ACCOUNT_DEACTIVATED = LoginFailure(
+    "INVALID_CREDENTIALS", "Account has been deactivated"
+)
+EMAIL_REQUIRED = LoginFailure("VALIDATION_ERROR", "Email is required", "email")
+INVALID_EMAIL = LoginFailure("VALIDATION_ERROR", "Invalid email format", "email")
+PASSWORD_REQUIRED = LoginFailure("VALIDATION_ERROR", "Password is required", "password")
+
+# Simple email regex pattern
+_EMAIL_PATTERN = re.compile(r"^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$")
+
+
 @dataclass
 class PasswordResetResult:
     """Result of a password reset request."""
@@ -46,13 +90,22 @@ class TokenValidationResult:
 
 
 class AuthService:
-    """Service for handling authentication operations."""
+    """Service for handling authentication operations.
+
+    Every dependency call honours the deadline set with
+    ``backend.services.deadline.deadline`` and raises
+    ``DeadlineExceededError`` once it has passed. Public methods and
+    dependency calls are recorded as ``backend.services.tracing`` spans,
+    and public calls are logged to ``recorder`` when one is given.
+    """
 
     def __init__(
         self,
         database: DatabaseProtocol,
         token_service: TokenServiceProtocol,
         email_service: EmailServiceProtocol,
+        breached_passwords: BreachedPasswordProtocol | None = None,
+        recorder: TrafficRecorder | None = None,
     ):
         """Initialize the authentication service.
 
@@ -60,11 +113,18 @@ class AuthService:
             database: Database service for user operations
             token_service: Service for token operations
             email_service: Service for sending emails
+            breached_passwords: Optional breach corpus checked by
+                validate_password_strength
+            recorder: Optional traffic recorder for capture and replay
         """
         self.database = database
         self.token_service = token_service
         self.email_service = email_service
+        self.breached_passwords = breached_passwords
+        self.recorder = recorder
 
+    @recorded("login", key="email")
+    @traced("AuthService.login")
     async def login(self, email: str, password: str) -> LoginResult:
         """Authenticate a user with email and password.
 
@@ -79,32 +139,69 @@ class AuthService:
             ValidationError: If email or password format is invalid
             InvalidCredentialsError: If credentials are invalid
         """
+        result = await self._login(email, password)
+        if isinstance(result, LoginFailure):
+            raise result.to_exception()
+        return result
+
+    @recorded("try_login", key="email")
+    @traced("AuthService.try_login")
+    async def try_login(self, email: str, password: str) -> LoginResult | LoginFailure:
+        """Authenticate a user, returning rejections instead of raising them.
+
+        Rejected logins return one of a few shared, immutable
+        ``LoginFailure`` instances, so a flood of bad credentials costs no
+        exception construction or traceback capture. Dependency errors,
+        such as ``DeadlineExceededError``, still raise.
+
+        Args:
+            email: User's email address
+            password: User's password
+
+        Returns:
+            LoginResult with tokens if successful, LoginFailure otherwise
+        """
+        return await self._login(email, password)
+
+    async def _login(self, email: str, password: str) -> LoginResult | LoginFailure:
+        """Run a login attempt shared by ``login`` and ``try_login``."""
         # Validate email and password
-        self._validate_email(email)
-        self._validate_password(password)
+        failure = self._check_email(email) or self._check_password(password)
+        if failure is not None:
+            return failure
 
         # Get user by email
-        user = await self.database.get_user_by_email(email)
+        with span("database.get_user_by_email"):
+            user = await within_deadline(self.database.get_user_by_email(email))
         if not user:
-            raise InvalidCredentialsError()
+            return UNKNOWN_EMAIL
 
         # Check if user is active
         if not user.is_active:
-            raise InvalidCredentialsError("Account has been deactivated")
+            return ACCOUNT_DEACTIVATED
 
         # Verify password
-        if not self.token_service.verify_password(password, user.hashed_password):
-            raise InvalidCredentialsError()
+        check_deadline()
+        with span("token_service.verify_password"):
+            verified = self.token_service.verify_password(
+                password, user.hashed_password
+            )
+        if not verified:
+            return INVALID_CREDENTIALS
 
-        # Update last login
-        await self.database.update_user(
-            user.id,
-            {"last_login": datetime.now(UTC)},
-        )
+        # Update last login, writing only that column
+        user.last_login = datetime.now(UTC)
+        with span("database.update_user"):
+            await within_deadline(self.database.update_user(user.id, user.changes()))
+        user.mark_clean()
 
         # Generate tokens
-        access_token = self.token_service.create_access_token(user.id, user.email)
-        refresh_token = self.token_service.create_refresh_token(user.id, user.email)
+        check_deadline()
+        with span("token_service.create_access_token"):
+            access_token = self.token_service.create_access_token(user.id, user.email)
+        check_deadline()
+        with span("token_service.create_refresh_token"):
+            refresh_token = self.token_service.create_refresh_token(user.id, user.email)
 
         return LoginResult(
             success=True,
@@ -113,6 +210,8 @@ class AuthService:
             user=user,
         )
 
+    @recorded("request_password_reset", key="email")
+    @traced("AuthService.request_password_reset")
     async def request_password_reset(self, email: str) -> PasswordResetResult:
         """Request a password reset for the given email.
 
@@ -123,22 +222,30 @@ class AuthService:
             PasswordResetResult indicating success
         """
         # Always return success to prevent user enumeration
-        user = await self.database.get_user_by_email(email)
+        with span("database.get_user_by_email"):
+            user = await within_deadline(self.database.get_user_by_email(email))
 
         if user:
             # Generate reset token and send email
-            reset_token = self.token_service.create_reset_token(user.id)
-            await self.email_service.send_reset_email(
-                email=user.email,
-                name=user.name,
-                reset_token=reset_token,
-            )
+            check_deadline()
+            with span("token_service.create_reset_token"):
+                reset_token = self.token_service.create_reset_token(user.id)
+            with span("email_service.send_reset_email"):
+                await within_deadline(
+                    self.email_service.send_reset_email(
+                        email=user.email,
+                        name=user.name,
+                        reset_token=reset_token,
+                    )
+                )
 
         return PasswordResetResult(
             success=True,
             message="Password reset email sent",
         )
 
+    @recorded("validate_token", key="token")
+    @traced("AuthService.validate_token")
     async def validate_token(self, token: str) -> TokenValidationResult:
         """Validate an authentication token.
 
@@ -152,13 +259,16 @@ class AuthService:
             TokenExpiredError: If token has expired
         """
         try:
-            payload = self.token_service.decode_token(token)
+            check_deadline()
+            with span("token_service.decode_token"):
+                payload = self.token_service.decode_token(token)
             user_id = payload.get("sub")
 
             if not user_id:
                 return TokenValidationResult(is_valid=False, error="Invalid token")
 
-            user = await self.database.get_user_by_id(user_id)
+            with span("database.get_user_by_id"):
+                user = await within_deadline(self.database.get_user_by_id(user_id))
             if not user:
                 return TokenValidationResult(is_valid=False, error="User not found")
 
@@ -169,6 +279,7 @@ class AuthService:
         except (ValueError, KeyError, TypeError) as e:
             return TokenValidationResult(is_valid=False, error=str(e))
 
+    @traced("AuthService.validate_password_strength")
     async def validate_password_strength(self, password: str) -> None:
         """Validate password meets security requirements.
 
@@ -195,31 +306,38 @@ class AuthService:
                 "Password must contain uppercase and lowercase letters"
             )
 
-    def _validate_email(self, email: str) -> None:
-        """Validate email format.
+        breached = self.breached_passwords
+        if breached is None:
+            return
+        with span("breached_passwords.is_breached"):
+            is_breached = breached.is_breached(password)
+        if is_breached:
+            raise ValidationError("Password has appeared in a data breach")
+
+    def _check_email(self, email: str) -> LoginFailure | None:
+        """Check email format without raising.
 
         Args:
-            email: Email to validate
+            email: Email to check
 
-        Raises:
-            ValidationError: If email format is invalid
+        Returns:
+            The failure to report, or None if the format is valid
         """
         if not email:
-            raise ValidationError("Email is required")
-
-        # Simple email regex pattern
-        email_pattern = r"^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$"
-        if not re.match(email_pattern, email):
-            raise ValidationError("Invalid email format")
+            return EMAIL_REQUIRED
+        if not _EMAIL_PATTERN.match(email):
+            return INVALID_EMAIL
+        return None
 
-    def _validate_password(self, password: str) -> None:
-        """Basic password validation for login.
+    def _check_password(self, password: str) -> LoginFailure | None:
+        """Basic password check for login, without raising.
 
         Args:
-            password: Password to validate
+            password: Password to check
 
-        Raises:
-            ValidationError: If password is empty
+        Returns:
+            The failure to report, or None if a password was given
         """
         if not password:
-            raise ValidationError("Password is required")
+            return PASSWORD_REQUIRED
+        return None
@@ -0,0 +1,234 @@
+"""Offline breached-password lookups backed by a memory-mapped hash file.
+
+File layout (all integers big-endian)::
+
+    header   magic "BPWD", version u16, prefix size u16, entry count u64
+    fanout   65536 x u64, cumulative entry count per leading two bytes
+    entries  sorted, de-duplicated truncated SHA-1 digests
+
+A lookup reads two fanout slots and binary-searches one bucket, so it
+touches a handful of pages and allocates nothing proportional to the
+corpus. Pages are file-backed and can be evicted by the OS at any time.
+"""
+
+import argparse
+import hashlib
+import heapq
+import mmap
+import os
+import struct
+import tempfile
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+from types import TracebackType
+from typing import IO, Self
+
+MAGIC = b"BPWD"
+VERSION = 1
+PREFIX_SIZE = 8
+FANOUT_SLOTS = 1 << 16
+
+_HEADER = struct.Struct(">4sHHQ")
+_FANOUT = struct.Struct(f">{FANOUT_SLOTS}Q")
+_SLOT = struct.Struct(">Q")
+_ENTRIES_OFFSET = _HEADER.size + _FANOUT.size
+
+
+def password_prefix(password: str, prefix_size: int = PREFIX_SIZE) -> bytes:
+    """Return the truncated SHA-1 digest used as the index key."""
+    digest = hashlib.sha1(password.encode(), usedforsecurity=False).digest()
+    return digest[:prefix_size]
+
+
+class BreachedPasswordIndex:
+    """Read-only view of a breached-password index file."""
+
+    def __init__(self, path: Path | str):
+        """Open and validate an index file.
+
+        Args:
+            path: Index file written by ``build_index``
+
+        Raises:
+            ValueError: If the file is not a supported index
+        """
+        with Path(path).open("rb") as file:
+            self._mm = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        if hasattr(mmap, "MADV_RANDOM"):
+            self._mm.madvise(mmap.MADV_RANDOM)
+
+        magic, version, prefix_size, count = _HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or version != VERSION:
+            self._mm.close()
+            raise ValueError("Not a breached-password index file")
+        if len(self._mm) != _ENTRIES_OFFSET + count * prefix_size:
+            self._mm.close()
+            raise ValueError("Breached-password index file is truncated")
+        self.prefix_size: int = prefix_size
+        self.count: int = count
+
+    def __enter__(self) -> Self:
+        """Return the index for use as a context manager."""
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        """Unmap the index file on exit."""
+        self.close()
+
+    def __len__(self) -> int:
+        """Return the number of entries in the index."""
+        return self.count
+
+    def close(self) -> None:
+        """Unmap the index file."""
+        self._mm.close()
+
+    def is_breached(self, password: str) -> bool:
+        """Check whether a password appears in the breach corpus.
+
+        Args:
+            password: Plain text password
+
+        Returns:
+            True if the password's hash prefix is in the index
+        """
+        return self.contains_prefix(password_prefix(password, self.prefix_size))
+
+    def contains_prefix(self, prefix: bytes) -> bool:
+        """Binary-search the fanout bucket of a hash prefix."""
+        mm, size = self._mm, self.prefix_size
+        slot = prefix[0] << 8 | prefix[1]
+        lo = _SLOT.unpack_from(mm, _HEADER.size + (slot - 1) * 8)[0] if slot else 0
+        hi = _SLOT.unpack_from(mm, _HEADER.size + slot * 8)[0]
+        while lo < hi:
+            mid = (lo + hi) // 2
+            offset = _ENTRIES_OFFSET + mid * size
+            entry = mm[offset : offset + size]
+            if entry < prefix:
+                lo = mid + 1
+            elif entry > prefix:
+                hi = mid
+            else:
+                return True
+        return False
+
+
+def _parse_line(line: str, prefix_size: int) -> bytes | None:
+    """Parse a ``SHA1HEX[:count]`` line into a hash prefix."""
+    text = line.strip()
+    if not text:
+        return None
+    digest = bytes.fromhex(text.partition(":")[0])
+    if len(digest) != 20:
+        msg = f"Not a SHA-1 hex digest: {text[:48]!r}"
+        raise ValueError(msg)
+    return digest[:prefix_size]
+
+
+def _sorted_runs(
+    prefixes: Iterator[bytes],
+    chunk_size: int,
+    workdir: Path,
+) -> list[Path]:
+    """Sort the input in bounded chunks and spill each to a run file."""
+    runs: list[Path] = []
+    while True:
+        chunk = [p for _, p in zip(range(chunk_size), prefixes, strict=False)]
+        if not chunk:
+            return runs
+        chunk.sort()
+        run = workdir / f"run-{len(runs)}.bin"
+        run.write_bytes(b"".join(chunk))
+        runs.append(run)
+
+
+def _read_run(file: IO[bytes], prefix_size: int) -> Iterator[bytes]:
+    """Yield fixed-size prefixes from a run file."""
+    while entry := file.read(prefix_size):
+        yield entry
+
+
+def build_index(
+    lines: Iterable[str],
+    dest: Path | str,
+    prefix_size: int = PREFIX_SIZE,
+    chunk_size: int = 1_000_000,
+) -> int:
+    """Stream-convert a raw hash list into an index file.
+
+    Input lines are ``SHA1HEX`` or ``SHA1HEX:count`` in any order. They are
+    sorted externally in runs of ``chunk_size`` entries, so memory use is
+    bounded regardless of corpus size. The index is written to a temporary
+    file beside ``dest`` and renamed over it, so workers that have the old
+    index mapped keep reading it intact.
+
+    Args:
+        lines: Raw hash list lines
+        dest: Path of the index file to write
+        prefix_size: Bytes of each SHA-1 digest to keep
+        chunk_size: Entries sorted in memory at a time
+
+    Returns:
+        Number of distinct entries written
+    """
+    if not 2 <= prefix_size <= 20:
+        raise ValueError("prefix_size must be between 2 and 20")
+    parsed = (_parse_line(line, prefix_size) for line in lines)
+    prefixes = (p for p in parsed if p is not None)
+    fanout = [0] * FANOUT_SLOTS
+    count = 0
+
+    target = Path(dest)
+    fd, tmp = tempfile.mkstemp(dir=target.parent, prefix=f".{target.name}.")
+    try:
+        with tempfile.TemporaryDirectory() as workdir, os.fdopen(fd, "wb") as out:
+            runs = _sorted_runs(prefixes, chunk_size, Path(workdir))
+            out.write(b"\0" * _ENTRIES_OFFSET)
+            files = [run.open("rb") for run in runs]
+            try:
+                previous = None
+                for entry in heapq.merge(*(_read_run(f, prefix_size) for f in files)):
+                    if entry == previous:
+                        continue
+                    out.write(entry)
+                    fanout[entry[0] << 8 | entry[1]] += 1
+                    previous = entry
+                    count += 1
+            finally:
+                for file in files:
+                    file.close()
+
+            for slot in range(1, FANOUT_SLOTS):
+                fanout[slot] += fanout[slot - 1]
+            out.seek(0)
+            out.write(_HEADER.pack(MAGIC, VERSION, prefix_size, count))
+            out.write(_FANOUT.pack(*fanout))
+        Path(tmp).replace(target)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+    return count
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Build an index file from a raw hash list on the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("source", type=Path, help="raw SHA1HEX[:count] hash list")
+    parser.add_argument("dest", type=Path, help="index file to write")
+    parser.add_argument("--prefix-size", type=int, default=PREFIX_SIZE)
+    parser.add_argument("--chunk-size", type=int, default=1_000_000)
+    args = parser.parse_args(argv)
+
+    with args.source.open(encoding="ascii") as source:
+        count = build_index(source, args.dest, args.prefix_size, args.chunk_size)
+    # Print statements are used for command line output
+    print(f"Wrote {count} entries to {args.dest}")  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,440 @@
+"""Circuit breakers with fast-fail fallbacks for the user store and email."""
+
+import asyncio
+import time
+from collections import Counter, deque
+from collections.abc import Awaitable, Callable
+from typing import Any, Literal
+
+from backend.exceptions import (
+    BaseApplicationError,
+    CircuitOpenError,
+    DeadlineExceededError,
+)
+from backend.models.user import User, UserUpdate
+from backend.services.deadline import remaining
+from backend.services.email_spool import EmailSpool
+from backend.services.protocols import DatabaseProtocol, EmailServiceProtocol
+from backend.services.snapshot import LookupKind
+from backend.services.update_buffer import PendingUserUpdates
+from backend.services.user_cache import UserCache
+
+type BreakerState = Literal["closed", "open", "half_open"]
+
+
+class BreakerMetrics:
+    """State gauges and transition counters for a set of circuit breakers."""
+
+    def __init__(self) -> None:
+        self.states: dict[str, BreakerState] = {}
+        self.transitions: Counter[tuple[str, BreakerState, BreakerState]] = Counter()
+
+    def record(self, name: str, old: BreakerState, new: BreakerState) -> None:
+        """Count a state transition of the breaker called ``name``."""
+        self.states[name] = new
+        self.transitions[(name, old, new)] += 1
+
+    def render(self) -> str:
+        """Return the metrics in Prometheus text exposition format."""
+        lines = ["# TYPE circuit_breaker_state gauge"]
+        for name, state in sorted(self.states.items()):
+            for candidate in ("closed", "open", "half_open"):
+                value = int(candidate == state)
+                lines.append(
+                    f'circuit_breaker_state{{name="{name}",state="{candidate}"}} '
+                    f"{value}"
+                )
+        lines.append("# TYPE circuit_breaker_transitions_total counter")
+        for (name, old, new), count in sorted(self.transitions.items()):
+            lines.append(
+                f'circuit_breaker_transitions_total{{name="{name}",from="{old}",'
+                f'to="{new}"}} {count}'
+            )
+        return "\n".join(lines) + "\n"
+
+
+class CircuitBreaker:
+    """Closed/open/half-open breaker driven by a rolling window of calls.
+
+    While closed, the breaker opens once at least ``min_calls`` calls in
+    the last ``window`` seconds have finished and either the share that
+    failed reaches ``failure_rate`` or the share slower than
+    ``slow_call_duration`` reaches ``slow_call_rate``. While open, calls
+    are rejected with ``CircuitOpenError`` without being started. After
+    ``open_duration`` seconds, up to ``half_open_calls`` trial calls are let
+    through; the breaker closes if they all succeed quickly and opens
+    again otherwise.
+
+    Exceptions listed in ``ignored`` are outcomes rather than faults and
+    count as successes. Running out of request deadline is always a
+    failure, whether the call is cancelled by ``within_deadline`` or raises
+    ``DeadlineExceededError`` itself; any other cancellation counts as a
+    slow call, since the caller stopped waiting for an answer.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        window: float = 10.0,
+        min_calls: int = 20,
+        failure_rate: float = 0.5,
+        slow_call_duration: float = 1.0,
+        slow_call_rate: float = 0.8,
+        open_duration: float = 30.0,
+        half_open_calls: int = 3,
+        ignored: tuple[type[Exception], ...] = (BaseApplicationError,),
+        metrics: BreakerMetrics | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Initialize the breaker in the closed state.
+
+        Args:
+            name: Dependency name used in errors and metrics
+            window: Seconds of call history considered
+            min_calls: Calls in the window needed before the breaker can open
+            failure_rate: Share of failed calls (0-1) that opens the breaker
+            slow_call_duration: Seconds after which a call counts as slow
+            slow_call_rate: Share of slow calls (0-1) that opens the breaker
+            open_duration: Seconds to reject calls before trying again
+            half_open_calls: Successful trial calls needed to close
+            ignored: Exception types that do not count as failures
+            metrics: Metrics to report state transitions to
+            clock: Monotonic time source, injectable for tests
+        """
+        self.name = name
+        self.window = window
+        self.min_calls = min_calls
+        self.failure_rate = failure_rate
+        self.slow_call_duration = slow_call_duration
+        self.slow_call_rate = slow_call_rate
+        self.open_duration = open_duration
+        self.half_open_calls = half_open_calls
+        self.ignored = ignored
+        self.metrics = metrics
+        self.clock = clock
+        self.state: BreakerState = "closed"
+        self._calls: deque[tuple[float, bool, bool]] = deque()
+        self._failures = 0
+        self._slow = 0
+        self._opened_at = 0.0
+        self._trials = 0
+        self._trial_successes = 0
+        self._generation = 0
+        if metrics is not None:
+            metrics.states[name] = self.state
+
+    async def call[T](self, operation: Callable[[], Awaitable[T]]) -> T:
+        """Run ``operation`` through the breaker.
+
+        Args:
+            operation: Zero-argument callable returning the awaitable to run
+
+        Returns:
+            The operation's result
+
+        Raises:
+            CircuitOpenError: If the breaker is rejecting calls
+        """
+        generation = self._admit()
+        started = self.clock()
+        failed = cancelled = False
+        try:
+            return await operation()
+        except asyncio.CancelledError:
+            left = remaining()
+            failed = left is not None and left <= 0
+            cancelled = True
+            raise
+        except DeadlineExceededError:
+            failed = True
+            raise
+        except self.ignored:
+            raise
+        except Exception:
+            failed = True
+            raise
+        finally:
+            self._record(
+                self.clock() - started, generation, failed=failed, slow=cancelled
+            )
+
+    def _admit(self) -> int:
+        """Reserve a call slot or raise ``CircuitOpenError``.
+
+        Returns:
+            The state generation the call was admitted in
+        """
+        if self.state == "open":
+            if self.clock() - self._opened_at < self.open_duration:
+                msg = f"{self.name} is unavailable"
+                raise CircuitOpenError(msg)
+            self._transition("half_open")
+        if self.state == "half_open":
+            if self._trials >= self.half_open_calls:
+                msg = f"{self.name} is recovering"
+                raise CircuitOpenError(msg)
+            self._trials += 1
+        return self._generation
+
+    def _record(
+        self,
+        duration: float,
+        generation: int,
+        *,
+        failed: bool,
+        slow: bool = False,
+    ) -> None:
+        """Add a finished call to the window and update the state."""
+        if generation != self._generation:
+            # Admitted before the last transition; its outcome is stale.
+            return
+        slow = slow or duration >= self.slow_call_duration
+        if self.state == "half_open":
+            if failed or slow:
+                self._transition("open")
+            else:
+                self._trial_successes += 1
+                if self._trial_successes >= self.half_open_calls:
+                    self._transition("closed")
+            return
+
+        now = self.clock()
+        self._calls.append((now, failed, slow))
+        self._failures += failed
+        self._slow += slow
+        while self._calls and self._calls[0][0] < now - self.window:
+            _, old_failed, old_slow = self._calls.popleft()
+            self._failures -= old_failed
+            self._slow -= old_slow
+        calls = len(self._calls)
+        if calls >= self.min_calls and (
+            self._failures >= self.failure_rate * calls
+            or self._slow >= self.slow_call_rate * calls
+        ):
+            self._transition("open")
+
+    def _transition(self, state: BreakerState) -> None:
+        """Move to ``state``, resetting the counters it starts from."""
+        old, self.state = self.state, state
+        if state == "open":
+            self._opened_at = self.clock()
+        self._calls.clear()
+        self._failures = self._slow = 0
+        self._trials = self._trial_successes = 0
+        self._generation += 1
+        if self.metrics is not None:
+            self.metrics.record(self.name, old, state)
+
+
+class BreakerDatabase:
+    """``DatabaseProtocol`` wrapper that fails fast while the store is down.
+
+    Every call goes through ``breaker``. Successful reads are cached; while
+    the breaker is open, reads are answered from ``cache`` with entries up
+    to ``stale_max_age`` seconds old, and writes are staged in ``pending``
+    for a later ``PendingUserUpdates.flush``. Without a fallback, the
+    ``CircuitOpenError`` is raised.
+    """
+
+    def __init__(
+        self,
+        database: DatabaseProtocol,
+        breaker: CircuitBreaker,
+        cache: UserCache | None = None,
+        stale_max_age: float | None = None,
+        pending: PendingUserUpdates | None = None,
+    ):
+        """Initialize the wrapper.
+
+        Args:
+            database: Database to protect
+            breaker: Breaker for this database
+            cache: Cache of read users to fall back on
+            stale_max_age: Oldest cached user served while open, in seconds;
+                None disables stale reads
+            pending: Buffer that takes writes while open
+        """
+        self.database = database
+        self.breaker = breaker
+        self.cache = cache
+        self.stale_max_age = stale_max_age
+        self.pending = pending
+
+    async def get_user_by_email(self, email: str) -> User | None:
+        """Get a user by email, serving a stale copy while open.
+
+        Args:
+            email: User's email address
+
+        Returns:
+            User object if found, None otherwise
+
+        Raises:
+            CircuitOpenError: If open and no stale copy is available
+        """
+        return await self._read("email", email)
+
+    async def get_user_by_id(self, user_id: str) -> User | None:
+        """Get a user by ID, serving a stale copy while open.
+
+        Args:
+            user_id: User's unique identifier
+
+        Returns:
+            User object if found, None otherwise
+
+        Raises:
+            CircuitOpenError: If open and no stale copy is available
+        """
+        return await self._read("id", user_id)
+
+    async def update_user(self, user_id: str, data: UserUpdate) -> None:
+        """Update user data, staging the write while open.
+
+        Args:
+            user_id: User's unique identifier
+            data: Fields to update
+
+        Raises:
+            CircuitOpenError: If open and no pending buffer is configured
+        """
+        try:
+            await self.breaker.call(lambda: self.database.update_user(user_id, data))
+        except CircuitOpenError:
+            if self.pending is None:
+                raise
+            self.pending.stage(user_id, data)
+        if self.cache is not None:
+            self.cache.apply(user_id, data)
+
+    async def create_user(self, user_data: dict[str, Any]) -> User:
+        """Create a user; creation has no fallback.
+
+        Args:
+            user_data: Dictionary containing user information
+
+        Returns:
+            Created user object
+
+        Raises:
+            CircuitOpenError: If open
+        """
+        return await self.breaker.call(lambda: self.database.create_user(user_data))
+
+    async def _read(self, kind: LookupKind, key: str) -> User | None:
+        """Read through the breaker, falling back to the cache while open."""
+        try:
+            if kind == "id":
+                user = await self.breaker.call(
+                    lambda: self.database.get_user_by_id(key)
+                )
+            else:
+                user = await self.breaker.call(
+                    lambda: self.database.get_user_by_email(key)
+                )
+        except CircuitOpenError:
+            stale = None
+            if self.cache is not None and self.stale_max_age is not None:
+                stale = self.cache.get(kind, key, max_age=self.stale_max_age)
+            if stale is None:
+                raise
+            return stale
+        if user is not None and self.cache is not None:
+            self.cache.put(user)
+        return user
+
+
+class BreakerEmailService:
+    """``EmailServiceProtocol`` wrapper that parks emails while open.
+
+    Every send goes through ``breaker``. While it is open, the email is
+    appended to ``spool`` instead and the call returns at once; run
+    ``deliver_parked`` once the provider has recovered.
+    """
+
+    def __init__(
+        self,
+        email_service: EmailServiceProtocol,
+        breaker: CircuitBreaker,
+        spool: EmailSpool,
+    ):
+        """Initialize the wrapper.
+
+        Args:
+            email_service: Email service to protect
+            breaker: Breaker for this email service
+            spool: Durable spool for emails sent while open
+        """
+        self.email_service = email_service
+        self.breaker = breaker
+        self.spool = spool
+
+    async def send_reset_email(
+        self,
+        email: str,
+        name: str,
+        reset_token: str,
+    ) -> None:
+        """Send a password reset email, or park it while open.
+
+        Args:
+            email: Recipient's email address
+            name: Recipient's name
+            reset_token: Password reset token
+        """
+        await self._send(
+            "send_reset_email",
+            {"email": email, "name": name, "reset_token": reset_token},
+        )
+
+    async def send_welcome_email(self, email: str, name: str) -> None:
+        """Send a welcome email, or park it while open.
+
+        Args:
+            email: Recipient's email address
+            name: Recipient's name
+        """
+        await self._send("send_welcome_email", {"email": email, "name": name})
+
+    async def send_verification_email(
+        self,
+        email: str,
+        name: str,
+        verification_token: str,
+    ) -> None:
+        """Send an email verification email, or park it while open.
+
+        Args:
+            email: Recipient's email address
+            name: Recipient's name
+            verification_token: Email verification token
+        """
+        await self._send(
+            "send_verification_email",
+            {"email": email, "name": name, "verification_token": verification_token},
+        )
+
+    async def deliver_parked(self) -> int:
+        """Send parked emails in order through the breaker.
+
+        Returns:
+            Number of emails delivered
+
+        Raises:
+            Exception: The error that stopped delivery; undelivered emails
+                stay parked
+        """
+        return await self.spool.drain(self._deliver)
+
+    async def _send(self, method: str, fields: dict[str, str]) -> None:
+        """Send through the breaker, parking the email if it is open."""
+        try:
+            await self._deliver(method, fields)
+        except CircuitOpenError:
+            await self.spool.park(method, fields)
+
+    async def _deliver(self, method: str, fields: dict[str, str]) -> None:
+        """Call ``method`` on the wrapped service through the breaker."""
+        send: Callable[..., Awaitable[None]] = getattr(self.email_service, method)
+        await self.breaker.call(lambda: send(**fields))
@@ -0,0 +1,75 @@
+"""Per-request deadlines propagated through a context variable."""
+
+import asyncio
+import time
+from collections.abc import Awaitable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from backend.exceptions import DeadlineExceededError
+
+_deadline: ContextVar[float | None] = ContextVar("deadline", default=None)
+
+
+@contextmanager
+def deadline(timeout: float) -> Iterator[None]:
+    """Bound everything run inside the block by ``timeout`` seconds.
+
+    Nested deadlines can only tighten the enclosing one, never extend it.
+
+    Args:
+        timeout: Seconds from now until the deadline
+    """
+    at = time.monotonic() + timeout
+    current = _deadline.get()
+    token = _deadline.set(at if current is None else min(current, at))
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def remaining() -> float | None:
+    """Return seconds left before the current deadline, if one is set."""
+    at = _deadline.get()
+    return None if at is None else at - time.monotonic()
+
+
+def check_deadline() -> None:
+    """Fail fast when the current deadline has already passed.
+
+    Raises:
+        DeadlineExceededError: If the deadline has passed
+    """
+    left = remaining()
+    if left is not None and left <= 0:
+        raise DeadlineExceededError()
+
+
+async def within_deadline[T](awaitable: Awaitable[T]) -> T:
+    """Await a dependency call, cancelling it at the current deadline.
+
+    Args:
+        awaitable: Call to await
+
+    Returns:
+        The call's result
+
+    Raises:
+        DeadlineExceededError: If the deadline passes before it completes
+    """
+    left = remaining()
+    if left is None:
+        return await awaitable
+    if left <= 0:
+        if asyncio.iscoroutine(awaitable):
+            awaitable.close()
+        raise DeadlineExceededError()
+    scope = asyncio.timeout(left)
+    try:
+        async with scope:
+            return await awaitable
+    except TimeoutError:
+        if not scope.expired():
+            raise
+        raise DeadlineExceededError() from None
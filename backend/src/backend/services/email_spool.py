@@ -0,0 +1,143 @@
+"""Durable local spool for emails that could not be sent yet."""
+
+import asyncio
+import json
+import os
+import tempfile
+import threading
+import time
+from collections.abc import Awaitable, Callable
+from pathlib import Path
+from typing import TypedDict
+
+SPOOLABLE_METHODS = frozenset(
+    {"send_reset_email", "send_welcome_email", "send_verification_email"}
+)
+
+
+class ParkedEmail(TypedDict):
+    """A spooled email as stored on disk."""
+
+    method: str
+    fields: dict[str, str]
+    at: float
+
+
+def _decode(line: str) -> ParkedEmail | None:
+    """Parse a spool line, or return None for a torn or corrupt one."""
+    try:
+        entry: ParkedEmail = json.loads(line)
+    except json.JSONDecodeError:
+        return None
+    return entry
+
+
+class EmailSpool:
+    """Append-only JSON-lines file of parked ``EmailServiceProtocol`` calls.
+
+    Each parked email is written and fsynced before ``park`` returns, so it
+    survives a crash. File writes run in a worker thread so parking does
+    not stall the event loop while the provider is down. The file is
+    created owner-only because it holds reset and verification tokens.
+    """
+
+    def __init__(self, path: Path | str):
+        """Initialize the spool.
+
+        Args:
+            path: Spool file, created on first use
+        """
+        self.path = Path(path)
+        self._file_lock = threading.Lock()
+        self._drain_lock = asyncio.Lock()
+
+    def __len__(self) -> int:
+        """Return the number of parked emails."""
+        return sum(entry is not None for entry in map(_decode, self._lines()))
+
+    async def park(self, method: str, fields: dict[str, str]) -> None:
+        """Durably append an email for later delivery.
+
+        Args:
+            method: ``EmailServiceProtocol`` method to call on delivery
+            fields: Keyword arguments for that method
+
+        Raises:
+            ValueError: If ``method`` is not an email-sending method
+        """
+        if method not in SPOOLABLE_METHODS:
+            msg = f"Cannot spool {method!r}"
+            raise ValueError(msg)
+        entry = ParkedEmail(method=method, fields=fields, at=time.time())
+        await asyncio.to_thread(self._append, json.dumps(entry))
+
+    async def drain(
+        self,
+        deliver: Callable[[str, dict[str, str]], Awaitable[None]],
+    ) -> int:
+        """Deliver parked emails oldest first and remove the delivered ones.
+
+        Emails parked while the drain is running are kept. Concurrent
+        drains run one after the other, so no email is delivered twice.
+
+        Args:
+            deliver: Called with each email's method name and fields
+
+        Returns:
+            Number of emails delivered
+
+        Raises:
+            Exception: The error that stopped delivery; the failed email and
+                everything after it stay parked
+        """
+        async with self._drain_lock:
+            consumed = delivered = 0
+            try:
+                for line in await asyncio.to_thread(self._lines):
+                    entry = _decode(line)
+                    if entry is not None:
+                        await deliver(entry["method"], entry["fields"])
+                        delivered += 1
+                    consumed += 1
+            finally:
+                if consumed:
+                    await asyncio.to_thread(self._discard, consumed)
+            return delivered
+
+    def _append(self, line: str) -> None:
+        """Append and fsync one spool line."""
+        with self._file_lock:
+            fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o600)
+            try:
+                os.write(fd, (line + "\n").encode())
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+
+    def _lines(self) -> list[str]:
+        """Return the raw spool lines."""
+        try:
+            return self.path.read_text(encoding="utf-8").splitlines()
+        except FileNotFoundError:
+            return []
+
+    def _discard(self, count: int) -> None:
+        """Atomically drop the first ``count`` entries.
+
+        Holds the file lock so a line appended meanwhile is not lost.
+        """
+        with self._file_lock:
+            self._rewrite(self._lines()[count:])
+
+    def _rewrite(self, remaining: list[str]) -> None:
+        """Replace the spool with ``remaining`` lines."""
+        fd, tmp = tempfile.mkstemp(dir=self.path.parent, prefix=f".{self.path.name}.")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as file:
+                file.writelines(line + "\n" for line in remaining)
+                file.flush()
+                os.fsync(file.fileno())
+            Path(tmp).replace(self.path)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
@@ -0,0 +1,244 @@
+"""Hedged reads for the user store."""
+
+import asyncio
+import itertools
+import math
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable, Sequence
+from typing import Any
+
+from backend.models.user import User, UserUpdate
+from backend.services.protocols import DatabaseProtocol, ReadRouterProtocol
+
+
+class LatencyTracker:
+    """Rolling window of observed latencies with cached percentiles."""
+
+    def __init__(self, window: int = 1000, min_samples: int = 20):
+        """Initialize the tracker.
+
+        Args:
+            window: Number of most recent samples to keep
+            min_samples: Samples needed before percentiles are reported
+        """
+        self.min_samples = min_samples
+        self._samples: deque[float] = deque(maxlen=window)
+        self._sorted: list[float] = []
+        self._stale = 0
+
+    def record(self, seconds: float) -> None:
+        """Add a latency sample."""
+        self._samples.append(seconds)
+        self._stale += 1
+
+    def percentile(self, quantile: float) -> float | None:
+        """Return the latency at ``quantile`` (0-1), or None if too few samples.
+
+        The sorted window is rebuilt at most every 1% of the window size
+        so the lookup stays cheap on the request path.
+        """
+        if len(self._samples) < self.min_samples:
+            return None
+        if self._stale * 100 >= (self._samples.maxlen or 1) or not self._sorted:
+            self._sorted = sorted(self._samples)
+            self._stale = 0
+        index = min(len(self._sorted) - 1, math.ceil(quantile * len(self._sorted)) - 1)
+        return self._sorted[max(index, 0)]
+
+
+class HedgeBudget:
+    """Token bucket that caps hedges to a fraction of requests.
+
+    Every request earns ``ratio`` tokens up to ``burst``; every hedge
+    spends one.
+    """
+
+    def __init__(self, ratio: float = 0.05, burst: float = 10.0):
+        self.ratio = ratio
+        self.burst = burst
+        self._tokens = burst
+
+    def on_request(self) -> None:
+        """Credit the budget for one request."""
+        self._tokens = min(self.burst, self._tokens + self.ratio)
+
+    def try_spend(self) -> bool:
+        """Spend one token for a hedge if available."""
+        if self._tokens < 1:
+            return False
+        self._tokens -= 1
+        return True
+
+
+class HedgedDatabase:
+    """``DatabaseProtocol`` wrapper that hedges slow reads.
+
+    Reads go to one backend, rotating between them. If a read has not
+    completed by the observed ``quantile`` latency and the budget allows,
+    a duplicate goes to the next backend; the first successful result
+    wins and the other call is cancelled and awaited. Writes go to the
+    primary.
+
+    Plain rotation ignores replica lag, read-your-writes pins and replica
+    load. To hedge over a ``ReplicatedDatabase``, pass it as ``primary`` so
+    writes still pin, and as ``router`` so the first read and the hedge
+    only go to databases allowed to serve the key and count towards their
+    outstanding requests::
+
+        HedgedDatabase(replicated, [], router=replicated)
+    """
+
+    def __init__(
+        self,
+        primary: DatabaseProtocol,
+        backends: Sequence[DatabaseProtocol],
+        quantile: float = 0.95,
+        budget: HedgeBudget | None = None,
+        tracker: LatencyTracker | None = None,
+        *,
+        router: ReadRouterProtocol | None = None,
+    ):
+        """Initialize the wrapper.
+
+        Args:
+            primary: Database that receives all writes
+            backends: Interchangeable databases to read from; may be empty
+                when ``router`` is given
+            quantile: Latency percentile after which a read is hedged
+            budget: Hedge budget, defaults to 5% of requests
+            tracker: Latency tracker, defaults to a 1000-sample window
+            router: Chooses the databases allowed to serve a read for a
+                user ID or email and runs reads on them; replaces rotation
+                over ``backends``
+        """
+        if not backends and router is None:
+            raise ValueError("At least one read backend is required")
+        self.primary = primary
+        self.backends = list(backends)
+        self.router = router
+        self.quantile = quantile
+        self.budget = budget or HedgeBudget()
+        self.tracker = tracker or LatencyTracker()
+        self.hedges_sent = 0
+        self._rotation = itertools.count()
+
+    async def get_user_by_email(self, email: str) -> User | None:
+        """Get a user by email with hedging.
+
+        Args:
+            email: User's email address
+
+        Returns:
+            User object if found, None otherwise
+        """
+        user, served_by = await self._hedged(
+            lambda db: db.get_user_by_email(email), email
+        )
+        if user is not None and self.router is not None:
+            allowed = self.router.read_backends(user.id)
+            if served_by not in allowed:
+                return await self._read_on(
+                    allowed[0], lambda db: db.get_user_by_email(email)
+                )
+        return user
+
+    async def get_user_by_id(self, user_id: str) -> User | None:
+        """Get a user by ID with hedging.
+
+        Args:
+            user_id: User's unique identifier
+
+        Returns:
+            User object if found, None otherwise
+        """
+        user, _ = await self._hedged(lambda db: db.get_user_by_id(user_id), user_id)
+        return user
+
+    async def update_user(self, user_id: str, data: UserUpdate) -> None:
+        """Update user data on the primary.
+
+        Args:
+            user_id: User's unique identifier
+            data: Fields to update
+        """
+        await self.primary.update_user(user_id, data)
+
+    async def create_user(self, user_data: dict[str, Any]) -> User:
+        """Create a user on the primary.
+
+        Args:
+            user_data: Dictionary containing user information
+
+        Returns:
+            Created user object
+        """
+        return await self.primary.create_user(user_data)
+
+    def _candidates(self, key: str) -> Sequence[DatabaseProtocol]:
+        """Return the backend for the first read, then the hedge target."""
+        if self.router is not None:
+            return self.router.read_backends(key)
+        start = next(self._rotation) % len(self.backends)
+        return [self.backends[start], self.backends[(start + 1) % len(self.backends)]]
+
+    async def _hedged[T](
+        self,
+        query: Callable[[DatabaseProtocol], Awaitable[T]],
+        key: str,
+    ) -> tuple[T, DatabaseProtocol]:
+        """Run a read, hedging it to a second backend when it is slow.
+
+        Returns:
+            The result and the backend that served it
+        """
+        self.budget.on_request()
+        candidates = self._candidates(key)
+        started = time.perf_counter()
+        tasks: dict[asyncio.Future[T], DatabaseProtocol] = {
+            asyncio.ensure_future(self._read_on(candidates[0], query)): candidates[0]
+        }
+        try:
+            delay = self.tracker.percentile(self.quantile)
+            backup = candidates[1] if len(candidates) > 1 else None
+            if backup not in (None, candidates[0]) and delay is not None:
+                done, _ = await asyncio.wait(tasks, timeout=delay)
+                if not done and self.budget.try_spend():
+                    hedge = asyncio.ensure_future(self._read_on(backup, query))
+                    tasks[hedge] = backup
+                    self.hedges_sent += 1
+            winner = await self._first_success(set(tasks))
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+        self.tracker.record(time.perf_counter() - started)
+        return winner.result(), tasks[winner]
+
+    def _read_on[T](
+        self,
+        database: DatabaseProtocol,
+        query: Callable[[DatabaseProtocol], Awaitable[T]],
+    ) -> Awaitable[T]:
+        """Run a read on a backend, through the router when there is one."""
+        if self.router is None:
+            return query(database)
+        return self.router.read_on(database, query)
+
+    @staticmethod
+    async def _first_success[T](tasks: set["asyncio.Future[T]"]) -> "asyncio.Future[T]":
+        """Return the first task to succeed, or raise the first error."""
+        pending = set(tasks)
+        error: BaseException | None = None
+        while pending:
+            done, pending = await asyncio.wait(
+                pending, return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in done:
+                exc = task.exception()
+                if exc is None:
+                    return task
+                error = error or exc
+        if error is None:
+            raise RuntimeError("No read was started")
+        raise error
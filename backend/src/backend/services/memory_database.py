@@ -0,0 +1,122 @@
+"""In-memory database adapter for local runs and tests."""
+
+import uuid
+from dataclasses import replace
+from datetime import UTC, datetime
+from typing import Any
+
+from backend.exceptions import UserNotFoundError, ValidationError
+from backend.models.user import UPDATABLE_FIELDS, User, UserUpdate
+
+
+class InMemoryDatabase:
+    """Dictionary-backed implementation of ``DatabaseProtocol``.
+
+    Users are copied on the way in and out so callers never share state
+    with the store, which mirrors how a real database adapter behaves.
+    """
+
+    def __init__(self) -> None:
+        self._users: dict[str, User] = {}
+        self._ids_by_email: dict[str, str] = {}
+
+    async def get_user_by_email(self, email: str) -> User | None:
+        """Get a user by their email address.
+
+        Args:
+            email: User's email address
+
+        Returns:
+            User object if found, None otherwise
+        """
+        user_id = self._ids_by_email.get(email)
+        if user_id is None:
+            return None
+        return replace(self._users[user_id])
+
+    async def get_user_by_id(self, user_id: str) -> User | None:
+        """Get a user by their ID.
+
+        Args:
+            user_id: User's unique identifier
+
+        Returns:
+            User object if found, None otherwise
+        """
+        user = self._users.get(user_id)
+        return replace(user) if user else None
+
+    async def update_user(self, user_id: str, data: UserUpdate) -> None:
+        """Update user data.
+
+        Args:
+            user_id: User's unique identifier
+            data: Fields to update
+
+        Raises:
+            UserNotFoundError: If no user has the given ID
+            ValidationError: If data contains fields that cannot be updated,
+                or the new email is already registered
+        """
+        user = self._users.get(user_id)
+        if user is None:
+            raise UserNotFoundError()
+        unknown = set(data) - UPDATABLE_FIELDS
+        if unknown:
+            msg = f"Unknown user fields: {sorted(unknown)}"
+            raise ValidationError(msg)
+
+        if "email" in data and data["email"] != user.email:
+            if data["email"] in self._ids_by_email:
+                raise ValidationError("Email already registered", field="email")
+            del self._ids_by_email[user.email]
+            self._ids_by_email[data["email"]] = user_id
+        self._users[user_id] = replace(user, **data)
+
+    async def create_user(self, user_data: dict[str, Any]) -> User:
+        """Create a new user.
+
+        Missing ``id`` and ``created_at`` values are generated.
+
+        Args:
+            user_data: Dictionary containing user information
+
+        Returns:
+            Created user object
+
+        Raises:
+            ValidationError: If the email or ID is already registered
+        """
+        data = {
+            "id": uuid.uuid4().hex,
+            "is_active": True,
+            "created_at": datetime.now(UTC),
+            **user_data,
+        }
+        if data["email"] in self._ids_by_email:
+            raise ValidationError("Email already registered", field="email")
+        if data["id"] in self._users:
+            raise ValidationError("User ID already exists", field="id")
+
+        user = User(**data)
+        self._users[user.id] = user
+        self._ids_by_email[user.email] = user.id
+        return replace(user)
+
+    async def list_users(self) -> list[User]:
+        """Return every stored user.
+
+        Returns:
+            Copies of all users in insertion order
+        """
+        return [replace(user) for user in self._users.values()]
+
+    async def delete_user(self, user_id: str) -> None:
+        """Delete a user if present.
+
+        Args:
+            user_id: User's unique identifier
+        """
+        user = self._users.pop(user_id, None)
+        if user is not None:
+            del self._ids_by_email[user.email]
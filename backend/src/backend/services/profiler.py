@@ -0,0 +1,203 @@
+"""On-demand sampling profiler for live workers.
+
+A background thread snapshots every thread's Python stack with
+``sys._current_frames`` and counts identical stacks. Output uses the
+collapsed-stack format read by flamegraph tools: one line per stack,
+frames from the root joined by ``;``, then the sample count. The
+``AuthService`` operation a sample was taken in is found from the frame
+names, since context variables of other threads cannot be read.
+"""
+
+import signal
+import sys
+import threading
+import time
+from collections import Counter
+from collections.abc import Callable
+from pathlib import Path
+from types import CodeType, FrameType
+from typing import Any
+
+
+class SamplingProfiler:
+    """Statistical profiler that can be started and stopped at runtime.
+
+    Each stack is rooted at its thread name, followed by an
+    ``op:<operation>`` frame when the sample falls inside a public
+    ``AuthService`` method.
+    """
+
+    def __init__(
+        self,
+        interval: float = 0.01,
+        max_depth: int = 128,
+        operation_prefix: str = "AuthService.",
+    ):
+        """Initialize a stopped profiler.
+
+        Args:
+            interval: Seconds between samples
+            max_depth: Innermost frames kept per stack
+            operation_prefix: Qualified-name prefix of the methods that
+                tag samples with an operation
+        """
+        self.interval = interval
+        self.max_depth = max_depth
+        self.operation_prefix = operation_prefix
+        self.samples = 0
+        self._stacks: Counter[str] = Counter()
+        self._labels: dict[CodeType, str] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._busy = 0.0
+        self._elapsed = 0.0
+        self._started_at = 0.0
+
+    @property
+    def running(self) -> bool:
+        """Whether the sampling thread is active."""
+        return self._thread is not None
+
+    @property
+    def overhead(self) -> float:
+        """Share of wall-clock time the sampler thread spent taking samples.
+
+        This is only the sampler's own busy time; it leaves out GIL
+        hand-offs and cache effects on the workers, so compare worker
+        throughput with and without the profiler for the full cost.
+        """
+        elapsed = self._elapsed
+        if self.running:
+            elapsed += time.perf_counter() - self._started_at
+        return self._busy / elapsed if elapsed else 0.0
+
+    def start(self) -> None:
+        """Start sampling in a daemon thread; no-op if already running."""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._started_at = time.perf_counter()
+        self._thread = threading.Thread(
+            target=self._run, name="sampling-profiler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop sampling and wait for the sampling thread to exit."""
+        thread, self._thread = self._thread, None
+        if thread is None:
+            return
+        self._stop.set()
+        thread.join()
+        self._elapsed += time.perf_counter() - self._started_at
+
+    def toggle(self, dump_to: Path | str | None = None) -> bool:
+        """Start a stopped profiler, or stop a running one and dump it.
+
+        Args:
+            dump_to: File the collapsed stacks are written to on stop;
+                samples are cleared after writing
+
+        Returns:
+            Whether the profiler is running afterwards
+        """
+        if not self.running:
+            self.start()
+            return True
+        self.stop()
+        if dump_to is not None:
+            self.dump(dump_to)
+            self.clear()
+        return False
+
+    def clear(self) -> None:
+        """Discard collected samples and overhead accounting."""
+        with self._lock:
+            self._stacks.clear()
+            self.samples = 0
+            self._busy = self._elapsed = 0.0
+
+    def collapsed(self) -> list[str]:
+        """Return collected stacks in collapsed-stack format, most common first."""
+        with self._lock:
+            return [f"{stack} {count}" for stack, count in self._stacks.most_common()]
+
+    def dump(self, path: Path | str) -> int:
+        """Write collected stacks to a file.
+
+        Args:
+            path: File to write collapsed stacks to
+
+        Returns:
+            Number of distinct stacks written
+        """
+        lines = self.collapsed()
+        Path(path).write_text("".join(line + "\n" for line in lines), encoding="utf-8")
+        return len(lines)
+
+    def _run(self) -> None:
+        """Sample until stopped."""
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            started = time.perf_counter()
+            self._sample(own)
+            self._busy += time.perf_counter() - started
+
+    def _sample(self, own: int) -> None:
+        """Record the current stack of every thread but the sampler."""
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        stacks = [
+            self._collapse(frame, names.get(ident, str(ident)))
+            for ident, frame in sys._current_frames().items()
+            if ident != own
+        ]
+        with self._lock:
+            self._stacks.update(stacks)
+            self.samples += 1
+
+    def _collapse(self, frame: FrameType, thread_name: str) -> str:
+        """Render one thread's stack, root first."""
+        frames: list[str] = []
+        operation = None
+        current: FrameType | None = frame
+        while current is not None:
+            code = current.f_code
+            if len(frames) < self.max_depth:
+                label = self._labels.get(code)
+                if label is None:
+                    module = current.f_globals.get("__name__", "?")
+                    label = self._labels[code] = f"{module}:{code.co_qualname}"
+                frames.append(label)
+            if code.co_qualname.startswith(
+                self.operation_prefix
+            ) and not code.co_name.startswith("_"):
+                operation = code.co_name
+            current = current.f_back
+        root = [thread_name] if operation is None else [thread_name, f"op:{operation}"]
+        return ";".join(root + frames[::-1])
+
+
+def install_signal_toggle(
+    profiler: SamplingProfiler,
+    dump_to: Path | str,
+    signum: int = signal.SIGUSR2,
+) -> Callable[[int, FrameType | None], Any] | int | None:
+    """Toggle ``profiler`` whenever the process receives ``signum``.
+
+    The first signal starts sampling; the next stops it and writes the
+    collapsed stacks to ``dump_to``. Must be called from the main thread.
+
+    Args:
+        profiler: Profiler to control
+        dump_to: File written each time sampling stops
+        signum: Signal to listen for
+
+    Returns:
+        The previous handler, for restoring with ``signal.signal``
+    """
+
+    def handle(_signum: int, _frame: FrameType | None) -> None:
+        profiler.toggle(dump_to)
+
+    return signal.signal(signum, handle)
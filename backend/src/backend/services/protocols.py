@@ -1,8 +1,9 @@
 """Protocol definitions for service interfaces."""
 
+from collections.abc import Awaitable, Callable, Sequence
 from typing import Any, Protocol
 
-from backend.models.user import User
+from backend.models.user import User, UserUpdate
 
 
 class DatabaseProtocol(Protocol):
@@ -30,12 +31,12 @@ class DatabaseProtocol(Protocol):
         """
         ...
 
-    async def update_user(self, user_id: str, data: dict[str, Any]) -> None:
+    async def update_user(self, user_id: str, data: UserUpdate) -> None:
         """Update user data.
 
         Args:
             user_id: User's unique identifier
-            data: Dictionary of fields to update
+            data: Fields to update
         """
         ...
 
@@ -51,6 +52,114 @@ class DatabaseProtocol(Protocol):
         ...
 
 
+class ScannableDatabaseProtocol(DatabaseProtocol, Protocol):
+    """Protocol for databases that can enumerate and remove users."""
+
+    async def list_users(self) -> list[User]:
+        """Return every stored user.
+
+        Returns:
+            List of all users held by this database
+        """
+        ...
+
+    async def delete_user(self, user_id: str) -> None:
+        """Delete a user if present.
+
+        Args:
+            user_id: User's unique identifier
+        """
+        ...
+
+
+class EmailDirectoryProtocol(Protocol):
+    """Protocol for the shared email-to-shard directory of a sharded store."""
+
+    async def get(self, email: str) -> str | None:
+        """Return the shard an email is registered on.
+
+        Args:
+            email: User's email address
+
+        Returns:
+            Shard name, or None if the email is not registered
+        """
+        ...
+
+    async def reserve(self, email: str, shard: str) -> bool:
+        """Claim an email for a shard unless it is already taken.
+
+        Args:
+            email: User's email address
+            shard: Shard the user is being written to
+
+        Returns:
+            True if the email was free and is now claimed, False otherwise
+        """
+        ...
+
+    async def assign(self, email: str, shard: str) -> None:
+        """Point an email at a shard, replacing any previous entry.
+
+        Args:
+            email: User's email address
+            shard: Shard now holding the user
+        """
+        ...
+
+    async def release(self, email: str, shard: str) -> None:
+        """Remove an email's entry if it still points at the given shard.
+
+        Args:
+            email: User's email address
+            shard: Shard the entry is expected to point at
+        """
+        ...
+
+
+class ReplicaDatabaseProtocol(DatabaseProtocol, Protocol):
+    """Protocol for read replicas that report their replication lag."""
+
+    def replication_lag(self) -> float:
+        """Return how far this replica trails the primary.
+
+        Returns:
+            Replication lag in seconds
+        """
+        ...
+
+
+class ReadRouterProtocol(Protocol):
+    """Protocol for routers that choose and account for read backends."""
+
+    def read_backends(self, key: str) -> Sequence[DatabaseProtocol]:
+        """Return the databases allowed to serve a read for a key, best first.
+
+        Args:
+            key: User ID or email being read
+
+        Returns:
+            Databases in the order they should be tried
+        """
+        ...
+
+    async def read_on[T](
+        self,
+        database: DatabaseProtocol,
+        query: Callable[[DatabaseProtocol], Awaitable[T]],
+    ) -> T:
+        """Run a read on one of the router's databases.
+
+        Args:
+            database: Database returned by ``read_backends``
+            query: Read to run against it
+
+        Returns:
+            The query result
+        """
+        ...
+
+
 class TokenServiceProtocol(Protocol):
     """Protocol for token management operations."""
 
@@ -128,6 +237,21 @@ class TokenServiceProtocol(Protocol):
         ...
 
 
+class BreachedPasswordProtocol(Protocol):
+    """Protocol for breached-password lookups."""
+
+    def is_breached(self, password: str) -> bool:
+        """Check whether a password appears in a known breach corpus.
+
+        Args:
+            password: Plain text password
+
+        Returns:
+            True if the password has been breached, False otherwise
+        """
+        ...
+
+
 class EmailServiceProtocol(Protocol):
     """Protocol for email operations."""
 
@@ -0,0 +1,208 @@
+"""Read-replica routing for the user store."""
+
+import itertools
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable, Sequence
+from typing import Any
+
+from backend.models.user import User, UserUpdate
+from backend.services.protocols import DatabaseProtocol, ReplicaDatabaseProtocol
+
+
+class ReplicatedDatabase:
+    """``DatabaseProtocol`` router that splits reads from writes.
+
+    Writes go to the primary. Reads go to the replica with the fewest
+    outstanding requests among those whose replication lag is within
+    ``max_lag``, falling back to the primary when none qualifies. After a
+    write, reads for the same user are pinned to the primary for
+    ``pin_window`` seconds so callers always see their own writes.
+    """
+
+    def __init__(
+        self,
+        primary: DatabaseProtocol,
+        replicas: Sequence[ReplicaDatabaseProtocol],
+        max_lag: float = 1.0,
+        pin_window: float = 5.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Initialize the router.
+
+        Args:
+            primary: Database that receives all writes
+            replicas: Read replicas to balance reads over
+            max_lag: Largest replication lag in seconds a replica may have
+                and still serve reads
+            pin_window: Seconds to pin a user's reads to the primary after
+                a write to that user
+            clock: Monotonic time source, injectable for tests
+        """
+        self.primary = primary
+        self.replicas = list(replicas)
+        self.max_lag = max_lag
+        self.pin_window = pin_window
+        self._clock = clock
+        self._outstanding = [0] * len(self.replicas)
+        self._replica_index = {id(r): i for i, r in enumerate(self.replicas)}
+        self._rotation = itertools.count()
+        self._pinned_until: dict[str, float] = {}
+        self._pin_expiries: deque[tuple[float, str]] = deque()
+
+    async def get_user_by_email(self, email: str) -> User | None:
+        """Get a user by email, from a replica unless pinned.
+
+        A replica result whose user ID is pinned is re-read from the
+        primary, which covers writes made by ID before this lookup.
+
+        Args:
+            email: User's email address
+
+        Returns:
+            User object if found, None otherwise
+        """
+        if self._is_pinned(email):
+            return await self.primary.get_user_by_email(email)
+        user = await self._read(lambda db: db.get_user_by_email(email))
+        if user is not None and self._is_pinned(user.id):
+            return await self.primary.get_user_by_email(email)
+        return user
+
+    async def get_user_by_id(self, user_id: str) -> User | None:
+        """Get a user by ID, from a replica unless pinned.
+
+        Args:
+            user_id: User's unique identifier
+
+        Returns:
+            User object if found, None otherwise
+        """
+        if self._is_pinned(user_id):
+            return await self.primary.get_user_by_id(user_id)
+        return await self._read(lambda db: db.get_user_by_id(user_id))
+
+    async def update_user(self, user_id: str, data: UserUpdate) -> None:
+        """Update user data on the primary and pin the user to it.
+
+        Args:
+            user_id: User's unique identifier
+            data: Fields to update
+        """
+        await self.primary.update_user(user_id, data)
+        self._pin(user_id)
+        if "email" in data:
+            self._pin(data["email"])
+
+    async def create_user(self, user_data: dict[str, Any]) -> User:
+        """Create a user on the primary and pin the user to it.
+
+        Args:
+            user_data: Dictionary containing user information
+
+        Returns:
+            Created user object
+        """
+        user = await self.primary.create_user(user_data)
+        self._pin(user.id)
+        self._pin(user.email)
+        return user
+
+    def _pin(self, key: str) -> None:
+        """Pin reads for a user ID or email to the primary.
+
+        The pin window is constant, so pins expire in the order they were
+        made and expired ones are dropped from the front of a queue.
+        """
+        now = self._clock()
+        expiries = self._pin_expiries
+        while expiries and expiries[0][0] <= now:
+            until, expired = expiries.popleft()
+            if self._pinned_until.get(expired) == until:
+                del self._pinned_until[expired]
+        until = now + self.pin_window
+        self._pinned_until[key] = until
+        expiries.append((until, key))
+
+    def _is_pinned(self, key: str) -> bool:
+        """Return whether reads for a key must go to the primary."""
+        until = self._pinned_until.get(key)
+        return until is not None and until > self._clock()
+
+    def read_backends(self, key: str) -> list[DatabaseProtocol]:
+        """Return the databases allowed to serve a read for a key, best first.
+
+        Meant for ``HedgedDatabase``, which runs the reads through
+        ``read_on`` so they are counted. A pinned key may
+        only be read from the primary; otherwise the replica
+        ``_pick_replica`` would choose comes first, then the other fresh
+        replicas, then the primary.
+
+        Args:
+            key: User ID or email being read
+
+        Returns:
+            Databases in the order they should be tried
+        """
+        if self._is_pinned(key):
+            return [self.primary]
+        first = self._pick_replica()
+        if first is None:
+            return [self.primary]
+        others = [
+            replica
+            for index, replica in enumerate(self.replicas)
+            if index != first and replica.replication_lag() <= self.max_lag
+        ]
+        return [self.replicas[first], *others, self.primary]
+
+    def _pick_replica(self) -> int | None:
+        """Return the index of the least-loaded fresh replica, if any."""
+        count = len(self.replicas)
+        if not count:
+            return None
+        start = next(self._rotation) % count
+        best: int | None = None
+        for offset in range(count):
+            index = (start + offset) % count
+            if self.replicas[index].replication_lag() > self.max_lag:
+                continue
+            if best is None or self._outstanding[index] < self._outstanding[best]:
+                best = index
+        return best
+
+    async def read_on[T](
+        self,
+        database: DatabaseProtocol,
+        query: Callable[[DatabaseProtocol], Awaitable[T]],
+    ) -> T:
+        """Run a read on a given backend, tracking outstanding requests.
+
+        Reads sent to a replica count towards its load for
+        least-outstanding-requests balancing until they finish or are
+        cancelled.
+
+        Args:
+            database: The primary or one of the replicas
+            query: Read to run against it
+
+        Returns:
+            The query result
+        """
+        index = self._replica_index.get(id(database))
+        if index is None:
+            return await query(database)
+        self._outstanding[index] += 1
+        try:
+            return await query(database)
+        finally:
+            self._outstanding[index] -= 1
+
+    async def _read(
+        self,
+        query: Callable[[DatabaseProtocol], Awaitable[User | None]],
+    ) -> User | None:
+        """Run a read on the chosen replica, tracking outstanding requests."""
+        index = self._pick_replica()
+        database = self.primary if index is None else self.replicas[index]
+        return await self.read_on(database, query)
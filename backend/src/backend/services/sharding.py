@@ -0,0 +1,475 @@
+"""Consistent-hash partitioning of users across several databases."""
+
+import asyncio
+import bisect
+import hashlib
+import sqlite3
+import uuid
+from collections import Counter
+from collections.abc import AsyncIterator, Iterable, Mapping
+from contextlib import asynccontextmanager
+from dataclasses import asdict, dataclass, field
+from typing import Any
+
+from backend.exceptions import ValidationError
+from backend.models.user import User, UserUpdate
+from backend.services.protocols import (
+    EmailDirectoryProtocol,
+    ScannableDatabaseProtocol,
+)
+
+
+def _hash_key(key: str) -> int:
+    """Map a string onto the 64-bit hash ring."""
+    digest = hashlib.blake2b(key.encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big")
+
+
+class ConsistentHashRing:
+    """Hash ring with virtual nodes.
+
+    Each node is placed on the ring ``vnodes`` times so that keys spread
+    evenly and adding a node only takes over roughly ``1/N`` of the keys.
+    """
+
+    def __init__(self, nodes: Iterable[str] = (), vnodes: int = 128):
+        if vnodes < 1:
+            raise ValueError("vnodes must be at least 1")
+        self.vnodes = vnodes
+        self._points: list[int] = []
+        self._owners: list[str] = []
+        self._nodes: set[str] = set()
+        for node in nodes:
+            self.add_node(node)
+
+    @property
+    def nodes(self) -> frozenset[str]:
+        """Names of all nodes on the ring."""
+        return frozenset(self._nodes)
+
+    def add_node(self, node: str) -> None:
+        """Place a node on the ring.
+
+        Args:
+            node: Unique node name
+
+        Raises:
+            ValueError: If the node is already on the ring
+        """
+        if node in self._nodes:
+            msg = f"Node already on ring: {node}"
+            raise ValueError(msg)
+        self._nodes.add(node)
+        for replica in range(self.vnodes):
+            point = _hash_key(f"{node}#{replica}")
+            index = bisect.bisect_left(self._points, point)
+            self._points.insert(index, point)
+            self._owners.insert(index, node)
+
+    def remove_node(self, node: str) -> None:
+        """Take a node off the ring.
+
+        Args:
+            node: Node name to remove
+
+        Raises:
+            ValueError: If the node is not on the ring
+        """
+        if node not in self._nodes:
+            msg = f"Node not on ring: {node}"
+            raise ValueError(msg)
+        self._nodes.remove(node)
+        kept = [
+            (point, owner)
+            for point, owner in zip(self._points, self._owners, strict=True)
+            if owner != node
+        ]
+        self._points = [point for point, _ in kept]
+        self._owners = [owner for _, owner in kept]
+
+    def get_node(self, key: str) -> str:
+        """Return the node that owns a key.
+
+        Args:
+            key: Key to place
+
+        Returns:
+            Name of the owning node
+
+        Raises:
+            LookupError: If the ring has no nodes
+        """
+        if not self._points:
+            raise LookupError("Hash ring is empty")
+        index = bisect.bisect(self._points, _hash_key(key)) % len(self._points)
+        return self._owners[index]
+
+
+class InMemoryEmailDirectory:
+    """Email directory held in this process.
+
+    Only suitable when a single process writes through the router; use a
+    shared directory such as ``SQLiteEmailDirectory`` otherwise.
+    """
+
+    def __init__(self) -> None:
+        self._shards: dict[str, str] = {}
+
+    async def get(self, email: str) -> str | None:
+        """Return the shard an email is registered on."""
+        return self._shards.get(email)
+
+    async def reserve(self, email: str, shard: str) -> bool:
+        """Claim an email for a shard unless it is already taken."""
+        if email in self._shards:
+            return False
+        self._shards[email] = shard
+        return True
+
+    async def assign(self, email: str, shard: str) -> None:
+        """Point an email at a shard, replacing any previous entry."""
+        self._shards[email] = shard
+
+    async def release(self, email: str, shard: str) -> None:
+        """Remove an email's entry if it still points at the given shard."""
+        if self._shards.get(email) == shard:
+            del self._shards[email]
+
+
+class SQLiteEmailDirectory:
+    """Email directory persisted in an SQLite file.
+
+    Every worker on a host can open the same file, so the directory
+    survives restarts and is shared between processes. Reservations are
+    a single ``INSERT OR IGNORE``, which SQLite serialises across
+    connections.
+    """
+
+    def __init__(self, path: str = ":memory:"):
+        """Open the directory and create its table if needed.
+
+        Args:
+            path: SQLite database path, in-memory by default
+        """
+        self.connection = sqlite3.connect(path, isolation_level=None)
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS email_directory "
+            "(email TEXT PRIMARY KEY, shard TEXT NOT NULL)"
+        )
+
+    def close(self) -> None:
+        """Close the underlying connection."""
+        self.connection.close()
+
+    async def get(self, email: str) -> str | None:
+        """Return the shard an email is registered on."""
+        row = self.connection.execute(
+            "SELECT shard FROM email_directory WHERE email = ?", (email,)
+        ).fetchone()
+        return row[0] if row else None
+
+    async def reserve(self, email: str, shard: str) -> bool:
+        """Claim an email for a shard unless it is already taken."""
+        cursor = self.connection.execute(
+            "INSERT OR IGNORE INTO email_directory (email, shard) VALUES (?, ?)",
+            (email, shard),
+        )
+        return cursor.rowcount == 1
+
+    async def assign(self, email: str, shard: str) -> None:
+        """Point an email at a shard, replacing any previous entry."""
+        self.connection.execute(
+            "INSERT OR REPLACE INTO email_directory (email, shard) VALUES (?, ?)",
+            (email, shard),
+        )
+
+    async def release(self, email: str, shard: str) -> None:
+        """Remove an email's entry if it still points at the given shard."""
+        self.connection.execute(
+            "DELETE FROM email_directory WHERE email = ? AND shard = ?",
+            (email, shard),
+        )
+
+
+@dataclass
+class MigrationResult:
+    """Outcome of moving users onto a newly added shard."""
+
+    shard: str
+    scanned: int
+    moved: int
+
+
+@dataclass
+class _Migration:
+    """A shard being added, with the ring it will switch to."""
+
+    shard: str
+    ring: ConsistentHashRing
+    done: asyncio.Event = field(default_factory=asyncio.Event)
+
+    def moves(self, user_id: str) -> bool:
+        """Whether the migration moves this user to the new shard."""
+        return self.ring.get_node(user_id) == self.shard
+
+
+class ShardedDatabase:
+    """``DatabaseProtocol`` router that partitions users by ID.
+
+    Users are placed on a shard by hashing their ID. Email lookups go
+    through an email-to-shard directory that every write through the
+    router keeps current, so they read a single shard, and an unknown
+    email is answered by the directory alone. Users written to the shards
+    directly are only found after ``rebuild_directory``.
+    """
+
+    def __init__(
+        self,
+        shards: Mapping[str, ScannableDatabaseProtocol],
+        vnodes: int = 128,
+        directory: EmailDirectoryProtocol | None = None,
+    ):
+        """Initialize the router.
+
+        Args:
+            shards: Databases keyed by shard name
+            vnodes: Virtual nodes per shard on the hash ring
+            directory: Email-to-shard directory shared by every process
+                writing through a router, in-process by default
+        """
+        if not shards:
+            raise ValueError("At least one shard is required")
+        self.shards: dict[str, ScannableDatabaseProtocol] = dict(shards)
+        self.ring = ConsistentHashRing(self.shards, vnodes=vnodes)
+        self.directory = (
+            directory if directory is not None else InMemoryEmailDirectory()
+        )
+        self._migration: _Migration | None = None
+        self._writes: Counter[str] = Counter()
+        self._write_finished = asyncio.Event()
+
+    def shard_for(self, user_id: str) -> str:
+        """Return the name of the shard that owns a user ID."""
+        return self.ring.get_node(user_id)
+
+    async def get_user_by_id(self, user_id: str) -> User | None:
+        """Get a user by their ID from its owning shard.
+
+        Args:
+            user_id: User's unique identifier
+
+        Returns:
+            User object if found, None otherwise
+        """
+        return await self.shards[self.shard_for(user_id)].get_user_by_id(user_id)
+
+    async def get_user_by_email(self, email: str) -> User | None:
+        """Get a user by email from the shard the directory points at.
+
+        Args:
+            email: User's email address
+
+        Returns:
+            User object if found, None otherwise
+        """
+        shard = await self.directory.get(email)
+        if shard is None:
+            return None
+        return await self.shards[shard].get_user_by_email(email)
+
+    async def get_users_by_ids(self, user_ids: Iterable[str]) -> dict[str, User]:
+        """Fetch many users, querying all involved shards concurrently.
+
+        Args:
+            user_ids: IDs to look up
+
+        Returns:
+            Found users keyed by ID; missing IDs are omitted
+        """
+        ids = list(dict.fromkeys(user_ids))
+        results = await asyncio.gather(*(self.get_user_by_id(uid) for uid in ids))
+        return {user.id: user for user in results if user is not None}
+
+    @asynccontextmanager
+    async def _writing(self, user_id: str) -> AsyncIterator[str]:
+        """Hold a write to a user until no migration is moving it.
+
+        Yields:
+            Name of the shard the write goes to
+        """
+        while (migration := self._migration) is not None and migration.moves(user_id):
+            await migration.done.wait()
+        self._writes[user_id] += 1
+        try:
+            yield self.shard_for(user_id)
+        finally:
+            self._writes[user_id] -= 1
+            if not self._writes[user_id]:
+                del self._writes[user_id]
+            self._write_finished.set()
+
+    async def update_user(self, user_id: str, data: UserUpdate) -> None:
+        """Update user data on the owning shard.
+
+        Args:
+            user_id: User's unique identifier
+            data: Fields to update
+
+        Raises:
+            ValidationError: If the new email is already registered
+        """
+        async with self._writing(user_id) as shard:
+            database = self.shards[shard]
+            current = (
+                await database.get_user_by_id(user_id) if "email" in data else None
+            )
+            if current is None or current.email == data["email"]:
+                await database.update_user(user_id, data)
+                return
+            if not await self.directory.reserve(data["email"], shard):
+                raise ValidationError("Email already registered", field="email")
+            try:
+                await database.update_user(user_id, data)
+            except BaseException:
+                await self.directory.release(data["email"], shard)
+                raise
+            await self.directory.release(current.email, shard)
+
+    async def create_user(self, user_data: dict[str, Any]) -> User:
+        """Create a user on the shard that owns its ID.
+
+        An ID is generated up front when missing so the user can be placed.
+        The email is reserved in the directory before the shard is written,
+        so concurrent creates of one email cannot both succeed.
+
+        Args:
+            user_data: Dictionary containing user information
+
+        Returns:
+            Created user object
+
+        Raises:
+            ValidationError: If the email is already registered on any shard
+        """
+        data = {"id": uuid.uuid4().hex, **user_data}
+        async with self._writing(data["id"]) as shard:
+            if not await self.directory.reserve(data["email"], shard):
+                raise ValidationError("Email already registered", field="email")
+            try:
+                return await self.shards[shard].create_user(data)
+            except BaseException:
+                await self.directory.release(data["email"], shard)
+                raise
+
+    async def list_users(self) -> list[User]:
+        """Return every user from every shard.
+
+        Returns:
+            Users from all shards, gathered concurrently
+        """
+        per_shard = await asyncio.gather(
+            *(db.list_users() for db in self.shards.values())
+        )
+        return [user for users in per_shard for user in users]
+
+    async def delete_user(self, user_id: str) -> None:
+        """Delete a user from its owning shard.
+
+        Args:
+            user_id: User's unique identifier
+        """
+        async with self._writing(user_id) as name:
+            shard = self.shards[name]
+            user = await shard.get_user_by_id(user_id)
+            if user is not None:
+                await shard.delete_user(user_id)
+                await self.directory.release(user.email, name)
+
+    async def rebuild_directory(self) -> int:
+        """Point the directory at every user the shards hold.
+
+        Needed once for users written to the shards without this router,
+        for example before the directory existed.
+
+        Returns:
+            Number of users indexed
+        """
+        names = list(self.shards)
+        per_shard = await asyncio.gather(*(self.shards[n].list_users() for n in names))
+        await asyncio.gather(
+            *(
+                self.directory.assign(user.email, name)
+                for name, users in zip(names, per_shard, strict=True)
+                for user in users
+            )
+        )
+        return sum(len(users) for users in per_shard)
+
+    async def add_shard(
+        self,
+        name: str,
+        database: ScannableDatabaseProtocol,
+    ) -> MigrationResult:
+        """Add a shard and move the users it now owns onto it.
+
+        Users are copied to the new shard before the ring is switched and
+        removed from their old shard afterwards, so every user stays
+        readable throughout the migration. Writes through this router to
+        users that are moving, including creates of IDs the new shard will
+        own, wait until the migration finishes and then go to the new
+        shard; writes already in flight for them are let finish before the
+        copy starts. Writes to other users are not held up. Writes made to
+        the shard databases directly, bypassing the router, are not
+        covered and must be quiesced by the caller.
+
+        Args:
+            name: Name of the new shard
+            database: Database backing the new shard
+
+        Returns:
+            MigrationResult with the number of users scanned and moved
+
+        Raises:
+            ValueError: If the shard exists or another migration is running
+        """
+        if name in self.shards:
+            msg = f"Shard already exists: {name}"
+            raise ValueError(msg)
+        if self._migration is not None:
+            raise ValueError("A shard migration is already in progress")
+
+        target = ConsistentHashRing(self.ring.nodes, vnodes=self.ring.vnodes)
+        target.add_node(name)
+        migration = self._migration = _Migration(name, target)
+        try:
+            while any(migration.moves(user_id) for user_id in self._writes):
+                self._write_finished.clear()
+                await self._write_finished.wait()
+
+            sources = list(self.shards.items())
+            per_shard = await asyncio.gather(*(db.list_users() for _, db in sources))
+            moves = [
+                (source, user)
+                for (source, _), users in zip(sources, per_shard, strict=True)
+                for user in users
+                if migration.moves(user.id)
+            ]
+            await asyncio.gather(*(database.create_user(asdict(u)) for _, u in moves))
+
+            self.shards[name] = database
+            self.ring.add_node(name)
+            await asyncio.gather(
+                *(self.directory.assign(user.email, name) for _, user in moves)
+            )
+
+            await asyncio.gather(
+                *(self.shards[source].delete_user(user.id) for source, user in moves)
+            )
+        finally:
+            self._migration = None
+            migration.done.set()
+        return MigrationResult(
+            shard=name,
+            scanned=sum(len(users) for users in per_shard),
+            moved=len(moves),
+        )
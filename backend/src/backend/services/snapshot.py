@@ -0,0 +1,249 @@
+"""Warm-start snapshots of the user cache.
+
+File layout (all integers big-endian)::
+
+    header    magic "AUWS", version u16, written_at f64,
+              user count u32, missing count u32
+    users     cached_at f64, id len u16, email len u16, body len u32,
+              id, email, JSON body
+    missing   cached_at f64, kind u8 (0 id, 1 email), key len u16, key
+
+Readers ``mmap`` the file and index only the record headers up front;
+user bodies are decoded on first lookup.
+"""
+
+import asyncio
+import json
+import math
+import mmap
+import os
+import struct
+import tempfile
+import time
+from collections.abc import Callable, Iterable
+from datetime import datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Literal
+
+from backend.models.user import User
+
+if TYPE_CHECKING:
+    from backend.services.user_cache import UserCache
+
+type LookupKind = Literal["id", "email"]
+
+MAGIC = b"AUWS"
+VERSION = 1
+
+_HEADER = struct.Struct(">4sHdII")
+_USER = struct.Struct(">dHHI")
+_MISSING = struct.Struct(">dBH")
+_KINDS: tuple[LookupKind, LookupKind] = ("id", "email")
+
+
+def _encode_user(user: User) -> bytes:
+    """Serialize the fields not stored in the record header."""
+    return json.dumps(
+        [
+            user.name,
+            user.hashed_password,
+            user.is_active,
+            user.created_at.isoformat(),
+            user.updated_at.isoformat() if user.updated_at else None,
+            user.last_login.isoformat() if user.last_login else None,
+        ],
+        separators=(",", ":"),
+    ).encode()
+
+
+def _decode_user(user_id: str, email: str, body: bytes) -> User:
+    """Rebuild a clean ``User`` from a record."""
+    name, hashed_password, is_active, created, updated, last_login = json.loads(body)
+    return User(
+        id=user_id,
+        email=email,
+        name=name,
+        hashed_password=hashed_password,
+        is_active=is_active,
+        created_at=datetime.fromisoformat(created),
+        updated_at=datetime.fromisoformat(updated) if updated else None,
+        last_login=datetime.fromisoformat(last_login) if last_login else None,
+    )
+
+
+def write_snapshot(
+    path: Path | str,
+    users: Iterable[tuple[User, float]],
+    missing: Iterable[tuple[LookupKind, str, float]] = (),
+) -> int:
+    """Atomically write a snapshot file.
+
+    The file is written next to ``path`` and renamed into place, so
+    readers never see a partial snapshot.
+
+    Args:
+        path: Snapshot file to write
+        users: Users with the wall-clock time each was loaded
+        missing: Negative lookups with the time each was recorded
+
+    Returns:
+        Number of users written
+    """
+    target = Path(path)
+    user_records = []
+    for user, cached_at in users:
+        user_id, email, body = user.id.encode(), user.email.encode(), _encode_user(user)
+        header = _USER.pack(cached_at, len(user_id), len(email), len(body))
+        user_records.append(b"".join((header, user_id, email, body)))
+    missing_records = []
+    for kind, key, cached_at in missing:
+        raw = key.encode()
+        header = _MISSING.pack(cached_at, _KINDS.index(kind), len(raw))
+        missing_records.append(header + raw)
+
+    header = _HEADER.pack(
+        MAGIC, VERSION, time.time(), len(user_records), len(missing_records)
+    )
+    fd, tmp = tempfile.mkstemp(dir=target.parent, prefix=f".{target.name}.")
+    try:
+        with os.fdopen(fd, "wb") as file:
+            file.write(header)
+            file.writelines(user_records)
+            file.writelines(missing_records)
+        Path(tmp).replace(target)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+    return len(user_records)
+
+
+async def snapshot_periodically(
+    cache: "UserCache",
+    path: Path | str,
+    interval: float = 60.0,
+) -> None:
+    """Write the cache's working set to ``path`` every ``interval`` seconds.
+
+    The cache is exported on the event loop and the file is written in a
+    worker thread. Run it as a task and cancel it on shutdown.
+    """
+    while True:
+        await asyncio.sleep(interval)
+        users, missing = cache.export()
+        await asyncio.to_thread(write_snapshot, path, users, missing)
+
+
+class UserSnapshot:
+    """Memory-mapped, read-only view of a snapshot file.
+
+    Entry age is checked at load and again on every lookup, so an entry
+    is never served once it is older than ``max_age``. The default
+    matches ``UserCache``'s ttl: snapshot users carry ``hashed_password``
+    and ``is_active`` into ``login``, and must not be staler than a cached
+    user would be.
+    """
+
+    def __init__(
+        self,
+        path: Path | str,
+        max_age: float = 300.0,
+        clock: Callable[[], float] = time.time,
+    ):
+        """Map a snapshot file and index its records.
+
+        Args:
+            path: Snapshot file written by ``write_snapshot``
+            max_age: Entries loaded longer ago than this many seconds are
+                skipped at load and no longer served afterwards
+            clock: Wall-clock time source, injectable for tests
+
+        Raises:
+            ValueError: If the file is not a supported snapshot
+        """
+        with Path(path).open("rb") as file:
+            self._mm = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._users: dict[str, tuple[str, int, int, float]] = {}
+        self._ids_by_email: dict[str, str] = {}
+        self._missing: dict[tuple[LookupKind, str], float] = {}
+        self.max_age = max_age
+        self._clock = clock
+        self._newest = -math.inf
+        try:
+            self._index(clock() - max_age)
+        except ValueError:
+            self._mm.close()
+            raise
+        except (struct.error, IndexError) as e:
+            self._mm.close()
+            raise ValueError("Snapshot file is truncated or corrupt") from e
+
+    def _index(self, oldest: float) -> None:
+        """Record where each fresh entry lives without decoding bodies."""
+        mm = self._mm
+        magic, version, _, user_count, missing_count = _HEADER.unpack_from(mm, 0)
+        if magic != MAGIC or version != VERSION:
+            msg = "Not a supported user snapshot file"
+            raise ValueError(msg)
+
+        offset = _HEADER.size
+        for _ in range(user_count):
+            cached_at, id_len, email_len, body_len = _USER.unpack_from(mm, offset)
+            offset += _USER.size
+            end = offset + id_len + email_len + body_len
+            if end > len(mm):
+                raise IndexError(end)
+            if cached_at >= oldest:
+                user_id = mm[offset : offset + id_len].decode()
+                email = mm[offset + id_len : offset + id_len + email_len].decode()
+                self._users[user_id] = (email, end - body_len, body_len, cached_at)
+                self._ids_by_email[email] = user_id
+                self._newest = max(self._newest, cached_at)
+            offset = end
+
+        for _ in range(missing_count):
+            cached_at, kind, key_len = _MISSING.unpack_from(mm, offset)
+            offset += _MISSING.size
+            if cached_at >= oldest:
+                key = mm[offset : offset + key_len].decode()
+                self._missing[(_KINDS[kind], key)] = cached_at
+                self._newest = max(self._newest, cached_at)
+            offset += key_len
+
+        if offset != len(mm):
+            raise IndexError(offset)
+
+    def __len__(self) -> int:
+        """Return the number of fresh users in the snapshot."""
+        return len(self._users)
+
+    @property
+    def expired(self) -> bool:
+        """Whether every entry has outlived ``max_age``."""
+        return self._clock() - self._newest > self.max_age
+
+    def close(self) -> None:
+        """Unmap the snapshot file."""
+        self._mm.close()
+
+    def lookup(self, kind: LookupKind, key: str) -> tuple[User, float] | None:
+        """Return a user and its load time, or None if absent or too old.
+
+        Args:
+            kind: Whether ``key`` is a user ID or an email
+            key: User ID or email
+        """
+        user_id = key if kind == "id" else self._ids_by_email.get(key)
+        record = self._users.get(user_id) if user_id is not None else None
+        if user_id is None or record is None:
+            return None
+        email, offset, length, cached_at = record
+        if self._clock() - cached_at > self.max_age:
+            return None
+        return _decode_user(
+            user_id, email, self._mm[offset : offset + length]
+        ), cached_at
+
+    def is_missing(self, kind: LookupKind, key: str) -> bool:
+        """Return whether the snapshot holds a fresh negative lookup for a key."""
+        cached_at = self._missing.get((kind, key))
+        return cached_at is not None and self._clock() - cached_at <= self.max_age
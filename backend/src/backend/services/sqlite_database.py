@@ -0,0 +1,233 @@
+"""SQLite database adapter for local runs and tests."""
+
+import sqlite3
+import uuid
+from datetime import UTC, datetime
+from functools import lru_cache
+from typing import Any
+
+from backend.exceptions import UserNotFoundError, ValidationError
+from backend.models.user import UPDATABLE_FIELDS, User, UserUpdate
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    id TEXT PRIMARY KEY,
+    email TEXT NOT NULL UNIQUE,
+    name TEXT NOT NULL,
+    hashed_password TEXT NOT NULL,
+    is_active INTEGER NOT NULL,
+    created_at TEXT NOT NULL,
+    updated_at TEXT,
+    last_login TEXT
+)
+"""
+_COLUMNS = (
+    "id, email, name, hashed_password, is_active, created_at, updated_at, last_login"
+)
+_DATETIME_FIELDS = frozenset({"created_at", "updated_at", "last_login"})
+
+
+@lru_cache(maxsize=128)
+def compile_update(columns: tuple[str, ...]) -> str:
+    """Return the UPDATE statement that writes exactly ``columns``.
+
+    Statements are cached per column set, so each distinct shape of
+    update is built once and then reused from SQLite's prepared
+    statement cache.
+
+    Args:
+        columns: Sorted names of the columns to write
+
+    Returns:
+        Parameterised SQL taking the column values followed by the user ID
+
+    Raises:
+        ValidationError: If a column is not updatable
+    """
+    unknown = set(columns) - UPDATABLE_FIELDS
+    if unknown:
+        msg = f"Unknown user fields: {sorted(unknown)}"
+        raise ValidationError(msg)
+    assignments = ", ".join(f"{column} = ?" for column in columns)
+    # Column names are checked against UPDATABLE_FIELDS above.
+    return f"UPDATE users SET {assignments} WHERE id = ?"  # noqa: S608
+
+
+def _to_column(name: str, value: Any) -> Any:  # noqa: ANN401
+    """Convert a model value to its SQLite representation."""
+    if name in _DATETIME_FIELDS and value is not None:
+        return value.isoformat()
+    if name == "is_active":
+        return int(value)
+    return value
+
+
+def _constraint_error(error: sqlite3.IntegrityError) -> ValidationError | None:
+    """Translate a uniqueness violation on ``users``, or return None."""
+    if str(error) == "UNIQUE constraint failed: users.email":
+        return ValidationError("Email already registered", field="email")
+    if str(error) == "UNIQUE constraint failed: users.id":
+        return ValidationError("User ID already exists", field="id")
+    return None
+
+
+def _to_user(row: sqlite3.Row) -> User:
+    """Build a clean ``User`` from a row."""
+
+    def parse(text: str | None) -> datetime | None:
+        return datetime.fromisoformat(text) if text else None
+
+    created_at = parse(row["created_at"])
+    assert created_at is not None
+    return User(
+        id=row["id"],
+        email=row["email"],
+        name=row["name"],
+        hashed_password=row["hashed_password"],
+        is_active=bool(row["is_active"]),
+        created_at=created_at,
+        updated_at=parse(row["updated_at"]),
+        last_login=parse(row["last_login"]),
+    )
+
+
+class SQLiteDatabase:
+    """``DatabaseProtocol`` implementation on the standard ``sqlite3`` module.
+
+    Calls run synchronously on the event loop thread, which is fine for
+    local development and tests but not for production traffic.
+    """
+
+    def __init__(self, path: str = ":memory:"):
+        """Open the database and create the schema if needed.
+
+        Args:
+            path: SQLite database path, in-memory by default
+        """
+        self.connection = sqlite3.connect(path)
+        self.connection.row_factory = sqlite3.Row
+        self.connection.execute(_SCHEMA)
+
+    def close(self) -> None:
+        """Close the underlying connection."""
+        self.connection.close()
+
+    async def get_user_by_email(self, email: str) -> User | None:
+        """Get a user by their email address.
+
+        Args:
+            email: User's email address
+
+        Returns:
+            User object if found, None otherwise
+        """
+        row = self.connection.execute(
+            f"SELECT {_COLUMNS} FROM users WHERE email = ?",  # noqa: S608
+            (email,),
+        ).fetchone()
+        return _to_user(row) if row else None
+
+    async def get_user_by_id(self, user_id: str) -> User | None:
+        """Get a user by their ID.
+
+        Args:
+            user_id: User's unique identifier
+
+        Returns:
+            User object if found, None otherwise
+        """
+        row = self.connection.execute(
+            f"SELECT {_COLUMNS} FROM users WHERE id = ?",  # noqa: S608
+            (user_id,),
+        ).fetchone()
+        return _to_user(row) if row else None
+
+    async def update_user(self, user_id: str, data: UserUpdate) -> None:
+        """Write only the given fields with a minimal UPDATE.
+
+        Args:
+            user_id: User's unique identifier
+            data: Fields to update
+
+        Raises:
+            UserNotFoundError: If no user has the given ID
+            ValidationError: If the new email is already registered
+        """
+        if not data:
+            return
+        columns = tuple(sorted(data))
+        values = [_to_column(name, data[name]) for name in columns]  # type: ignore[literal-required]
+        try:
+            with self.connection:
+                cursor = self.connection.execute(
+                    compile_update(columns), (*values, user_id)
+                )
+        except sqlite3.IntegrityError as e:
+            if (error := _constraint_error(e)) is None:
+                raise
+            raise error from e
+        if cursor.rowcount == 0:
+            raise UserNotFoundError()
+
+    async def create_user(self, user_data: dict[str, Any]) -> User:
+        """Create a new user.
+
+        Missing ``id`` and ``created_at`` values are generated.
+
+        Args:
+            user_data: Dictionary containing user information
+
+        Returns:
+            Created user object
+
+        Raises:
+            ValidationError: If the email or ID is already registered
+        """
+        user = User(
+            **{
+                "id": uuid.uuid4().hex,
+                "is_active": True,
+                "created_at": datetime.now(UTC),
+                **user_data,
+            }
+        )
+        try:
+            with self.connection:
+                self.connection.execute(
+                    f"INSERT INTO users ({_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",  # noqa: S608
+                    (
+                        user.id,
+                        user.email,
+                        user.name,
+                        user.hashed_password,
+                        int(user.is_active),
+                        _to_column("created_at", user.created_at),
+                        _to_column("updated_at", user.updated_at),
+                        _to_column("last_login", user.last_login),
+                    ),
+                )
+        except sqlite3.IntegrityError as e:
+            if (error := _constraint_error(e)) is None:
+                raise
+            raise error from e
+        return user
+
+    async def list_users(self) -> list[User]:
+        """Return every stored user.
+
+        Returns:
+            All users ordered by ID
+        """
+        rows = self.connection.execute(
+            f"SELECT {_COLUMNS} FROM users ORDER BY id"  # noqa: S608
+        ).fetchall()
+        return [_to_user(row) for row in rows]
+
+    async def delete_user(self, user_id: str) -> None:
+        """Delete a user if present.
+
+        Args:
+            user_id: User's unique identifier
+        """
+        with self.connection:
+            self.connection.execute("DELETE FROM users WHERE id = ?", (user_id,))
@@ -0,0 +1,294 @@
+"""Sampled tracing spans propagated through a context variable.
+
+A trace starts at the outermost ``traced`` call when a ``Tracer`` is
+installed with ``set_tracer``. Nested ``traced`` calls and ``span`` blocks
+become child spans of whatever span is current. When no trace is being
+recorded, ``span`` costs one context variable read and returns a shared
+no-op context manager, and ``traced`` returns the wrapped coroutine
+itself, adding no frame of its own.
+"""
+
+import functools
+import inspect
+import json
+import math
+import random
+import sys
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable, Sequence
+from contextvars import ContextVar, Token
+from dataclasses import dataclass, field
+from pathlib import Path
+from types import TracebackType
+from typing import Protocol
+
+
+@dataclass(slots=True)
+class Span:
+    """A timed operation within a trace."""
+
+    trace_id: str
+    span_id: int
+    parent_id: int | None
+    name: str
+    start_ns: int
+    end_ns: int = 0
+    error: str | None = None
+
+    @property
+    def duration(self) -> float:
+        """Span duration in seconds."""
+        return (self.end_ns - self.start_ns) / 1e9
+
+
+@dataclass(slots=True)
+class Trace:
+    """All spans recorded for one root operation."""
+
+    trace_id: str
+    started_at: float
+    head_sampled: bool
+    spans: list[Span] = field(default_factory=list)
+
+    @property
+    def root(self) -> Span:
+        """The outermost span of the trace."""
+        return self.spans[0]
+
+
+class SpanExporter(Protocol):
+    """Protocol for destinations of finished traces."""
+
+    def export(self, traces: Sequence[Trace]) -> None:
+        """Write finished traces.
+
+        Args:
+            traces: Traces kept by sampling, oldest first
+        """
+        ...
+
+
+class JsonFileExporter:
+    """Exporter that appends one JSON object per span to a local file."""
+
+    def __init__(self, path: Path | str):
+        self.path = Path(path)
+
+    def export(self, traces: Sequence[Trace]) -> None:
+        """Append the spans of each trace as JSON lines.
+
+        Args:
+            traces: Traces kept by sampling, oldest first
+        """
+        with self.path.open("a", encoding="utf-8") as file:
+            for trace in traces:
+                for span in trace.spans:
+                    record = {
+                        "trace_id": span.trace_id,
+                        "span_id": span.span_id,
+                        "parent_id": span.parent_id,
+                        "name": span.name,
+                        "started_at": trace.started_at
+                        + (span.start_ns - trace.root.start_ns) / 1e9,
+                        "duration_us": (span.end_ns - span.start_ns) // 1000,
+                        "error": span.error,
+                    }
+                    file.write(json.dumps(record) + "\n")
+
+
+class Tracer:
+    """Decides which traces to record and keeps the finished ones.
+
+    Traces are head-sampled at ``sample_rate``: rather than drawing a
+    random number per request, the tracer draws the random gap to the
+    next sampled trace, so an unsampled request only decrements a
+    counter. When ``slow_threshold`` is
+    set, every trace is recorded and those slower than the threshold are
+    kept as well (tail sampling); leave it unset to pay nothing for
+    unsampled requests. Kept traces go to a ring buffer of
+    ``buffer_size`` traces that ``flush`` drains into the exporter.
+    """
+
+    def __init__(
+        self,
+        exporter: SpanExporter | None = None,
+        sample_rate: float = 0.01,
+        slow_threshold: float | None = None,
+        buffer_size: int = 1024,
+        rng: Callable[[], float] = random.random,
+    ):
+        """Initialize the tracer.
+
+        Args:
+            exporter: Destination for flushed traces
+            sample_rate: Fraction of traces kept regardless of latency
+            slow_threshold: Seconds after which a trace is always kept
+            buffer_size: Finished traces held before the oldest is dropped
+            rng: Source of uniform random numbers, injectable for tests
+        """
+        self.exporter = exporter
+        self.sample_rate = sample_rate
+        self.slow_threshold = slow_threshold
+        self.buffer: deque[Trace] = deque(maxlen=buffer_size)
+        self._rng = rng
+        self._skip = self._next_gap()
+
+    def start(self, name: str) -> "_ActiveSpan | None":
+        """Start a root span, or return None if the trace is not recorded."""
+        if self._skip:
+            self._skip -= 1
+            head_sampled = False
+        else:
+            self._skip = self._next_gap()
+            head_sampled = True
+        if not head_sampled and self.slow_threshold is None:
+            return None
+        trace = Trace(f"{random.getrandbits(64):016x}", time.time(), head_sampled)
+        return _ActiveSpan(self, trace, None, name)
+
+    def _next_gap(self) -> int:
+        """Draw how many traces to skip before the next head-sampled one.
+
+        Gaps are geometric, so each trace is still sampled independently
+        with probability ``sample_rate``.
+        """
+        if self.sample_rate >= 1:
+            return 0
+        if self.sample_rate <= 0:
+            return sys.maxsize
+        return int(math.log(1.0 - self._rng()) / math.log(1.0 - self.sample_rate))
+
+    def finish(self, trace: Trace) -> None:
+        """Keep a finished trace if head- or tail-sampling selects it."""
+        if trace.head_sampled or (
+            self.slow_threshold is not None
+            and trace.root.duration >= self.slow_threshold
+        ):
+            self.buffer.append(trace)
+
+    def flush(self) -> int:
+        """Export and clear the buffered traces.
+
+        Returns:
+            Number of traces exported
+        """
+        traces = list(self.buffer)
+        self.buffer.clear()
+        if traces and self.exporter is not None:
+            self.exporter.export(traces)
+        return len(traces)
+
+
+_tracer: Tracer | None = None
+_current: ContextVar["_ActiveSpan | None"] = ContextVar("current_span", default=None)
+
+
+def set_tracer(tracer: Tracer | None) -> None:
+    """Install the process-wide tracer, or disable tracing with None."""
+    global _tracer  # noqa: PLW0603
+    _tracer = tracer
+
+
+class _ActiveSpan:
+    """Context manager that records one span and makes it current."""
+
+    __slots__ = ("_token", "span", "trace", "tracer")
+
+    def __init__(
+        self,
+        tracer: Tracer,
+        trace: Trace,
+        parent_id: int | None,
+        name: str,
+    ):
+        self.tracer = tracer
+        self.trace = trace
+        self.span = Span(
+            trace.trace_id, len(trace.spans), parent_id, name, time.perf_counter_ns()
+        )
+        trace.spans.append(self.span)
+        self._token: Token[_ActiveSpan | None] | None = None
+
+    def child(self, name: str) -> "_ActiveSpan":
+        """Create a child span of this span."""
+        return _ActiveSpan(self.tracer, self.trace, self.span.span_id, name)
+
+    def __enter__(self) -> Span:
+        self.span.start_ns = time.perf_counter_ns()
+        self._token = _current.set(self)
+        return self.span
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        self.span.end_ns = time.perf_counter_ns()
+        if exc_type is not None:
+            self.span.error = exc_type.__name__
+        if self._token is not None:
+            _current.reset(self._token)
+        if self.span.parent_id is None:
+            self.tracer.finish(self.trace)
+
+
+class _NoopSpan:
+    """Shared context manager used when nothing is being recorded."""
+
+    __slots__ = ()
+
+    def __enter__(self) -> None:
+        return None
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        return None
+
+
+_NOOP = _NoopSpan()
+
+
+def span(name: str) -> _ActiveSpan | _NoopSpan:
+    """Return a context manager timing ``name`` as a child of the current span.
+
+    Args:
+        name: Span name, e.g. ``database.get_user_by_id``
+    """
+    current = _current.get()
+    if current is None:
+        return _NOOP
+    return current.child(name)
+
+
+def traced[**P, R](
+    name: str,
+) -> Callable[[Callable[P, Awaitable[R]]], Callable[P, Awaitable[R]]]:
+    """Trace an async function, starting a new trace when none is current.
+
+    Args:
+        name: Span name, e.g. ``AuthService.login``
+    """
+
+    def decorate(func: Callable[P, Awaitable[R]]) -> Callable[P, Awaitable[R]]:
+        async def run(scope: _ActiveSpan, call: Awaitable[R]) -> R:
+            with scope:
+                return await call
+
+        @functools.wraps(func)
+        def wrapper(*args: P.args, **kwargs: P.kwargs) -> Awaitable[R]:
+            current = _current.get()
+            if current is not None:
+                return run(current.child(name), func(*args, **kwargs))
+            if _tracer is None or (root := _tracer.start(name)) is None:
+                return func(*args, **kwargs)
+            return run(root, func(*args, **kwargs))
+
+        return inspect.markcoroutinefunction(wrapper)
+
+    return decorate
@@ -0,0 +1,437 @@
+"""Capture of ``AuthService`` traffic and deterministic replay against it.
+
+Log layout (all integers big-endian)::
+
+    header   magic "ATRC", version u16
+    records  started_at u64 (ns since the epoch), duration u32 (us),
+             operation u8, outcome u8, key 8 bytes
+
+The key is a keyed BLAKE2b digest of the call's email or token, so the log
+preserves which calls shared a key without holding emails, passwords or
+tokens. Records are fixed-size and only ever appended; a torn final record
+left by a crash is ignored on read.
+"""
+
+import argparse
+import asyncio
+import functools
+import hashlib
+import json
+import math
+import os
+import struct
+import time
+from collections import defaultdict
+from collections.abc import Awaitable, Callable, Iterator
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from operator import attrgetter
+from pathlib import Path
+from typing import TYPE_CHECKING, Concatenate, Protocol
+
+from backend.exceptions import BaseApplicationError
+
+if TYPE_CHECKING:
+    from backend.services.auth_service import AuthService
+
+MAGIC = b"ATRC"
+VERSION = 1
+
+OPERATIONS = ("login", "try_login", "request_password_reset", "validate_token")
+OUTCOMES = (
+    "OK",
+    "ERROR",
+    "INVALID_CREDENTIALS",
+    "VALIDATION_ERROR",
+    "INVALID_TOKEN",
+    "TOKEN_EXPIRED",
+    "USER_NOT_FOUND",
+    "DEADLINE_EXCEEDED",
+    "CIRCUIT_OPEN",
+)
+
+_HEADER = struct.Struct(">4sH")
+_RECORD = struct.Struct(">QIBB8s")
+
+REPLAY_PASSWORD = "Replay-Password-1"  # noqa: S105 - synthetic users only
+
+
+@dataclass(frozen=True, slots=True)
+class TrafficRecord:
+    """One recorded ``AuthService`` call."""
+
+    started_at_ns: int
+    duration_us: int
+    operation: str
+    outcome: str
+    key: bytes
+
+
+def outcome_of(result: object) -> str:
+    """Classify a returned result or raised exception as an outcome code.
+
+    A rejected login's internal ``reason`` wins over its public code, so an
+    unknown email is recorded as ``USER_NOT_FOUND`` rather than as the
+    ``INVALID_CREDENTIALS`` the client sees.
+    """
+    reason = getattr(result, "reason", None)
+    if reason in OUTCOMES:
+        return str(reason)
+    if isinstance(result, BaseApplicationError):
+        code = result.code or "ERROR"
+    elif isinstance(result, BaseException):
+        code = "ERROR"
+    elif getattr(result, "success", True) is False:
+        code = getattr(result, "code", "ERROR")
+    elif getattr(result, "is_valid", True) is False:
+        code = "INVALID_TOKEN"
+    else:
+        code = "OK"
+    return code if code in OUTCOMES else "ERROR"
+
+
+class TrafficRecorder:
+    """Appends one fixed-size record per ``AuthService`` call to a log file.
+
+    Records are buffered; call ``flush`` or ``close`` to write them out.
+    """
+
+    def __init__(self, path: Path | str, secret: bytes | None = None):
+        """Open the log for appending, writing a header if it is new.
+
+        Args:
+            path: Log file to append to
+            secret: Key for hashing emails and tokens; pass the same secret
+                to every process appending to one log so keys stay
+                comparable. Defaults to a random per-recorder key.
+        """
+        self.path = Path(path)
+        self._secret = secret if secret is not None else os.urandom(16)
+        self._file = self.path.open("ab")
+        if self._file.tell() == 0:
+            self._file.write(_HEADER.pack(MAGIC, VERSION))
+        self._wall_offset_ns = time.time_ns() - time.perf_counter_ns()
+
+    def hash_key(self, key: str) -> bytes:
+        """Return the 8-byte keyed digest stored for an email or token."""
+        return hashlib.blake2b(key.encode(), digest_size=8, key=self._secret).digest()
+
+    def record(
+        self,
+        operation: str,
+        key: str,
+        started_ns: int,
+        ended_ns: int,
+        outcome: str,
+    ) -> None:
+        """Append a call.
+
+        Args:
+            operation: Name from ``OPERATIONS``
+            key: Email or token the call was made with; only its digest
+                is stored
+            started_ns: ``time.perf_counter_ns`` when the call started
+            ended_ns: ``time.perf_counter_ns`` when the call finished
+            outcome: Code from ``OUTCOMES``
+        """
+        duration_us = min((ended_ns - started_ns) // 1000, 0xFFFFFFFF)
+        self._file.write(
+            _RECORD.pack(
+                started_ns + self._wall_offset_ns,
+                duration_us,
+                OPERATIONS.index(operation),
+                OUTCOMES.index(outcome),
+                self.hash_key(key),
+            )
+        )
+
+    def flush(self) -> None:
+        """Write buffered records to the log."""
+        self._file.flush()
+
+    def close(self) -> None:
+        """Flush and close the log."""
+        self._file.close()
+
+
+class _Recordable(Protocol):
+    recorder: TrafficRecorder | None
+
+
+def recorded[S: _Recordable, **P, R](
+    operation: str,
+    key: str,
+) -> Callable[
+    [Callable[Concatenate[S, P], Awaitable[R]]],
+    Callable[Concatenate[S, P], Awaitable[R]],
+]:
+    """Record calls of an async method when its instance has a recorder.
+
+    Args:
+        operation: Name from ``OPERATIONS``
+        key: Name of the parameter holding the email or token; it must be
+            the first parameter after ``self``
+    """
+
+    def decorate(
+        func: Callable[Concatenate[S, P], Awaitable[R]],
+    ) -> Callable[Concatenate[S, P], Awaitable[R]]:
+        @functools.wraps(func)
+        async def wrapper(self: S, /, *args: P.args, **kwargs: P.kwargs) -> R:
+            recorder = self.recorder
+            if recorder is None:
+                return await func(self, *args, **kwargs)
+            value = args[0] if args else kwargs.get(key, "")
+            started = time.perf_counter_ns()
+            try:
+                result = await func(self, *args, **kwargs)
+            except Exception as e:
+                recorder.record(
+                    operation,
+                    str(value),
+                    started,
+                    time.perf_counter_ns(),
+                    outcome_of(e),
+                )
+                raise
+            recorder.record(
+                operation,
+                str(value),
+                started,
+                time.perf_counter_ns(),
+                outcome_of(result),
+            )
+            return result
+
+        return wrapper
+
+    return decorate
+
+
+def read_log(path: Path | str) -> Iterator[TrafficRecord]:
+    """Yield the records of a traffic log in the order they were written.
+
+    Args:
+        path: Log written by ``TrafficRecorder``
+
+    Raises:
+        ValueError: If the file is not a supported traffic log
+    """
+    with Path(path).open("rb") as file:
+        header = file.read(_HEADER.size)
+        if len(header) < _HEADER.size or _HEADER.unpack(header) != (MAGIC, VERSION):
+            msg = "Not a supported traffic log"
+            raise ValueError(msg)
+        while len(raw := file.read(_RECORD.size)) == _RECORD.size:
+            started, duration, operation, outcome, key = _RECORD.unpack(raw)
+            yield TrafficRecord(
+                started, duration, OPERATIONS[operation], OUTCOMES[outcome], key
+            )
+
+
+@dataclass(frozen=True, slots=True)
+class LatencySummary:
+    """Latency percentiles of one operation, in milliseconds."""
+
+    count: int
+    p50: float
+    p95: float
+    p99: float
+
+
+def _percentile(sorted_values: list[float], quantile: float) -> float:
+    index = min(len(sorted_values) - 1, math.ceil(quantile * len(sorted_values)) - 1)
+    return sorted_values[max(index, 0)]
+
+
+@dataclass
+class ReplayReport:
+    """Latencies and outcomes observed while replaying a log."""
+
+    latencies: dict[str, list[float]] = field(default_factory=dict)
+    mismatches: int = 0
+
+    def summary(self) -> dict[str, LatencySummary]:
+        """Return latency percentiles per operation."""
+        result = {}
+        for operation, values in sorted(self.latencies.items()):
+            ordered = sorted(values)
+            result[operation] = LatencySummary(
+                len(ordered),
+                _percentile(ordered, 0.50) * 1000,
+                _percentile(ordered, 0.95) * 1000,
+                _percentile(ordered, 0.99) * 1000,
+            )
+        return result
+
+    def save(self, path: Path | str) -> None:
+        """Write the report as JSON for a later ``compare_reports``."""
+        Path(path).write_text(
+            json.dumps({"latencies": self.latencies, "mismatches": self.mismatches}),
+            encoding="utf-8",
+        )
+
+    @classmethod
+    def load(cls, path: Path | str) -> "ReplayReport":
+        """Read a report written by ``save``."""
+        data = json.loads(Path(path).read_text(encoding="utf-8"))
+        return cls(data["latencies"], data["mismatches"])
+
+
+def compare_reports(baseline: ReplayReport, candidate: ReplayReport) -> str:
+    """Render a per-operation latency comparison of two replays.
+
+    Args:
+        baseline: Replay against the current build
+        candidate: Replay against the build under test
+
+    Returns:
+        Plain-text table with p50/p95/p99 in milliseconds and their change
+    """
+    before, after = baseline.summary(), candidate.summary()
+    lines = [
+        f"{'operation':<24}{'count':>8}"
+        + "".join(f"{q + ' ms':>26}" for q in ("p50", "p95", "p99"))
+    ]
+    for operation in sorted(before.keys() & after.keys()):
+        old, new = before[operation], after[operation]
+        cells = []
+        for q in ("p50", "p95", "p99"):
+            a, b = getattr(old, q), getattr(new, q)
+            change = f"{(b - a) / a:+.0%}" if a else "n/a"
+            cells.append(f"{f'{a:.3f} -> {b:.3f} ({change})':>26}")
+        lines.append(f"{operation:<24}{new.count:>8}" + "".join(cells))
+    lines.append(f"outcome mismatches: {baseline.mismatches} -> {candidate.mismatches}")
+    return "\n".join(lines)
+
+
+async def _seed(
+    service: "AuthService",
+    records: list[TrafficRecord],
+) -> tuple[dict[bytes, str], dict[bytes, str]]:
+    """Create one synthetic user per recorded key that resolved to a user.
+
+    Keys only ever seen as unknown or malformed emails get an address but
+    no user, so their logins are rejected before any password check, as
+    they were when recorded.
+
+    Returns:
+        Synthetic email of every key, and access token of every seeded key
+    """
+    hashed = service.token_service.hash_password(REPLAY_PASSWORD)
+    unresolved = {"USER_NOT_FOUND", "VALIDATION_ERROR"}
+    emails = {
+        record.key: f"{record.key.hex()}@replay.example.com" for record in records
+    }
+    seeded = {record.key for record in records if record.outcome not in unresolved}
+    tokens: dict[bytes, str] = {}
+    for key in seeded:
+        user = await service.database.create_user(
+            {
+                "id": f"replay-{key.hex()}",
+                "email": emails[key],
+                "name": "Replay User",
+                "hashed_password": hashed,
+                "is_active": True,
+                "created_at": datetime.now(UTC),
+            }
+        )
+        tokens[key] = service.token_service.create_access_token(user.id, user.email)
+    return emails, tokens
+
+
+def _request(
+    service: "AuthService",
+    record: TrafficRecord,
+    email: str,
+    token: str,
+) -> Awaitable[object]:
+    """Build the call reproducing a record's operation and outcome."""
+    ok = record.outcome == "OK"
+    if record.operation == "validate_token":
+        return service.validate_token(token if ok else "replay-invalid-token")
+    if record.operation == "request_password_reset":
+        return service.request_password_reset(email)
+    if record.outcome == "VALIDATION_ERROR":
+        email = "not-an-email"
+    wrong_password = record.outcome == "INVALID_CREDENTIALS"
+    password = "Wrong-" + REPLAY_PASSWORD if wrong_password else REPLAY_PASSWORD
+    if record.operation == "try_login":
+        return service.try_login(email, password)
+    return service.login(email, password)
+
+
+async def replay(
+    path: Path | str,
+    service: "AuthService",
+    speed: float = 1.0,
+) -> ReplayReport:
+    """Re-drive a recorded schedule against an ``AuthService``.
+
+    One synthetic user is created in ``service.database`` for every
+    recorded key that resolved to a user, so hot keys stay hot and logins
+    for unknown emails stay unknown. Records are logged as calls
+    finish, so they are put back in start order first; calls then start
+    at their offsets from the earliest start, divided by ``speed``, and
+    run concurrently, as they did in production. Each call is built to
+    reproduce the recorded outcome; calls that end differently are
+    counted in ``mismatches``.
+
+    Args:
+        path: Log written by ``TrafficRecorder``
+        service: Service built on local backends
+        speed: Schedule speed-up; ``math.inf`` sends calls back to back
+
+    Returns:
+        Latencies observed per operation
+    """
+    records = sorted(read_log(path), key=attrgetter("started_at_ns"))
+    report = ReplayReport()
+    if not records:
+        return report
+    emails, tokens = await _seed(service, records)
+    samples: dict[str, list[float]] = defaultdict(list)
+
+    async def run(record: TrafficRecord) -> None:
+        token = tokens.get(record.key, "")
+        call = _request(service, record, emails[record.key], token)
+        started = time.perf_counter()
+        try:
+            result = await call
+        except Exception as e:  # noqa: BLE001 - failures are outcomes here
+            result = e
+        samples[record.operation].append(time.perf_counter() - started)
+        if outcome_of(result) != record.outcome:
+            report.mismatches += 1
+
+    loop = asyncio.get_running_loop()
+    origin, first = loop.time(), records[0].started_at_ns
+    tasks = []
+    for record in records:
+        delay = (record.started_at_ns - first) / 1e9 / speed
+        wait = origin + delay - loop.time()
+        if wait > 0:
+            await asyncio.sleep(wait)
+        tasks.append(asyncio.create_task(run(record)))
+    await asyncio.gather(*tasks)
+
+    report.latencies = dict(samples)
+    return report
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Compare two saved replay reports on the command line."""
+    parser = argparse.ArgumentParser(description="Compare two replay reports")
+    parser.add_argument("baseline", type=Path, help="report of the current build")
+    parser.add_argument("candidate", type=Path, help="report of the new build")
+    args = parser.parse_args(argv)
+
+    report = compare_reports(
+        ReplayReport.load(args.baseline), ReplayReport.load(args.candidate)
+    )
+    # Print statements are used for command line output
+    print(report)  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Coalescing of pending user updates into single writes."""
+
+import asyncio
+
+from backend.models.user import User, UserUpdate, merge_updates
+from backend.services.protocols import DatabaseProtocol
+
+
+class PendingUserUpdates:
+    """Buffer that merges updates per user and writes each user once.
+
+    Several updates staged for the same user between flushes become one
+    ``update_user`` call holding the union of their fields.
+    """
+
+    def __init__(self) -> None:
+        self._pending: dict[str, UserUpdate] = {}
+
+    def __len__(self) -> int:
+        """Return the number of users with pending updates."""
+        return len(self._pending)
+
+    def stage(self, user_id: str, update: UserUpdate) -> None:
+        """Merge an update into the user's pending write.
+
+        Args:
+            user_id: User's unique identifier
+            update: Fields to update
+        """
+        if update:
+            self._pending[user_id] = merge_updates(
+                self._pending.get(user_id, {}), update
+            )
+
+    def stage_user(self, user: User) -> None:
+        """Stage a user's dirty fields and mark the user clean.
+
+        Args:
+            user: User whose tracked assignments should be written
+        """
+        self.stage(user.id, user.changes())
+        user.mark_clean()
+
+    async def flush(self, database: DatabaseProtocol) -> int:
+        """Write all pending updates concurrently.
+
+        Updates that fail are staged again, underneath anything staged for
+        the same user while the flush was running.
+
+        Args:
+            database: Database to write to
+
+        Returns:
+            Number of users written
+
+        Raises:
+            Exception: The first error raised by a failed write
+        """
+        pending, self._pending = self._pending, {}
+        results = await asyncio.gather(
+            *(database.update_user(uid, update) for uid, update in pending.items()),
+            return_exceptions=True,
+        )
+        errors = []
+        for (user_id, update), result in zip(pending.items(), results, strict=True):
+            if isinstance(result, BaseException):
+                self._pending[user_id] = merge_updates(
+                    update, self._pending.get(user_id, {})
+                )
+                errors.append(result)
+        if errors:
+            raise errors[0]
+        return len(pending)
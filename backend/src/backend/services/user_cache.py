@@ -0,0 +1,266 @@
+"""Read-through caching of users in front of a database."""
+
+import asyncio
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass, replace
+from typing import Any
+
+from backend.models.user import User, UserUpdate
+from backend.services.protocols import DatabaseProtocol
+from backend.services.snapshot import LookupKind, UserSnapshot
+
+
+@dataclass(slots=True)
+class CachedUser:
+    """A cached user and the wall-clock time it was loaded."""
+
+    user: User
+    cached_at: float
+
+
+class UserCache:
+    """LRU cache of users by ID and email, with negative lookups.
+
+    Hits are returned as copies so callers can mutate them freely.
+    Positive entries live for ``ttl`` seconds and misses for
+    ``negative_ttl`` seconds.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 10_000,
+        ttl: float = 300.0,
+        negative_ttl: float = 30.0,
+        clock: Callable[[], float] = time.time,
+    ):
+        """Initialize the cache.
+
+        Args:
+            max_entries: Users kept before the least recently used is evicted
+            ttl: Seconds a cached user stays fresh
+            negative_ttl: Seconds a cached miss stays fresh
+            clock: Wall-clock time source, injectable for tests
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.clock = clock
+        self._users: OrderedDict[str, CachedUser] = OrderedDict()
+        self._ids_by_email: dict[str, str] = {}
+        self._missing: OrderedDict[tuple[LookupKind, str], float] = OrderedDict()
+
+    def __len__(self) -> int:
+        """Return the number of cached users."""
+        return len(self._users)
+
+    def get(
+        self, kind: LookupKind, key: str, max_age: float | None = None
+    ) -> User | None:
+        """Return a copy of a cached user, or None if not cached or too old.
+
+        Args:
+            kind: Whether ``key`` is a user ID or an email
+            key: User ID or email
+            max_age: Oldest entry to accept, defaults to ``ttl``
+        """
+        user_id = key if kind == "id" else self._ids_by_email.get(key)
+        entry = self._users.get(user_id) if user_id is not None else None
+        if entry is None:
+            return None
+        limit = self.ttl if max_age is None else max_age
+        if self.clock() - entry.cached_at > limit:
+            return None
+        self._users.move_to_end(entry.user.id)
+        return replace(entry.user)
+
+    def is_missing(self, kind: LookupKind, key: str) -> bool:
+        """Return whether a fresh negative lookup is cached for a key."""
+        cached_at = self._missing.get((kind, key))
+        return cached_at is not None and self.clock() - cached_at <= self.negative_ttl
+
+    def put(self, user: User, cached_at: float | None = None) -> None:
+        """Cache a copy of a user.
+
+        Args:
+            user: User to cache
+            cached_at: When the user was loaded, defaults to now
+        """
+        previous = self._users.pop(user.id, None)
+        if previous is not None and previous.user.email != user.email:
+            self._ids_by_email.pop(previous.user.email, None)
+        self._users[user.id] = CachedUser(
+            replace(user), self.clock() if cached_at is None else cached_at
+        )
+        self._ids_by_email[user.email] = user.id
+        self._missing.pop(("id", user.id), None)
+        self._missing.pop(("email", user.email), None)
+        while len(self._users) > self.max_entries:
+            _, evicted = self._users.popitem(last=False)
+            self._ids_by_email.pop(evicted.user.email, None)
+
+    def put_missing(
+        self,
+        kind: LookupKind,
+        key: str,
+        cached_at: float | None = None,
+    ) -> None:
+        """Cache that no user exists for a key."""
+        self._missing[(kind, key)] = self.clock() if cached_at is None else cached_at
+        self._missing.move_to_end((kind, key))
+        while len(self._missing) > self.max_entries:
+            self._missing.popitem(last=False)
+
+    def apply(self, user_id: str, update: UserUpdate) -> None:
+        """Apply a written update to the cached user, if present."""
+        entry = self._users.get(user_id)
+        if entry is not None:
+            self.put(replace(entry.user, **update), entry.cached_at)
+
+    def invalidate(self, user_id: str) -> None:
+        """Drop a user from the cache."""
+        entry = self._users.pop(user_id, None)
+        if entry is not None:
+            self._ids_by_email.pop(entry.user.email, None)
+
+    def export(
+        self,
+    ) -> tuple[list[tuple[User, float]], list[tuple[LookupKind, str, float]]]:
+        """Return cached users and negative lookups with their load times."""
+        return (
+            [(entry.user, entry.cached_at) for entry in self._users.values()],
+            [(kind, key, at) for (kind, key), at in self._missing.items()],
+        )
+
+
+class CachedDatabase:
+    """``DatabaseProtocol`` wrapper that serves reads from a ``UserCache``.
+
+    Writes go through to the database and are applied to the cache. When
+    a warm-start ``UserSnapshot`` is given, cache misses are served from
+    it first and the entry is revalidated against the database in the
+    background. The snapshot is dropped once all of its entries have
+    outlived its ``max_age``.
+    """
+
+    def __init__(
+        self,
+        database: DatabaseProtocol,
+        cache: UserCache | None = None,
+        snapshot: UserSnapshot | None = None,
+    ):
+        """Initialize the wrapper.
+
+        Args:
+            database: Database to read through to
+            cache: Cache to use, defaults to a new ``UserCache``
+            snapshot: Warm-start snapshot to serve misses from
+        """
+        self.database = database
+        self.cache = cache if cache is not None else UserCache()
+        self.snapshot = snapshot
+        self._revalidating: dict[tuple[LookupKind, str], asyncio.Task[None]] = {}
+
+    async def get_user_by_email(self, email: str) -> User | None:
+        """Get a user by email from the cache, snapshot or database.
+
+        Args:
+            email: User's email address
+
+        Returns:
+            User object if found, None otherwise
+        """
+        return await self._get("email", email)
+
+    async def get_user_by_id(self, user_id: str) -> User | None:
+        """Get a user by ID from the cache, snapshot or database.
+
+        Args:
+            user_id: User's unique identifier
+
+        Returns:
+            User object if found, None otherwise
+        """
+        return await self._get("id", user_id)
+
+    async def update_user(self, user_id: str, data: UserUpdate) -> None:
+        """Update a user in the database and the cache.
+
+        Args:
+            user_id: User's unique identifier
+            data: Fields to update
+        """
+        await self.database.update_user(user_id, data)
+        self.cache.apply(user_id, data)
+
+    async def create_user(self, user_data: dict[str, Any]) -> User:
+        """Create a user in the database and cache it.
+
+        Args:
+            user_data: Dictionary containing user information
+
+        Returns:
+            Created user object
+        """
+        user = await self.database.create_user(user_data)
+        self.cache.put(user)
+        return user
+
+    async def wait_revalidated(self) -> None:
+        """Wait for all pending background revalidations."""
+        while self._revalidating:
+            await asyncio.gather(*self._revalidating.values())
+
+    async def _get(self, kind: LookupKind, key: str) -> User | None:
+        """Look a user up by ID or email through each tier in turn."""
+        user = self.cache.get(kind, key)
+        if user is not None:
+            return user
+        if self.cache.is_missing(kind, key):
+            return None
+
+        if self.snapshot is not None and self.snapshot.expired:
+            self.snapshot = None
+        if self.snapshot is not None:
+            warm = self.snapshot.lookup(kind, key)
+            if warm is not None:
+                warm_user, cached_at = warm
+                self.cache.put(warm_user, cached_at)
+                self._revalidate(kind, key)
+                return warm_user
+            if self.snapshot.is_missing(kind, key):
+                self.cache.put_missing(kind, key)
+                self._revalidate(kind, key)
+                return None
+
+        return await self._load(kind, key)
+
+    async def _load(self, kind: LookupKind, key: str) -> User | None:
+        """Read a user from the database and cache the outcome."""
+        if kind == "id":
+            user = await self.database.get_user_by_id(key)
+        else:
+            user = await self.database.get_user_by_email(key)
+        if user is None:
+            self.cache.put_missing(kind, key)
+        else:
+            self.cache.put(user)
+        return user
+
+    def _revalidate(self, kind: LookupKind, key: str) -> None:
+        """Refresh a snapshot-served entry from the database in the background."""
+        if (kind, key) in self._revalidating:
+            return
+
+        async def refresh() -> None:
+            try:
+                await self._load(kind, key)
+            except Exception:  # noqa: BLE001 - the next read retries the database
+                user = self.cache.get(kind, key, max_age=float("inf"))
+                if user is not None:
+                    self.cache.invalidate(user.id)
+            finally:
+                del self._revalidating[(kind, key)]
+
+        self._revalidating[(kind, key)] = asyncio.create_task(refresh())
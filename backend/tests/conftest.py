@@ -0,0 +1,93 @@
+"""Shared pytest configuration and test doubles for the backend suite."""
+
+from datetime import UTC, datetime
+from typing import Any
+from unittest.mock import AsyncMock
+
+import pytest
+
+from backend.services.auth_service import AuthService
+from backend.services.memory_database import InMemoryDatabase
+
+
+def pytest_collection_modifyitems(
+    config: pytest.Config, items: list[pytest.Item]
+) -> None:
+    """Skip timing benchmarks while coverage is measuring.
+
+    Coverage tracing slows Python code several-fold and unevenly, so
+    wall-clock assertions are only meaningful with it off. Run them with
+    ``pytest -m timing --no-cov`` (``hatch run test:run-bench``).
+    """
+    if not config.getoption("cov_source", default=None) or config.getoption(
+        "no_cov", default=False
+    ):
+        return
+    skip = pytest.mark.skip(
+        reason="coverage distorts timings; run pytest -m timing --no-cov"
+    )
+    for item in items:
+        if item.get_closest_marker("timing") is not None:
+            item.add_marker(skip)
+
+
+class FakeClock:
+    """Manually advanced time source for components taking a ``clock``."""
+
+    def __init__(self, now: float = 0.0) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FakeTokenService:
+    """Token service with readable, unsigned tokens."""
+
+    def hash_password(self, password: str) -> str:
+        return f"hashed:{password}"
+
+    def verify_password(self, plain_password: str, hashed_password: str) -> bool:
+        return hashed_password == f"hashed:{plain_password}"
+
+    def create_access_token(self, user_id: str, email: str) -> str:
+        return f"access:{user_id}:{email}"
+
+    def create_refresh_token(self, user_id: str, email: str) -> str:
+        return f"refresh:{user_id}:{email}"
+
+    def create_reset_token(self, user_id: str) -> str:
+        return f"reset:{user_id}"
+
+    def decode_token(self, token: str) -> dict[str, Any]:
+        kind, user_id, _ = token.split(":")
+        if kind != "access":
+            raise ValueError("Invalid token")
+        return {"sub": user_id}
+
+
+async def make_auth_service(
+    token_service: object | None = None,
+    hashed_password: str = "hashed:ValidPassword123!",  # noqa: S107 - fake hash
+) -> AuthService:
+    """Build an AuthService over an in-memory store holding John Doe.
+
+    Args:
+        token_service: Token service to use, defaults to ``FakeTokenService``
+        hashed_password: Stored password hash of ``john.doe@example.com``
+    """
+    database = InMemoryDatabase()
+    await database.create_user(
+        {
+            "id": "user123",
+            "email": "john.doe@example.com",
+            "name": "John Doe",
+            "hashed_password": hashed_password,
+            "created_at": datetime(2026, 1, 1, tzinfo=UTC),
+        }
+    )
+    return AuthService(
+        database,
+        token_service or FakeTokenService(),  # type: ignore[arg-type]
+        AsyncMock(),
+    )
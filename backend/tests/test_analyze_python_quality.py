@@ -0,0 +1,184 @@
+"""Tests for the streaming quality-report analyzer in scripts/."""
+
+import importlib.util
+import io
+import json
+import subprocess
+import sys
+from pathlib import Path
+from types import ModuleType
+
+import pytest
+
+SCRIPT = Path(__file__).resolve().parents[2] / "scripts" / "analyze-python-quality.py"
+
+
+def load_script() -> ModuleType:
+    spec = importlib.util.spec_from_file_location("analyze_python_quality", SCRIPT)
+    assert spec is not None
+    assert spec.loader is not None
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+analyzer = load_script()
+
+RUFF = [{"code": "E501", "location": {"row": 10, "column": 88}}] * 7
+MYPY = {"messages": [{"line": 12345, "message": "x" * 40}] * 3, "summary": -1.5e-3}
+BANDIT = {"errors": [], "results": [{"line_range": [1, 22]}] * 4, "metrics": {}}
+COVERAGE = {
+    "meta": {"version": "7.6.1"},
+    "files": {f"src/m{i}.py": {"summary": {"percent_covered": 12.5}} for i in range(5)},
+    "totals": {"covered_lines": 1234, "percent_covered": 93.87654321},
+}
+
+
+def analyze_text(analyze: object, text: str, chunk_size: int) -> object:
+    stream = analyzer.JsonStream(io.StringIO(text), chunk_size=chunk_size)
+    return analyze(stream)  # type: ignore[operator]
+
+
+@pytest.fixture
+def reports_dir(tmp_path: Path) -> Path:
+    reports = tmp_path / "quality-reports"
+    reports.mkdir()
+    for name, report in (
+        ("ruff-detailed.json", RUFF),
+        ("mypy-report.json", MYPY),
+        ("bandit-report.json", BANDIT),
+        ("coverage.json", COVERAGE),
+    ):
+        (reports / name).write_text(json.dumps(report, indent=1))
+    return reports
+
+
+class TestJsonStream:
+    @pytest.mark.parametrize("chunk_size", [1, 2, 3, 5, 8, 13, 64])
+    def test_should_match_json_load_at_any_chunk_boundary(
+        self,
+        chunk_size: int,
+    ) -> None:
+        """
+        Given: Reports with numbers, strings and nesting across chunk edges
+        When: Each is streamed with a tiny chunk size
+        Then: The counts and coverage match a full json.load
+        """
+        metrics = analyzer.METRICS
+
+        ruff = analyze_text(metrics["ruff_violations"][1], json.dumps(RUFF), chunk_size)
+        mypy = analyze_text(metrics["mypy_errors"][1], json.dumps(MYPY), chunk_size)
+        bandit = analyze_text(
+            metrics["bandit_issues"][1], json.dumps(BANDIT), chunk_size
+        )
+        coverage = analyze_text(
+            metrics["test_coverage"][1], json.dumps(COVERAGE), chunk_size
+        )
+
+        assert (ruff, mypy, bandit) == (len(RUFF), 3, 4)
+        assert coverage == round(COVERAGE["totals"]["percent_covered"], 2)  # type: ignore[index]
+
+    @pytest.mark.parametrize("chunk_size", [1, 2, 3, 4])
+    def test_should_not_cut_numbers_at_a_chunk_boundary(self, chunk_size: int) -> None:
+        stream = analyzer.JsonStream(
+            io.StringIO("[12345.678e-2, -0.5, 1e3]"), chunk_size=chunk_size
+        )
+
+        values = [stream.value() for _ in stream.items()]
+
+        assert values == [12345.678e-2, -0.5, 1e3]
+
+    def test_should_reject_truncated_reports(self) -> None:
+        stream = analyzer.JsonStream(io.StringIO('{"results": [1, 2'), chunk_size=4)
+
+        with pytest.raises(ValueError):  # noqa: PT011
+            analyzer.count_member_items("results")(stream)
+
+
+class TestHistory:
+    def test_should_reuse_value_when_report_digest_is_unchanged(
+        self,
+        reports_dir: Path,
+        tmp_path: Path,
+    ) -> None:
+        conn = analyzer.open_history(str(tmp_path / "history.sqlite"))
+        path = str(reports_dir / "ruff-detailed.json")
+        calls = []
+
+        def count(stream: object) -> int:
+            calls.append(stream)
+            return analyzer.count_ruff(stream)  # type: ignore[no-any-return]
+
+        first = analyzer.measure(conn, "ruff_violations", path, count)
+        second = analyzer.measure(conn, "ruff_violations", path, count)
+        (reports_dir / "ruff-detailed.json").write_text(json.dumps(RUFF[:2]))
+        third = analyzer.measure(conn, "ruff_violations", path, count)
+        conn.close()
+
+        assert first == (len(RUFF), False)
+        assert second == (len(RUFF), True)
+        assert third == (2, False)
+        assert len(calls) == 2
+
+    def test_should_write_summary_and_history(
+        self,
+        reports_dir: Path,
+        tmp_path: Path,
+    ) -> None:
+        db = str(tmp_path / "history.sqlite")
+
+        summary = analyzer.analyze_python_quality(str(reports_dir), db)
+
+        written = json.loads((reports_dir / "python-summary.json").read_text())
+        assert written == summary
+        assert summary["ruff_violations"] == len(RUFF)
+        assert summary["test_coverage"] == 93.88
+        conn = analyzer.open_history(db)
+        rows = analyzer.query_history(conn, "mypy_errors")
+        conn.close()
+        assert rows == [(summary["timestamp"], 3.0)]
+
+    def test_should_query_a_date_range_from_the_command_line(
+        self,
+        reports_dir: Path,
+    ) -> None:
+        """
+        Given: A history with a month of daily coverage values
+        When: The script is run with --query and a --since/--until range
+        Then: Only that range is printed, as JSON in date order
+        """
+        conn = analyzer.open_history(str(reports_dir / "quality-history.sqlite"))
+        with conn:
+            conn.executemany(
+                "INSERT INTO quality_history (date, metric, value) VALUES (?, ?, ?)",
+                [
+                    (f"2026-01-{day:02d}", metric, day)
+                    for day in range(31, 0, -1)
+                    for metric in ("test_coverage", "ruff_violations")
+                ],
+            )
+        conn.close()
+
+        result = subprocess.run(  # noqa: S603
+            [
+                sys.executable,
+                str(SCRIPT),
+                "--reports-dir",
+                str(reports_dir),
+                "--query",
+                "test_coverage",
+                "--since",
+                "2026-01-10",
+                "--until",
+                "2026-01-12",
+            ],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+
+        assert json.loads(result.stdout) == [
+            {"date": "2026-01-10", "value": 10.0},
+            {"date": "2026-01-11", "value": 11.0},
+            {"date": "2026-01-12", "value": 12.0},
+        ]
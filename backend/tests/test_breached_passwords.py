@@ -0,0 +1,137 @@
+"""Tests for the memory-mapped breached-password index."""
+
+import hashlib
+import time
+from pathlib import Path
+from unittest.mock import Mock
+
+import pytest
+
+from backend.exceptions import ValidationError
+from backend.services.auth_service import AuthService
+from backend.services.breached_passwords import (
+    BreachedPasswordIndex,
+    build_index,
+    main,
+)
+
+BREACHED = ["Password123", "Summer2024!", "Qwerty123", "Welcome1"]
+
+
+def sha1_line(password: str, count: int = 1) -> str:
+    digest = hashlib.sha1(password.encode(), usedforsecurity=False).hexdigest()
+    return f"{digest.upper()}:{count}\n"
+
+
+@pytest.fixture
+def index_path(tmp_path: Path) -> Path:
+    lines = [sha1_line(f"filler-{i}") for i in range(5_000)]
+    lines += [sha1_line(password) for password in BREACHED]
+    lines.reverse()
+    path = tmp_path / "breached.idx"
+    build_index(lines, path, chunk_size=700)
+    return path
+
+
+class TestBreachedPasswordIndex:
+    def test_should_find_every_breached_password(self, index_path: Path) -> None:
+        with BreachedPasswordIndex(index_path) as index:
+            assert len(index) == 5_004
+            assert all(index.is_breached(password) for password in BREACHED)
+            assert index.is_breached("filler-4999")
+
+    def test_should_not_find_unbreached_passwords(self, index_path: Path) -> None:
+        with BreachedPasswordIndex(index_path) as index:
+            assert not index.is_breached("CorrectHorse9Battery")
+            assert not any(index.is_breached(f"other-{i}") for i in range(1_000))
+
+    def test_should_deduplicate_entries(self, tmp_path: Path) -> None:
+        lines = [sha1_line("Password123", count) for count in range(10)]
+        lines.append("\n")
+
+        count = build_index(lines, tmp_path / "dup.idx", chunk_size=3)
+
+        assert count == 1
+
+    def test_should_reject_malformed_input(self, tmp_path: Path) -> None:
+        with pytest.raises(ValueError, match="SHA-1"):
+            build_index(["abcdef:3\n"], tmp_path / "bad.idx")
+
+    def test_should_keep_mapped_index_intact_during_rebuild(
+        self,
+        index_path: Path,
+    ) -> None:
+        """
+        Given: A worker with the index mapped
+        When: The index is rebuilt in place from a different corpus
+        Then: The worker keeps its answers and a reopened index sees the new one
+        """
+        with BreachedPasswordIndex(index_path) as mapped:
+            build_index([sha1_line("Rebuilt123")], index_path)
+
+            assert len(mapped) == 5_004
+            assert all(mapped.is_breached(password) for password in BREACHED)
+            assert not mapped.is_breached("Rebuilt123")
+
+        with BreachedPasswordIndex(index_path) as reopened:
+            assert reopened.is_breached("Rebuilt123")
+            assert not reopened.is_breached("Password123")
+        assert [p.name for p in index_path.parent.iterdir()] == [index_path.name]
+
+    def test_should_reject_foreign_files(self, tmp_path: Path) -> None:
+        path = tmp_path / "foreign.idx"
+        path.write_bytes(b"not an index" * 100)
+
+        with pytest.raises(ValueError, match="index"):
+            BreachedPasswordIndex(path)
+
+    def test_should_build_index_from_command_line(self, tmp_path: Path) -> None:
+        source = tmp_path / "hashes.txt"
+        source.write_text("".join(sha1_line(p) for p in BREACHED))
+
+        main([str(source), str(tmp_path / "cli.idx")])
+
+        with BreachedPasswordIndex(tmp_path / "cli.idx") as index:
+            assert index.is_breached("Welcome1")
+
+    @pytest.mark.slow
+    @pytest.mark.timing
+    def test_benchmark_lookup_latency(self, tmp_path: Path) -> None:
+        path = tmp_path / "large.idx"
+        build_index((sha1_line(f"pw-{i}") for i in range(200_000)), path)
+        candidates = [f"pw-{i * 7}" for i in range(10_000)]
+
+        with BreachedPasswordIndex(path) as index:
+            started = time.perf_counter()
+            hits = sum(index.is_breached(password) for password in candidates)
+            per_lookup = (time.perf_counter() - started) / len(candidates)
+
+        print(f"breached-password lookup: {per_lookup * 1e6:.2f}us")
+        assert hits == len(candidates)
+        assert per_lookup < 20e-6
+
+
+@pytest.mark.asyncio
+class TestPasswordStrengthWithBreachCorpus:
+    async def test_should_reject_breached_password(self, index_path: Path) -> None:
+        """
+        Given: A password that passes the character-class rules
+        When: It appears in the breach corpus
+        Then: Password validation rejects it
+        """
+        with BreachedPasswordIndex(index_path) as index:
+            auth_service = AuthService(Mock(), Mock(), Mock(), index)
+
+            with pytest.raises(ValidationError) as exc_info:
+                await auth_service.validate_password_strength("Password123")
+
+        assert "breach" in str(exc_info.value)
+
+    async def test_should_accept_strong_unbreached_password(
+        self,
+        index_path: Path,
+    ) -> None:
+        with BreachedPasswordIndex(index_path) as index:
+            auth_service = AuthService(Mock(), Mock(), Mock(), index)
+
+            await auth_service.validate_password_strength("CorrectHorse9Battery")
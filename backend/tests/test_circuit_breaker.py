@@ -0,0 +1,453 @@
+"""Tests for circuit breakers and their fast-fail fallbacks."""
+
+import asyncio
+from datetime import UTC, datetime
+from pathlib import Path
+from unittest.mock import Mock
+
+import pytest
+import pytest_asyncio
+
+pytestmark = pytest.mark.asyncio
+
+from backend.exceptions import (
+    CircuitOpenError,
+    DeadlineExceededError,
+    UserNotFoundError,
+)
+from backend.models.user import User
+from backend.services.auth_service import AuthService
+from backend.services.circuit_breaker import (
+    BreakerDatabase,
+    BreakerEmailService,
+    BreakerMetrics,
+    CircuitBreaker,
+)
+from backend.services.deadline import deadline, within_deadline
+from backend.services.email_spool import EmailSpool
+from backend.services.memory_database import InMemoryDatabase
+from backend.services.update_buffer import PendingUserUpdates
+from backend.services.user_cache import UserCache
+from tests.conftest import FakeClock
+
+
+class FlakyDatabase(InMemoryDatabase):
+    """In-memory database that fails or stalls on demand."""
+
+    def __init__(self, clock: FakeClock) -> None:
+        super().__init__()
+        self.clock = clock
+        self.failing = False
+        self.latency = 0.0
+        self.stall = 0.0
+        self.calls = 0
+
+    async def _fault(self) -> None:
+        self.calls += 1
+        self.clock.now += self.latency
+        await asyncio.sleep(self.stall)
+        if self.failing:
+            raise ConnectionError("database unavailable")
+
+    async def get_user_by_email(self, email: str) -> User | None:
+        await self._fault()
+        return await super().get_user_by_email(email)
+
+    async def get_user_by_id(self, user_id: str) -> User | None:
+        await self._fault()
+        return await super().get_user_by_id(user_id)
+
+    async def update_user(self, user_id: str, data: object) -> None:
+        await self._fault()
+        await super().update_user(user_id, data)  # type: ignore[arg-type]
+
+
+class FlakyEmailService:
+    """Email service that records sent emails and fails on demand."""
+
+    def __init__(self) -> None:
+        self.failing = False
+        self.sent: list[tuple[str, str, str]] = []
+
+    async def send_reset_email(self, email: str, name: str, reset_token: str) -> None:
+        if self.failing:
+            raise ConnectionError("email provider unavailable")
+        self.sent.append((email, name, reset_token))
+
+    async def send_welcome_email(self, email: str, name: str) -> None:
+        self.sent.append((email, name, ""))
+
+    async def send_verification_email(
+        self, email: str, name: str, verification_token: str
+    ) -> None:
+        self.sent.append((email, name, verification_token))
+
+
+@pytest.fixture
+def clock() -> FakeClock:
+    return FakeClock(1_000.0)
+
+
+@pytest_asyncio.fixture
+async def database(clock: FakeClock) -> FlakyDatabase:
+    database = FlakyDatabase(clock)
+    await database.create_user(
+        {
+            "id": "user123",
+            "email": "john.doe@example.com",
+            "name": "John Doe",
+            "hashed_password": "hashed",
+            "created_at": datetime(2026, 1, 1, tzinfo=UTC),
+        }
+    )
+    return database
+
+
+def make_breaker(
+    clock: FakeClock, metrics: BreakerMetrics | None = None
+) -> CircuitBreaker:
+    return CircuitBreaker(
+        "database",
+        window=10.0,
+        min_calls=4,
+        failure_rate=0.5,
+        slow_call_duration=1.0,
+        slow_call_rate=0.5,
+        open_duration=30.0,
+        half_open_calls=2,
+        metrics=metrics,
+        clock=clock,
+    )
+
+
+async def trip(breaker: CircuitBreaker, database: FlakyDatabase) -> None:
+    database.failing = True
+    for _ in range(breaker.min_calls):
+        with pytest.raises(ConnectionError):
+            await breaker.call(lambda: database.get_user_by_id("user123"))
+    database.failing = False
+
+
+class TestCircuitBreaker:
+    async def test_should_open_on_error_rate_and_fail_fast(
+        self,
+        clock: FakeClock,
+        database: FlakyDatabase,
+    ) -> None:
+        """
+        Given: A breaker that opens when half of at least four calls fail
+        When: Four calls fail in a row
+        Then: Further calls are rejected without reaching the database
+        """
+        breaker = make_breaker(clock)
+
+        await trip(breaker, database)
+        calls = database.calls
+        with pytest.raises(CircuitOpenError) as exc_info:
+            await breaker.call(lambda: database.get_user_by_id("user123"))
+
+        assert breaker.state == "open"
+        assert database.calls == calls
+        assert exc_info.value.code == "CIRCUIT_OPEN"
+
+    async def test_should_open_on_slow_call_rate(
+        self,
+        clock: FakeClock,
+        database: FlakyDatabase,
+    ) -> None:
+        breaker = make_breaker(clock)
+        database.latency = 2.0
+
+        for _ in range(4):
+            await breaker.call(lambda: database.get_user_by_id("user123"))
+
+        assert breaker.state == "open"
+
+    async def test_should_open_when_calls_run_out_of_deadline(
+        self,
+        clock: FakeClock,
+        database: FlakyDatabase,
+    ) -> None:
+        """
+        Given: A store that stalls past every request deadline
+        When: Reads are made through within_deadline under a 10ms deadline
+        Then: The timeouts open the breaker and later reads fail fast
+        """
+        breaker = make_breaker(clock)
+        guarded = BreakerDatabase(database, breaker)
+        database.stall = 1.0
+
+        for _ in range(4):
+            with deadline(0.01), pytest.raises(DeadlineExceededError):
+                await within_deadline(guarded.get_user_by_id("user123"))
+
+        assert breaker.state == "open"
+        with deadline(0.01), pytest.raises(CircuitOpenError):
+            await within_deadline(guarded.get_user_by_id("user123"))
+        assert database.calls == 4
+
+    async def test_should_count_deadline_errors_despite_ignored_types(
+        self,
+        clock: FakeClock,
+    ) -> None:
+        breaker = make_breaker(clock)
+
+        async def expired() -> None:
+            raise DeadlineExceededError()
+
+        for _ in range(4):
+            with pytest.raises(DeadlineExceededError):
+                await breaker.call(expired)
+
+        assert breaker.state == "open"
+
+    async def test_should_count_other_cancellations_as_slow_calls(
+        self,
+        clock: FakeClock,
+    ) -> None:
+        breaker = make_breaker(clock)
+        task = asyncio.create_task(breaker.call(lambda: asyncio.sleep(1.0)))
+        await asyncio.sleep(0)
+
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+        assert breaker._slow == 1
+        assert breaker._failures == 0
+
+    async def test_should_forget_failures_outside_the_window(
+        self,
+        clock: FakeClock,
+        database: FlakyDatabase,
+    ) -> None:
+        breaker = make_breaker(clock)
+        database.failing = True
+        for _ in range(3):
+            with pytest.raises(ConnectionError):
+                await breaker.call(lambda: database.get_user_by_id("user123"))
+        database.failing = False
+        clock.now += 60.0
+
+        await breaker.call(lambda: database.get_user_by_id("user123"))
+
+        assert breaker.state == "closed"
+
+    async def test_should_not_count_application_errors_as_failures(
+        self,
+        clock: FakeClock,
+        database: FlakyDatabase,
+    ) -> None:
+        breaker = make_breaker(clock)
+
+        for _ in range(4):
+            with pytest.raises(UserNotFoundError):
+                await breaker.call(lambda: database.update_user("missing", {}))
+
+        assert breaker.state == "closed"
+
+    async def test_should_close_after_successful_half_open_trials(
+        self,
+        clock: FakeClock,
+        database: FlakyDatabase,
+    ) -> None:
+        """
+        Given: An open breaker whose open period has elapsed
+        When: Two trial calls succeed
+        Then: The breaker closes and every transition is counted
+        """
+        metrics = BreakerMetrics()
+        breaker = make_breaker(clock, metrics)
+        await trip(breaker, database)
+        clock.now += 30.0
+
+        await breaker.call(lambda: database.get_user_by_id("user123"))
+        assert breaker.state == "half_open"
+        await breaker.call(lambda: database.get_user_by_id("user123"))
+
+        assert breaker.state == "closed"
+        assert metrics.transitions == {
+            ("database", "closed", "open"): 1,
+            ("database", "open", "half_open"): 1,
+            ("database", "half_open", "closed"): 1,
+        }
+        rendered = metrics.render()
+        assert 'circuit_breaker_state{name="database",state="closed"} 1' in rendered
+        assert (
+            'circuit_breaker_transitions_total{name="database",from="closed",'
+            'to="open"} 1'
+        ) in rendered
+
+    async def test_should_reopen_when_a_half_open_trial_fails(
+        self,
+        clock: FakeClock,
+        database: FlakyDatabase,
+    ) -> None:
+        breaker = make_breaker(clock)
+        await trip(breaker, database)
+        clock.now += 30.0
+        database.failing = True
+
+        with pytest.raises(ConnectionError):
+            await breaker.call(lambda: database.get_user_by_id("user123"))
+
+        assert breaker.state == "open"
+
+
+class TestBreakerFallbacks:
+    async def test_should_serve_stale_reads_and_stage_writes_while_open(
+        self,
+        clock: FakeClock,
+        database: FlakyDatabase,
+    ) -> None:
+        """
+        Given: A protected database whose user was read before it failed
+        When: The breaker is open and the user logs in
+        Then: Login succeeds from the stale cache and last_login is staged
+        """
+        cache = UserCache(ttl=60.0, clock=clock)
+        pending = PendingUserUpdates()
+        breaker = make_breaker(clock)
+        protected = BreakerDatabase(
+            database, breaker, cache=cache, stale_max_age=3600.0, pending=pending
+        )
+        token_service = Mock()
+        token_service.verify_password.return_value = True
+        auth_service = AuthService(protected, token_service, Mock())
+        await protected.get_user_by_email("john.doe@example.com")
+        clock.now += 600.0
+        await trip(breaker, database)
+
+        result = await auth_service.login("john.doe@example.com", "Password123!")
+
+        assert result.success
+        assert len(pending) == 1
+        clock.now += 30.0
+        await pending.flush(protected)
+        stored = await database.get_user_by_id("user123")
+        assert stored is not None
+        assert stored.last_login is not None
+
+    async def test_should_fail_fast_without_a_stale_copy(
+        self,
+        clock: FakeClock,
+        database: FlakyDatabase,
+    ) -> None:
+        breaker = make_breaker(clock)
+        protected = BreakerDatabase(
+            database, breaker, cache=UserCache(clock=clock), stale_max_age=3600.0
+        )
+        await trip(breaker, database)
+
+        with pytest.raises(CircuitOpenError):
+            await protected.get_user_by_id("user123")
+        with pytest.raises(CircuitOpenError):
+            await protected.update_user("user123", {"name": "Renamed"})
+
+    async def test_should_park_reset_emails_and_deliver_them_later(
+        self,
+        clock: FakeClock,
+        database: FlakyDatabase,
+        tmp_path: Path,
+    ) -> None:
+        """
+        Given: An email provider that has started failing
+        When: Password resets are requested until its breaker opens
+        Then: Later resets are parked durably and delivered after recovery
+        """
+        provider = FlakyEmailService()
+        breaker = CircuitBreaker("email", min_calls=2, open_duration=30.0, clock=clock)
+        email_service = BreakerEmailService(
+            provider, breaker, EmailSpool(tmp_path / "email.spool")
+        )
+        token_service = Mock()
+        token_service.create_reset_token.side_effect = ["t1", "t2", "t3", "t4"]
+        auth_service = AuthService(database, token_service, email_service)
+        provider.failing = True
+        for _ in range(2):
+            with pytest.raises(ConnectionError):
+                await auth_service.request_password_reset("john.doe@example.com")
+
+        for _ in range(2):
+            result = await auth_service.request_password_reset("john.doe@example.com")
+            assert result.success
+
+        restarted = EmailSpool(tmp_path / "email.spool")
+        assert len(restarted) == 2
+        provider.failing = False
+        clock.now += 30.0
+        delivered = await BreakerEmailService(
+            provider, breaker, restarted
+        ).deliver_parked()
+
+        assert delivered == 2
+        assert provider.sent == [
+            ("john.doe@example.com", "John Doe", "t3"),
+            ("john.doe@example.com", "John Doe", "t4"),
+        ]
+        assert len(restarted) == 0
+
+
+class TestEmailSpool:
+    async def test_should_keep_undelivered_emails_when_delivery_fails(
+        self,
+        tmp_path: Path,
+    ) -> None:
+        spool = EmailSpool(tmp_path / "email.spool")
+        for token in ("t1", "t2", "t3"):
+            await spool.park(
+                "send_reset_email",
+                {"email": "a@example.com", "name": "A", "reset_token": token},
+            )
+        delivered: list[str] = []
+
+        async def deliver(method: str, fields: dict[str, str]) -> None:
+            assert method == "send_reset_email"
+            if fields["reset_token"] == "t2":
+                raise ConnectionError("still down")
+            delivered.append(fields["reset_token"])
+
+        with pytest.raises(ConnectionError):
+            await spool.drain(deliver)
+
+        assert delivered == ["t1"]
+        assert len(spool) == 2
+        assert (tmp_path / "email.spool").stat().st_mode & 0o077 == 0
+
+    async def test_should_deliver_each_email_once_under_concurrent_drains(
+        self,
+        tmp_path: Path,
+    ) -> None:
+        """
+        Given: Three parked emails and a slow provider
+        When: Two drains run at once and another email is parked mid-drain
+        Then: Every email is delivered exactly once and the spool ends empty
+        """
+        spool = EmailSpool(tmp_path / "email.spool")
+        for token in ("t1", "t2", "t3"):
+            await spool.park(
+                "send_reset_email",
+                {"email": "a@example.com", "name": "A", "reset_token": token},
+            )
+        delivered: list[str] = []
+
+        async def deliver(_method: str, fields: dict[str, str]) -> None:
+            await asyncio.sleep(0.001)
+            delivered.append(fields["reset_token"])
+            if fields["reset_token"] == "t1":
+                await spool.park(
+                    "send_reset_email",
+                    {"email": "a@example.com", "name": "A", "reset_token": "t4"},
+                )
+
+        counts = await asyncio.gather(spool.drain(deliver), spool.drain(deliver))
+
+        assert delivered == ["t1", "t2", "t3", "t4"]
+        assert counts[0] + counts[1] == 4
+        assert len(spool) == 0
+
+    async def test_should_reject_unknown_methods(self, tmp_path: Path) -> None:
+        spool = EmailSpool(tmp_path / "email.spool")
+
+        with pytest.raises(ValueError, match="spool"):
+            await spool.park("delete_account", {})
@@ -0,0 +1,129 @@
+"""Tests for per-request deadline propagation."""
+
+import asyncio
+import time
+from datetime import UTC, datetime
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+pytestmark = pytest.mark.asyncio
+
+from backend.exceptions import DeadlineExceededError
+from backend.models.user import User
+from backend.services.auth_service import AuthService
+from backend.services.deadline import deadline, remaining, within_deadline
+
+
+@pytest.fixture
+def valid_user() -> User:
+    return User(
+        id="user123",
+        email="john.doe@example.com",
+        name="John Doe",
+        hashed_password="hashed",
+        is_active=True,
+        created_at=datetime.now(UTC),
+    )
+
+
+async def test_should_have_no_deadline_by_default() -> None:
+    assert remaining() is None
+    assert await within_deadline(asyncio.sleep(0, result="ok")) == "ok"
+
+
+async def test_should_only_tighten_nested_deadlines() -> None:
+    with deadline(0.05), deadline(10.0):
+        left = remaining()
+        assert left is not None
+        assert left <= 0.05
+
+
+async def test_should_cancel_slow_call_at_deadline() -> None:
+    cancelled = asyncio.Event()
+
+    async def slow_call() -> None:
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    with deadline(0.01), pytest.raises(DeadlineExceededError):
+        await within_deadline(slow_call())
+
+    assert cancelled.is_set()
+
+
+async def test_should_not_mask_timeouts_raised_by_the_call() -> None:
+    async def failing_call() -> None:
+        raise TimeoutError
+
+    with deadline(10.0), pytest.raises(TimeoutError):
+        await within_deadline(failing_call())
+
+
+async def test_should_fail_login_when_user_lookup_outlives_deadline(
+    valid_user: User,
+) -> None:
+    """
+    Given: A database whose email lookup hangs
+    When: A user logs in under a short deadline
+    Then: Login fails with DEADLINE_EXCEEDED and no password check is made
+    """
+
+    async def hanging_lookup(email: str) -> User:  # noqa: ARG001
+        await asyncio.sleep(10)
+        return valid_user
+
+    database = Mock()
+    database.get_user_by_email = hanging_lookup
+    token_service = Mock()
+    auth_service = AuthService(database, token_service, Mock())
+
+    with deadline(0.01), pytest.raises(DeadlineExceededError) as exc_info:
+        await auth_service.login("john.doe@example.com", "ValidPassword123!")
+
+    assert exc_info.value.code == "DEADLINE_EXCEEDED"
+    token_service.verify_password.assert_not_called()
+
+
+async def test_should_not_mint_tokens_after_deadline_passes(
+    valid_user: User,
+) -> None:
+    """
+    Given: A password check that takes longer than the remaining budget
+    When: A user logs in
+    Then: No tokens are created once the deadline has passed
+    """
+
+    def slow_verify(plain: str, hashed: str) -> bool:  # noqa: ARG001
+        time.sleep(0.02)
+        return True
+
+    database = Mock()
+    database.get_user_by_email = AsyncMock(return_value=valid_user)
+    database.update_user = AsyncMock()
+    token_service = Mock()
+    token_service.verify_password = slow_verify
+    auth_service = AuthService(database, token_service, Mock())
+
+    with deadline(0.01), pytest.raises(DeadlineExceededError):
+        await auth_service.login("john.doe@example.com", "ValidPassword123!")
+
+    token_service.create_access_token.assert_not_called()
+
+
+async def test_should_not_send_reset_email_after_deadline(
+    valid_user: User,
+) -> None:
+    database = Mock()
+    database.get_user_by_email = AsyncMock(return_value=valid_user)
+    email_service = Mock()
+    email_service.send_reset_email = AsyncMock()
+    auth_service = AuthService(database, Mock(), email_service)
+
+    with deadline(-1.0), pytest.raises(DeadlineExceededError):
+        await auth_service.request_password_reset("john.doe@example.com")
+
+    email_service.send_reset_email.assert_not_called()
@@ -0,0 +1,237 @@
+"""Tests for hedged user reads."""
+
+import asyncio
+import random
+import time
+from dataclasses import asdict
+from datetime import UTC, datetime
+
+import pytest
+
+pytestmark = pytest.mark.asyncio
+
+from backend.models.user import User
+from backend.services.hedging import HedgeBudget, HedgedDatabase, LatencyTracker
+from backend.services.memory_database import InMemoryDatabase
+from backend.services.replication import ReplicatedDatabase
+
+
+class SpikyBackend(InMemoryDatabase):
+    """Backend stand-in with injected latency spikes."""
+
+    def __init__(
+        self,
+        rng: random.Random,
+        base: float = 0.001,
+        spike: float = 0.04,
+        spike_rate: float = 0.0,
+    ) -> None:
+        super().__init__()
+        self.rng = rng
+        self.base = base
+        self.spike = spike
+        self.spike_rate = spike_rate
+        self.calls = 0
+        self.cancelled = 0
+
+    async def get_user_by_id(self, user_id: str) -> User | None:
+        self.calls += 1
+        slow = self.rng.random() < self.spike_rate
+        try:
+            await asyncio.sleep(self.spike if slow else self.base)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        return await super().get_user_by_id(user_id)
+
+
+async def make_backends(count: int, spike_rate: float) -> list[SpikyBackend]:
+    rng = random.Random(42)  # noqa: S311
+    backends = [SpikyBackend(rng, spike_rate=spike_rate) for _ in range(count)]
+    for backend in backends:
+        await backend.create_user(
+            {
+                "id": "user123",
+                "email": "john.doe@example.com",
+                "name": "John Doe",
+                "hashed_password": "hashed",
+                "created_at": datetime.now(UTC),
+            }
+        )
+    return backends
+
+
+def warmed_tracker(p95: float) -> LatencyTracker:
+    tracker = LatencyTracker(min_samples=1)
+    for _ in range(100):
+        tracker.record(p95)
+    return tracker
+
+
+async def test_should_not_hedge_before_enough_samples() -> None:
+    backends = await make_backends(2, spike_rate=1.0)
+    db = HedgedDatabase(backends[0], backends)
+
+    assert await db.get_user_by_id("user123") is not None
+    assert db.hedges_sent == 0
+
+
+async def test_should_hedge_slow_read_and_cancel_loser() -> None:
+    """
+    Given: A first backend that always spikes and a fast second backend
+    When: A read exceeds the observed p95
+    Then: A hedge is sent, its result wins, and the slow call is cancelled
+    """
+    backends = await make_backends(2, spike_rate=0.0)
+    backends[0].spike_rate = 1.0
+    backends[0].spike = 10.0
+    db = HedgedDatabase(backends[0], backends, tracker=warmed_tracker(0.002))
+
+    started = time.perf_counter()
+    user = await db.get_user_by_id("user123")
+
+    assert user is not None
+    assert time.perf_counter() - started < 1.0
+    assert db.hedges_sent == 1
+    assert backends[0].cancelled == 1
+
+
+async def test_should_fall_back_to_other_call_when_one_fails() -> None:
+    backends = await make_backends(2, spike_rate=0.0)
+
+    async def failing(user_id: str) -> User | None:  # noqa: ARG001
+        await asyncio.sleep(0.005)
+        raise ConnectionError
+
+    backends[0].get_user_by_id = failing  # type: ignore[method-assign]
+    db = HedgedDatabase(backends[0], backends, tracker=warmed_tracker(0.001))
+
+    assert await db.get_user_by_id("user123") is not None
+
+
+async def test_should_respect_hedge_budget() -> None:
+    backends = await make_backends(2, spike_rate=1.0)
+    budget = HedgeBudget(ratio=0.0, burst=2.0)
+    db = HedgedDatabase(
+        backends[0],
+        backends,
+        budget=budget,
+        tracker=warmed_tracker(0.001),
+    )
+
+    for _ in range(5):
+        await db.get_user_by_id("user123")
+
+    assert db.hedges_sent == 2
+
+
+class StaleReplica(SpikyBackend):
+    """Spiky backend that never sees writes made after it was seeded."""
+
+    def replication_lag(self) -> float:
+        return 0.0
+
+
+async def test_should_hedge_only_to_backends_that_see_pinned_writes() -> None:
+    """
+    Given: Two spiking replicas that miss a login's last_login update
+    When: The user is read by ID and email right after the write
+    Then: Every hedged read returns the written row from the primary
+    """
+    primary, *replicas = await make_backends(3, spike_rate=0.0)
+    replicas = [StaleReplica(replica.rng, spike_rate=1.0) for replica in replicas]
+    for replica in replicas:
+        await replica.create_user(asdict(await primary.get_user_by_id("user123")))
+    router = ReplicatedDatabase(primary, replicas)
+    db = HedgedDatabase(router, [], router=router, tracker=warmed_tracker(0.001))
+
+    await db.update_user("user123", {"last_login": datetime.now(UTC)})
+    by_id = await db.get_user_by_id("user123")
+    by_email = await db.get_user_by_email("john.doe@example.com")
+
+    assert by_id is not None
+    assert by_id.last_login is not None
+    assert by_email is not None
+    assert by_email.last_login is not None
+    assert db.hedges_sent == 0
+    assert all(replica.calls == 0 for replica in replicas)
+
+
+async def test_should_hedge_across_fresh_replicas_when_unpinned() -> None:
+    primary, *_ = await make_backends(1, spike_rate=0.0)
+    slow = StaleReplica(primary.rng, spike_rate=1.0, spike=10.0)
+    await slow.create_user(asdict(await primary.get_user_by_id("user123")))
+    router = ReplicatedDatabase(primary, [slow])
+    db = HedgedDatabase(router, [], router=router, tracker=warmed_tracker(0.001))
+
+    user = await db.get_user_by_id("user123")
+
+    assert user is not None
+    assert db.hedges_sent == 1
+    assert slow.cancelled == 1
+
+
+async def test_should_count_hedged_reads_as_outstanding_on_replicas() -> None:
+    """
+    Given: A hedged router over two slow replicas
+    When: Ten reads are in flight
+    Then: The router counts them against the replicas and spreads them evenly
+    """
+    primary, *_ = await make_backends(1, spike_rate=0.0)
+    replicas = [StaleReplica(primary.rng, base=0.05) for _ in range(2)]
+    for replica in replicas:
+        await replica.create_user(asdict(await primary.get_user_by_id("user123")))
+    router = ReplicatedDatabase(primary, replicas)
+    db = HedgedDatabase(router, [], router=router)
+
+    reads = [asyncio.create_task(db.get_user_by_id("user123")) for _ in range(10)]
+    await asyncio.sleep(0.01)
+    in_flight = list(router._outstanding)
+    await asyncio.gather(*reads)
+
+    assert in_flight == [5, 5]
+    assert router._outstanding == [0, 0]
+
+
+def p99(samples: list[float]) -> float:
+    return sorted(samples)[int(len(samples) * 0.99) - 1]
+
+
+async def measure(db: HedgedDatabase, requests: int) -> list[float]:
+    latencies = []
+    for _ in range(requests):
+        started = time.perf_counter()
+        await db.get_user_by_id("user123")
+        latencies.append(time.perf_counter() - started)
+    return latencies
+
+
+@pytest.mark.slow
+@pytest.mark.timing
+async def test_benchmark_hedging_improves_p99_under_latency_spikes() -> None:
+    """
+    Given: Two replicas where 3% of reads spike from 1ms to 40ms
+    When: The same read load runs with and without hedging
+    Then: Hedging cuts p99 latency substantially within its budget
+    """
+    plain_backends = await make_backends(2, spike_rate=0.03)
+    plain = HedgedDatabase(
+        plain_backends[0],
+        plain_backends,
+        budget=HedgeBudget(ratio=0.0, burst=0.0),
+    )
+    hedged_backends = await make_backends(2, spike_rate=0.03)
+    hedged = HedgedDatabase(
+        hedged_backends[0],
+        hedged_backends,
+        budget=HedgeBudget(ratio=0.1),
+    )
+
+    await measure(plain, 50)
+    await measure(hedged, 50)
+    plain_p99 = p99(await measure(plain, 300))
+    hedged_p99 = p99(await measure(hedged, 300))
+
+    print(f"p99 plain={plain_p99 * 1000:.1f}ms hedged={hedged_p99 * 1000:.1f}ms")
+    assert hedged_p99 < plain_p99 / 2
+    assert hedged.hedges_sent <= 0.1 * 350 + 10
@@ -0,0 +1,153 @@
+"""Tests for the on-demand sampling profiler."""
+
+import hashlib
+import os
+import signal
+import statistics
+import time
+from collections import Counter
+from pathlib import Path
+
+import pytest
+
+from backend.services.auth_service import AuthService
+from backend.services.profiler import SamplingProfiler, install_signal_toggle
+from tests.conftest import make_auth_service
+
+
+class CpuBoundTokenService:
+    """Token service whose password check burns CPU like a real KDF."""
+
+    def verify_password(self, plain_password: str, hashed_password: str) -> bool:
+        digest = hashlib.pbkdf2_hmac("sha256", plain_password.encode(), b"salt", 20_000)
+        return digest.hex() == hashed_password
+
+    def create_access_token(self, user_id: str, email: str) -> str:
+        return f"access:{user_id}:{email}"
+
+    def create_refresh_token(self, user_id: str, email: str) -> str:
+        return f"refresh:{user_id}:{email}"
+
+
+async def burn_logins(auth_service: AuthService, seconds: float) -> None:
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        await auth_service.try_login("john.doe@example.com", "WrongPassword123!")
+
+
+def parse(lines: list[str]) -> Counter[str]:
+    stacks: Counter[str] = Counter()
+    for line in lines:
+        stack, count = line.rsplit(" ", 1)
+        stacks[stack] += int(count)
+    return stacks
+
+
+@pytest.mark.asyncio
+class TestSamplingProfiler:
+    async def test_should_find_verify_password_dominating_logins(
+        self,
+        tmp_path: Path,
+    ) -> None:
+        """
+        Given: Logins whose password check is CPU-bound
+        When: The profiler samples while they run and dumps its stacks
+        Then: Most samples tagged with the login operation sit in verify_password
+        """
+        auth_service = await make_auth_service(
+            CpuBoundTokenService(), hashed_password="not-the-digest"
+        )
+        profiler = SamplingProfiler(interval=0.002)
+        path = tmp_path / "profile.folded"
+
+        profiler.start()
+        await burn_logins(auth_service, 0.5)
+        profiler.stop()
+        profiler.dump(path)
+
+        stacks = parse(path.read_text().splitlines())
+        login = {s: n for s, n in stacks.items() if ";op:try_login;" in s}
+        in_verify = sum(n for s, n in login.items() if s.endswith("verify_password"))
+        assert profiler.samples > 20
+        assert in_verify > 0.5 * sum(login.values())
+        assert all(s.startswith("MainThread;") for s in login)
+
+    async def test_should_toggle_on_signal(self, tmp_path: Path) -> None:
+        auth_service = await make_auth_service(
+            CpuBoundTokenService(), hashed_password="not-the-digest"
+        )
+        profiler = SamplingProfiler(interval=0.002)
+        path = tmp_path / "profile.folded"
+        previous = install_signal_toggle(profiler, path)
+        try:
+            os.kill(os.getpid(), signal.SIGUSR2)
+            assert profiler.running
+            await burn_logins(auth_service, 0.2)
+            os.kill(os.getpid(), signal.SIGUSR2)
+        finally:
+            signal.signal(signal.SIGUSR2, previous)
+
+        assert not profiler.running
+        assert "CpuBoundTokenService.verify_password" in path.read_text()
+        assert profiler.samples == 0
+
+
+def test_should_not_sample_itself() -> None:
+    profiler = SamplingProfiler(interval=0.001)
+
+    profiler.start()
+    time.sleep(0.05)
+    profiler.stop()
+
+    assert profiler.collapsed()
+    assert not any("sampling-profiler" in line for line in profiler.collapsed())
+
+
+async def logins_per_second(auth_service: AuthService, seconds: float) -> float:
+    count = 0
+    started = time.perf_counter()
+    deadline = started + seconds
+    while time.perf_counter() < deadline:
+        await auth_service.login("john.doe@example.com", "ValidPassword123!")
+        count += 1
+    return count / (time.perf_counter() - started)
+
+
+@pytest.mark.slow
+@pytest.mark.timing
+@pytest.mark.asyncio
+async def test_benchmark_profiler_overhead() -> None:
+    """
+    Given: The profiler at its default sampling rate
+    When: Login throughput is measured in 150 pairs of runs with and without
+        it, alternating which of the pair goes first
+    Then: Logins run under 2% slower with it in the median pair
+    """
+    auth_service = await make_auth_service()
+    profiler = SamplingProfiler()
+    await logins_per_second(auth_service, 0.1)
+
+    async def profiled_run() -> float:
+        profiler.start()
+        try:
+            return await logins_per_second(auth_service, 0.04)
+        finally:
+            profiler.stop()
+
+    ratios = []
+    for pair in range(150):
+        if pair % 2:
+            baseline = await logins_per_second(auth_service, 0.04)
+            profiled = await profiled_run()
+        else:
+            profiled = await profiled_run()
+            baseline = await logins_per_second(auth_service, 0.04)
+        ratios.append(profiled / baseline)
+
+    slowdown = 1 - statistics.median(ratios)
+    print(
+        f"{slowdown:.2%} fewer logins/s profiled "
+        f"({profiler.samples} samples, sampler busy {profiler.overhead:.3%})"
+    )
+    assert profiler.samples > 0
+    assert slowdown < 0.02
@@ -0,0 +1,183 @@
+"""Tests for read-replica routing with read-your-writes consistency."""
+
+import asyncio
+from dataclasses import asdict
+from datetime import UTC, datetime
+from unittest.mock import Mock
+
+import pytest
+import pytest_asyncio
+
+pytestmark = pytest.mark.asyncio
+
+from backend.models.user import User
+from backend.services.auth_service import AuthService
+from backend.services.memory_database import InMemoryDatabase
+from backend.services.replication import ReplicatedDatabase
+from tests.conftest import FakeClock
+
+
+class LaggingReplica(InMemoryDatabase):
+    """Replica stand-in that only sees writes when ``sync`` is called."""
+
+    def __init__(self, lag: float = 0.0, delay: float = 0.0) -> None:
+        super().__init__()
+        self.lag = lag
+        self.delay = delay
+        self.reads = 0
+
+    def replication_lag(self) -> float:
+        return self.lag
+
+    async def sync(self, primary: InMemoryDatabase) -> None:
+        for user in await primary.list_users():
+            await self.delete_user(user.id)
+            await self.create_user(asdict(user))
+
+    async def get_user_by_id(self, user_id: str) -> User | None:
+        self.reads += 1
+        await asyncio.sleep(self.delay)
+        return await super().get_user_by_id(user_id)
+
+    async def get_user_by_email(self, email: str) -> User | None:
+        self.reads += 1
+        await asyncio.sleep(self.delay)
+        return await super().get_user_by_email(email)
+
+
+@pytest_asyncio.fixture
+async def primary() -> InMemoryDatabase:
+    db = InMemoryDatabase()
+    await db.create_user(
+        {
+            "id": "user123",
+            "email": "john.doe@example.com",
+            "name": "John Doe",
+            "hashed_password": "hashed",
+            "created_at": datetime.now(UTC),
+        }
+    )
+    return db
+
+
+async def test_should_serve_reads_from_replicas(primary: InMemoryDatabase) -> None:
+    replica = LaggingReplica()
+    await replica.sync(primary)
+    db = ReplicatedDatabase(primary, [replica])
+
+    user = await db.get_user_by_id("user123")
+
+    assert user is not None
+    assert replica.reads == 1
+
+
+async def test_should_skip_replicas_that_lag_too_far(
+    primary: InMemoryDatabase,
+) -> None:
+    fresh, stale = LaggingReplica(lag=0.1), LaggingReplica(lag=30.0)
+    await fresh.sync(primary)
+    await stale.sync(primary)
+    db = ReplicatedDatabase(primary, [stale, fresh], max_lag=1.0)
+
+    for _ in range(10):
+        await db.get_user_by_id("user123")
+
+    assert stale.reads == 0
+    assert fresh.reads == 10
+
+
+async def test_should_fall_back_to_primary_when_all_replicas_lag(
+    primary: InMemoryDatabase,
+) -> None:
+    replica = LaggingReplica(lag=30.0)
+    db = ReplicatedDatabase(primary, [replica], max_lag=1.0)
+
+    assert await db.get_user_by_email("john.doe@example.com") is not None
+    assert replica.reads == 0
+
+
+async def test_should_balance_by_outstanding_requests(
+    primary: InMemoryDatabase,
+) -> None:
+    """
+    Given: A slow and a fast replica
+    When: Many reads are issued concurrently
+    Then: No replica holds more than its share of in-flight reads
+    """
+    slow, fast = LaggingReplica(delay=0.05), LaggingReplica(delay=0.0)
+    await slow.sync(primary)
+    await fast.sync(primary)
+    db = ReplicatedDatabase(primary, [slow, fast])
+
+    await asyncio.gather(*(db.get_user_by_id("user123") for _ in range(20)))
+
+    assert slow.reads + fast.reads == 20
+    assert fast.reads >= 10
+
+
+async def test_should_read_own_writes_within_pin_window(
+    primary: InMemoryDatabase,
+) -> None:
+    """
+    Given: A replica that has not yet seen the login's last_login update
+    When: The user logs in and the token is validated straight away
+    Then: Validation reads the updated user from the primary
+    """
+    replica = LaggingReplica()
+    await replica.sync(primary)
+    clock = FakeClock()
+    db = ReplicatedDatabase(primary, [replica], pin_window=5.0, clock=clock)
+    token_service = Mock()
+    token_service.verify_password.return_value = True
+    token_service.create_access_token.return_value = "access"
+    token_service.decode_token.return_value = {"sub": "user123"}
+    auth_service = AuthService(db, token_service, Mock())
+
+    await auth_service.login("john.doe@example.com", "ValidPassword123!")
+    result = await auth_service.validate_token("access")
+
+    assert result.user is not None
+    assert result.user.last_login is not None
+    assert replica.reads == 1
+
+    clock.now += 10.0
+    result = await auth_service.validate_token("access")
+    assert result.user is not None
+    assert result.user.last_login is None
+    assert replica.reads == 2
+
+
+async def test_should_pin_email_reads_after_write_by_id(
+    primary: InMemoryDatabase,
+) -> None:
+    replica = LaggingReplica()
+    await replica.sync(primary)
+    db = ReplicatedDatabase(primary, [replica])
+
+    await db.update_user("user123", {"name": "Johnny"})
+    user = await db.get_user_by_email("john.doe@example.com")
+
+    assert user is not None
+    assert user.name == "Johnny"
+
+
+async def test_should_drop_expired_pins_as_new_writes_arrive(
+    primary: InMemoryDatabase,
+) -> None:
+    """
+    Given: Thousands of users written across several pin windows
+    When: Each write pins its user
+    Then: Only pins still inside the window are kept, re-pins included
+    """
+    clock = FakeClock()
+    db = ReplicatedDatabase(primary, [], pin_window=5.0, clock=clock)
+
+    for i in range(5_000):
+        clock.now = i / 100
+        db._pin(f"user-{i}")
+        db._pin("user123")
+
+    assert len(db._pinned_until) == 501
+    assert db._is_pinned("user123")
+    assert db._is_pinned("user-4999")
+    assert not db._is_pinned("user-4499")
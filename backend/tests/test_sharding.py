@@ -0,0 +1,311 @@
+"""Tests for consistent-hash partitioning of the user store."""
+
+import asyncio
+from collections import Counter
+from datetime import UTC, datetime
+from typing import Any
+
+import pytest
+
+from backend.exceptions import ValidationError
+from backend.models.user import User
+from backend.services.memory_database import InMemoryDatabase
+from backend.services.sharding import (
+    ConsistentHashRing,
+    ShardedDatabase,
+    SQLiteEmailDirectory,
+)
+
+
+def make_user_data(index: int) -> dict[str, object]:
+    return {
+        "id": f"user-{index}",
+        "email": f"user{index}@example.com",
+        "name": f"User {index}",
+        "hashed_password": "hashed",
+        "is_active": True,
+        "created_at": datetime.now(UTC),
+    }
+
+
+class SlowCopyDatabase(InMemoryDatabase):
+    """Shard whose inserts take a while, stretching out a migration."""
+
+    async def create_user(self, user_data: dict[str, Any]) -> User:
+        await asyncio.sleep(0.01)
+        return await super().create_user(user_data)
+
+
+class CountingDatabase(InMemoryDatabase):
+    def __init__(self) -> None:
+        super().__init__()
+        self.email_reads = 0
+
+    async def get_user_by_email(self, email: str) -> User | None:
+        self.email_reads += 1
+        return await super().get_user_by_email(email)
+
+
+@pytest.fixture
+def sharded_db() -> ShardedDatabase:
+    return ShardedDatabase({f"shard-{i}": InMemoryDatabase() for i in range(3)})
+
+
+class TestConsistentHashRing:
+    def test_should_spread_keys_evenly_over_nodes(self) -> None:
+        ring = ConsistentHashRing(["a", "b", "c", "d"])
+
+        counts = Counter(ring.get_node(f"key-{i}") for i in range(20_000))
+
+        assert set(counts) == {"a", "b", "c", "d"}
+        assert all(3_500 < count < 6_500 for count in counts.values())
+
+    def test_should_move_about_one_nth_of_keys_when_node_added(self) -> None:
+        """
+        Given: A ring with four nodes
+        When: A fifth node is added
+        Then: Roughly 1/5 of the keys move, and only onto the new node
+        """
+        ring = ConsistentHashRing(["a", "b", "c", "d"])
+        keys = [f"key-{i}" for i in range(20_000)]
+        before = {key: ring.get_node(key) for key in keys}
+
+        ring.add_node("e")
+        moved = [key for key in keys if ring.get_node(key) != before[key]]
+
+        assert 0.15 < len(moved) / len(keys) < 0.25
+        assert all(ring.get_node(key) == "e" for key in moved)
+
+    def test_should_restore_placement_when_node_removed(self) -> None:
+        ring = ConsistentHashRing(["a", "b", "c"])
+        before = {f"key-{i}": ring.get_node(f"key-{i}") for i in range(1_000)}
+
+        ring.add_node("d")
+        ring.remove_node("d")
+
+        assert all(ring.get_node(key) == node for key, node in before.items())
+
+    def test_should_reject_lookup_on_empty_ring(self) -> None:
+        with pytest.raises(LookupError):
+            ConsistentHashRing().get_node("key")
+
+
+@pytest.mark.asyncio
+class TestShardedDatabase:
+    async def test_should_store_each_user_on_its_owning_shard_only(
+        self,
+        sharded_db: ShardedDatabase,
+    ) -> None:
+        user = await sharded_db.create_user(make_user_data(1))
+
+        owner = sharded_db.shard_for(user.id)
+        for name, shard in sharded_db.shards.items():
+            found = await shard.get_user_by_id(user.id)
+            assert (found is not None) is (name == owner)
+
+    async def test_should_read_one_shard_per_email_lookup(self) -> None:
+        """
+        Given: A user on one of three shards
+        When: Their email and an unknown email are looked up
+        Then: Only the owning shard is read, and the unknown email reads none
+        """
+        shards = {f"shard-{i}": CountingDatabase() for i in range(3)}
+        sharded_db = ShardedDatabase(shards)
+        await sharded_db.create_user(make_user_data(1))
+
+        found = await sharded_db.get_user_by_email("user1@example.com")
+        missing = await sharded_db.get_user_by_email("nobody@example.com")
+
+        assert found is not None
+        assert missing is None
+        assert sum(db.email_reads for db in shards.values()) == 1
+
+    async def test_should_find_users_written_directly_after_rebuild(
+        self,
+        sharded_db: ShardedDatabase,
+    ) -> None:
+        data = make_user_data(7)
+        owner = sharded_db.shard_for(str(data["id"]))
+        await sharded_db.shards[owner].create_user(data)
+        assert await sharded_db.get_user_by_email("user7@example.com") is None
+
+        indexed = await sharded_db.rebuild_directory()
+
+        user = await sharded_db.get_user_by_email("user7@example.com")
+        assert indexed == 1
+        assert user is not None
+        assert user.id == "user-7"
+
+    async def test_should_keep_directory_across_router_restarts(self) -> None:
+        shards = {f"shard-{i}": InMemoryDatabase() for i in range(3)}
+        directory = SQLiteEmailDirectory()
+        await ShardedDatabase(shards, directory=directory).create_user(
+            make_user_data(1)
+        )
+
+        restarted = ShardedDatabase(shards, directory=directory)
+        user = await restarted.get_user_by_email("user1@example.com")
+
+        assert user is not None
+        assert user.id == "user-1"
+        directory.close()
+
+    async def test_should_keep_email_index_current_on_email_change(
+        self,
+        sharded_db: ShardedDatabase,
+    ) -> None:
+        await sharded_db.create_user(make_user_data(1))
+
+        await sharded_db.update_user("user-1", {"email": "new@example.com"})
+
+        assert await sharded_db.get_user_by_email("user1@example.com") is None
+        user = await sharded_db.get_user_by_email("new@example.com")
+        assert user is not None
+        assert user.id == "user-1"
+
+    async def test_should_reject_duplicate_email_across_shards(
+        self,
+        sharded_db: ShardedDatabase,
+    ) -> None:
+        await sharded_db.create_user(make_user_data(1))
+
+        duplicate = {**make_user_data(2), "email": "user1@example.com"}
+        with pytest.raises(ValidationError):
+            await sharded_db.create_user(duplicate)
+
+    async def test_should_reject_concurrent_creates_of_one_email(
+        self,
+        sharded_db: ShardedDatabase,
+    ) -> None:
+        """
+        Given: Two users with the same email that hash to different shards
+        When: Both are created concurrently
+        Then: One is created and the other is rejected
+        """
+        first = {**make_user_data(1), "email": "dup@example.com"}
+        second = next(
+            {**make_user_data(i), "email": "dup@example.com"}
+            for i in range(2, 100)
+            if sharded_db.shard_for(f"user-{i}") != sharded_db.shard_for("user-1")
+        )
+
+        results = await asyncio.gather(
+            sharded_db.create_user(first),
+            sharded_db.create_user(second),
+            return_exceptions=True,
+        )
+
+        assert sum(isinstance(r, User) for r in results) == 1
+        assert sum(isinstance(r, ValidationError) for r in results) == 1
+        users = await sharded_db.list_users()
+        assert [u.email for u in users] == ["dup@example.com"]
+
+    async def test_should_reject_email_change_to_a_taken_email(
+        self,
+        sharded_db: ShardedDatabase,
+    ) -> None:
+        await sharded_db.create_user(make_user_data(1))
+        await sharded_db.create_user(make_user_data(2))
+
+        with pytest.raises(ValidationError):
+            await sharded_db.update_user("user-2", {"email": "user1@example.com"})
+
+        user = await sharded_db.get_user_by_email("user1@example.com")
+        assert user is not None
+        assert user.id == "user-1"
+
+    async def test_should_serve_concurrent_lookups_of_a_deleted_user(
+        self,
+        sharded_db: ShardedDatabase,
+    ) -> None:
+        await sharded_db.create_user(make_user_data(1))
+        await sharded_db.delete_user("user-1")
+
+        results = await asyncio.gather(
+            sharded_db.get_user_by_email("user1@example.com"),
+            sharded_db.get_user_by_email("user1@example.com"),
+        )
+
+        assert results == [None, None]
+
+    async def test_should_merge_bulk_lookups_from_all_shards(
+        self,
+        sharded_db: ShardedDatabase,
+    ) -> None:
+        for i in range(30):
+            await sharded_db.create_user(make_user_data(i))
+
+        users = await sharded_db.get_users_by_ids(
+            [f"user-{i}" for i in range(30)] + ["missing"]
+        )
+
+        assert set(users) == {f"user-{i}" for i in range(30)}
+
+    async def test_should_migrate_only_keys_owned_by_new_shard(
+        self,
+        sharded_db: ShardedDatabase,
+    ) -> None:
+        """
+        Given: 600 users spread over three shards
+        When: A fourth shard is added
+        Then: About a quarter of the users move to it and all stay readable
+        """
+        for i in range(600):
+            await sharded_db.create_user(make_user_data(i))
+
+        new_shard = InMemoryDatabase()
+        result = await sharded_db.add_shard("shard-3", new_shard)
+
+        assert result.scanned == 600
+        assert 0.15 < result.moved / 600 < 0.35
+        assert len(await new_shard.list_users()) == result.moved
+        assert len(await sharded_db.list_users()) == 600
+        for i in range(600):
+            assert await sharded_db.get_user_by_id(f"user-{i}") is not None
+            assert await sharded_db.get_user_by_email(f"user{i}@example.com")
+
+    async def test_should_not_lose_writes_made_during_migration(
+        self,
+        sharded_db: ShardedDatabase,
+    ) -> None:
+        """
+        Given: 200 users and a new shard that is slow to copy onto
+        When: Every user is renamed and new users are created mid-migration
+        Then: All renames and creates are readable once the shard is added
+        """
+        for i in range(200):
+            await sharded_db.create_user(make_user_data(i))
+
+        migration = asyncio.create_task(
+            sharded_db.add_shard("shard-3", SlowCopyDatabase())
+        )
+        await asyncio.sleep(0)
+        await asyncio.gather(
+            *(
+                sharded_db.update_user(f"user-{i}", {"name": f"Renamed {i}"})
+                for i in range(200)
+            ),
+            *(sharded_db.create_user(make_user_data(i)) for i in range(200, 260)),
+        )
+        result = await migration
+
+        assert result.moved > 0
+        for i in range(200):
+            user = await sharded_db.get_user_by_id(f"user-{i}")
+            assert user is not None
+            assert user.name == f"Renamed {i}"
+        for i in range(200, 260):
+            assert await sharded_db.get_user_by_id(f"user-{i}") is not None
+        assert len(await sharded_db.list_users()) == 260
+
+    async def test_should_reject_concurrent_migrations(
+        self,
+        sharded_db: ShardedDatabase,
+    ) -> None:
+        await sharded_db.create_user(make_user_data(1))
+        first = asyncio.create_task(sharded_db.add_shard("shard-3", SlowCopyDatabase()))
+        await asyncio.sleep(0)
+
+        with pytest.raises(ValueError, match="in progress"):
+            await sharded_db.add_shard("shard-4", InMemoryDatabase())
+        await first
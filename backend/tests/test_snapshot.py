@@ -0,0 +1,236 @@
+"""Tests for the user cache and its warm-start snapshots."""
+
+import asyncio
+import time
+from datetime import UTC, datetime
+from pathlib import Path
+
+import pytest
+
+pytestmark = pytest.mark.asyncio
+
+from backend.models.user import User
+from backend.services.memory_database import InMemoryDatabase
+from backend.services.snapshot import (
+    UserSnapshot,
+    snapshot_periodically,
+    write_snapshot,
+)
+from backend.services.user_cache import CachedDatabase, UserCache
+from tests.conftest import FakeClock
+
+
+class CountingDatabase(InMemoryDatabase):
+    def __init__(self) -> None:
+        super().__init__()
+        self.reads = 0
+
+    async def get_user_by_id(self, user_id: str) -> User | None:
+        self.reads += 1
+        return await super().get_user_by_id(user_id)
+
+    async def get_user_by_email(self, email: str) -> User | None:
+        self.reads += 1
+        return await super().get_user_by_email(email)
+
+
+async def make_database(count: int) -> CountingDatabase:
+    database = CountingDatabase()
+    for i in range(count):
+        await database.create_user(
+            {
+                "id": f"user-{i}",
+                "email": f"user{i}@example.com",
+                "name": f"User {i}",
+                "hashed_password": "hashed",
+                "created_at": datetime(2026, 1, 1, tzinfo=UTC),
+            }
+        )
+    return database
+
+
+async def write_warm_snapshot(path: Path, database: CountingDatabase) -> None:
+    """Run a worker that touches every user, then snapshot its cache."""
+    cache = UserCache()
+    warm_worker = CachedDatabase(database, cache)
+    for i in range(50):
+        await warm_worker.get_user_by_id(f"user-{i}")
+    await warm_worker.get_user_by_email("nobody@example.com")
+
+    write_snapshot(path, *cache.export())
+
+
+class TestUserCache:
+    async def test_should_serve_repeat_reads_from_cache(self) -> None:
+        database = await make_database(1)
+        cached = CachedDatabase(database)
+
+        first = await cached.get_user_by_id("user-0")
+        second = await cached.get_user_by_email("user0@example.com")
+
+        assert first == second
+        assert database.reads == 1
+
+    async def test_should_cache_negative_lookups(self) -> None:
+        database = await make_database(0)
+        cached = CachedDatabase(database)
+
+        assert await cached.get_user_by_email("nobody@example.com") is None
+        assert await cached.get_user_by_email("nobody@example.com") is None
+        assert database.reads == 1
+
+    async def test_should_apply_writes_to_cached_user(self) -> None:
+        database = await make_database(1)
+        cached = CachedDatabase(database)
+        await cached.get_user_by_id("user-0")
+
+        await cached.update_user("user-0", {"name": "Renamed"})
+        user = await cached.get_user_by_id("user-0")
+
+        assert user is not None
+        assert user.name == "Renamed"
+        assert database.reads == 1
+
+    async def test_should_hand_out_copies(self) -> None:
+        database = await make_database(1)
+        cached = CachedDatabase(database)
+
+        user = await cached.get_user_by_id("user-0")
+        assert user is not None
+        user.name = "Mutated"
+
+        again = await cached.get_user_by_id("user-0")
+        assert again is not None
+        assert again.name == "User 0"
+
+    async def test_should_evict_least_recently_used(self) -> None:
+        cache = UserCache(max_entries=2)
+        database = await make_database(3)
+        cached = CachedDatabase(database, cache)
+
+        for i in range(3):
+            await cached.get_user_by_id(f"user-{i}")
+
+        assert len(cache) == 2
+        assert cache.get("id", "user-0") is None
+
+
+class TestWarmStartSnapshot:
+    async def test_should_serve_from_snapshot_without_database_reads(
+        self,
+        tmp_path: Path,
+    ) -> None:
+        """
+        Given: A snapshot written by a worker with a hot cache
+        When: A freshly started worker maps the snapshot
+        Then: Hot users and known misses are served before the database answers
+        """
+        path = tmp_path / "users.snap"
+        database = await make_database(100)
+        await write_warm_snapshot(path, database)
+        database.reads = 0
+
+        snapshot = UserSnapshot(path)
+        new_worker = CachedDatabase(database, snapshot=snapshot)
+        users = [await new_worker.get_user_by_id(f"user-{i}") for i in range(50)]
+        missing = await new_worker.get_user_by_email("nobody@example.com")
+
+        assert len(snapshot) == 50
+        assert all(user is not None for user in users)
+        assert missing is None
+        assert database.reads == 0
+        snapshot.close()
+
+    async def test_should_revalidate_snapshot_entries_in_background(
+        self,
+        tmp_path: Path,
+    ) -> None:
+        path = tmp_path / "users.snap"
+        database = await make_database(1)
+        await write_warm_snapshot(path, database)
+        await database.update_user("user-0", {"name": "Changed since snapshot"})
+
+        new_worker = CachedDatabase(database, snapshot=UserSnapshot(path))
+        stale = await new_worker.get_user_by_id("user-0")
+        await new_worker.wait_revalidated()
+        fresh = await new_worker.get_user_by_id("user-0")
+
+        assert stale is not None
+        assert stale.name == "User 0"
+        assert fresh is not None
+        assert fresh.name == "Changed since snapshot"
+
+    async def test_should_skip_entries_older_than_max_age(
+        self,
+        tmp_path: Path,
+    ) -> None:
+        path = tmp_path / "users.snap"
+        database = await make_database(10)
+        await write_warm_snapshot(path, database)
+        clock = FakeClock()
+        clock.now = 10**12
+
+        snapshot = UserSnapshot(path, max_age=3600.0, clock=clock)
+
+        assert len(snapshot) == 0
+        assert snapshot.lookup("id", "user-0") is None
+        assert not snapshot.is_missing("email", "nobody@example.com")
+
+    async def test_should_stop_serving_entries_that_age_out_after_load(
+        self,
+        tmp_path: Path,
+    ) -> None:
+        """
+        Given: A fresh snapshot of a user who is deactivated afterwards
+        When: A worker reads the user once max_age has passed since the load
+        Then: The database row is served and the snapshot is dropped
+        """
+        path = tmp_path / "users.snap"
+        database = await make_database(1)
+        await write_warm_snapshot(path, database)
+        await database.update_user("user-0", {"is_active": False})
+        clock = FakeClock()
+        clock.now = time.time()
+        snapshot = UserSnapshot(path, max_age=60.0, clock=clock)
+        new_worker = CachedDatabase(database, UserCache(clock=clock), snapshot)
+
+        clock.now += 61.0
+        user = await new_worker.get_user_by_id("user-0")
+
+        assert user is not None
+        assert not user.is_active
+        assert snapshot.lookup("id", "user-0") is None
+        assert not snapshot.is_missing("email", "nobody@example.com")
+        assert new_worker.snapshot is None
+        snapshot.close()
+
+    async def test_should_write_snapshots_periodically(self, tmp_path: Path) -> None:
+        path = tmp_path / "users.snap"
+        database = await make_database(3)
+        cache = UserCache()
+        await CachedDatabase(database, cache).get_user_by_id("user-1")
+
+        with pytest.raises(TimeoutError):
+            await asyncio.wait_for(
+                snapshot_periodically(cache, path, interval=0.01), timeout=0.2
+            )
+
+        snapshot = UserSnapshot(path)
+        assert snapshot.lookup("email", "user1@example.com") is not None
+        snapshot.close()
+
+    async def test_should_reject_corrupt_snapshot(self, tmp_path: Path) -> None:
+        path = tmp_path / "users.snap"
+        database = await make_database(5)
+        await write_warm_snapshot(path, database)
+        path.write_bytes(path.read_bytes()[:-10])
+
+        with pytest.raises(ValueError, match="corrupt"):
+            UserSnapshot(path)
+
+    async def test_should_reject_foreign_file(self, tmp_path: Path) -> None:
+        path = tmp_path / "users.snap"
+        path.write_bytes(b"x" * 64)
+
+        with pytest.raises(ValueError, match="snapshot"):
+            UserSnapshot(path)
@@ -0,0 +1,201 @@
+"""Tests for sampled tracing spans."""
+
+import asyncio
+import inspect
+import json
+import random
+import time
+from collections.abc import Awaitable, Callable, Iterator
+from datetime import UTC, datetime
+from pathlib import Path
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from backend.exceptions import InvalidCredentialsError
+from backend.models.user import User
+from backend.services.auth_service import AuthService
+from backend.services.tracing import JsonFileExporter, Tracer, set_tracer, span
+from tests.conftest import make_auth_service
+
+
+@pytest.fixture(autouse=True)
+def reset_tracer() -> Iterator[None]:
+    yield
+    set_tracer(None)
+
+
+@pytest.fixture
+def auth_service() -> AuthService:
+    user = User(
+        id="user123",
+        email="john.doe@example.com",
+        name="John Doe",
+        hashed_password="hashed",
+        is_active=True,
+        created_at=datetime.now(UTC),
+    )
+    database = Mock()
+    database.get_user_by_email = AsyncMock(return_value=user)
+    database.update_user = AsyncMock()
+    token_service = Mock()
+    token_service.verify_password.return_value = True
+    return AuthService(database, token_service, Mock())
+
+
+@pytest.mark.asyncio
+class TestTracedAuthService:
+    async def test_should_record_login_and_every_dependency_call(
+        self,
+        auth_service: AuthService,
+    ) -> None:
+        """
+        Given: A tracer that samples every request
+        When: A user logs in
+        Then: The trace holds a login span with one child per dependency call
+        """
+        tracer = Tracer(sample_rate=1.0)
+        set_tracer(tracer)
+
+        await auth_service.login("john.doe@example.com", "ValidPassword123!")
+
+        (trace,) = tracer.buffer
+        assert [s.name for s in trace.spans] == [
+            "AuthService.login",
+            "database.get_user_by_email",
+            "token_service.verify_password",
+            "database.update_user",
+            "token_service.create_access_token",
+            "token_service.create_refresh_token",
+        ]
+        assert all(s.parent_id == 0 for s in trace.spans[1:])
+        assert all(s.end_ns >= s.start_ns for s in trace.spans)
+
+    async def test_should_record_failed_operations(
+        self,
+        auth_service: AuthService,
+    ) -> None:
+        tracer = Tracer(sample_rate=1.0)
+        set_tracer(tracer)
+        auth_service.token_service.verify_password.return_value = False
+
+        with pytest.raises(InvalidCredentialsError):
+            await auth_service.login("john.doe@example.com", "WrongPassword123!")
+
+        (trace,) = tracer.buffer
+        assert trace.root.error == "InvalidCredentialsError"
+
+    async def test_should_record_nothing_when_not_sampled(
+        self,
+        auth_service: AuthService,
+    ) -> None:
+        tracer = Tracer(sample_rate=0.0)
+        set_tracer(tracer)
+
+        await auth_service.login("john.doe@example.com", "ValidPassword123!")
+
+        assert len(tracer.buffer) == 0
+
+    async def test_should_keep_slow_traces_by_tail_sampling(
+        self,
+        auth_service: AuthService,
+    ) -> None:
+        """
+        Given: Head sampling is off and traces over 20ms are always kept
+        When: One login is fast and another waits on a slow update
+        Then: Only the slow login's trace is kept
+        """
+        tracer = Tracer(sample_rate=0.0, slow_threshold=0.02)
+        set_tracer(tracer)
+
+        await auth_service.login("john.doe@example.com", "ValidPassword123!")
+
+        async def slow_update(*_: object) -> None:
+            await asyncio.sleep(0.03)
+
+        auth_service.database.update_user = slow_update
+        await auth_service.login("john.doe@example.com", "ValidPassword123!")
+
+        (trace,) = tracer.buffer
+        slowest = max(trace.spans[1:], key=lambda s: s.duration)
+        assert slowest.name == "database.update_user"
+
+    async def test_should_export_buffered_traces_as_json_lines(
+        self,
+        auth_service: AuthService,
+        tmp_path: Path,
+    ) -> None:
+        path = tmp_path / "traces.jsonl"
+        tracer = Tracer(JsonFileExporter(path), sample_rate=1.0, buffer_size=2)
+        set_tracer(tracer)
+
+        for _ in range(3):
+            await auth_service.login("john.doe@example.com", "ValidPassword123!")
+        exported = tracer.flush()
+
+        records = [json.loads(line) for line in path.read_text().splitlines()]
+        assert exported == 2
+        assert len(records) == 12
+        assert len({r["trace_id"] for r in records}) == 2
+        assert len(tracer.buffer) == 0
+
+
+def test_should_be_inert_outside_a_trace() -> None:
+    with span("orphan") as recorded:
+        assert recorded is None
+
+
+def test_should_not_draw_random_numbers_when_sampling_is_off() -> None:
+    def rng() -> float:
+        raise AssertionError("rng called")
+
+    assert Tracer(sample_rate=0.0, rng=rng).start("AuthService.login") is None
+
+
+def test_should_draw_one_random_number_per_sampled_trace() -> None:
+    """
+    Given: A tracer sampling 5% of traces
+    When: Twenty thousand traces start
+    Then: About 5% are sampled and the RNG is only drawn once per sample
+    """
+    rng = Mock(side_effect=random.Random(7).random)  # noqa: S311
+    tracer = Tracer(sample_rate=0.05, rng=rng)
+
+    sampled = sum(tracer.start("AuthService.login") is not None for _ in range(20_000))
+
+    assert 850 < sampled < 1_150
+    assert rng.call_count == sampled + 1
+
+
+@pytest.mark.slow
+@pytest.mark.timing
+@pytest.mark.asyncio
+@pytest.mark.parametrize("sample_rate", [0.0, Tracer().sample_rate])
+async def test_benchmark_unsampled_login_overhead(sample_rate: float) -> None:
+    """
+    Given: A tracer that samples nothing, or one at the default rate
+    When: Logins go through the public method and through the bare function
+    Then: The decorators add under a fifth to the cost of a login
+    """
+    set_tracer(Tracer(sample_rate=sample_rate))
+    auth_service = await make_auth_service()
+    bare = inspect.unwrap(AuthService.login)
+    args = ("john.doe@example.com", "ValidPassword123!")
+
+    async def per_call(login: Callable[[], Awaitable[object]]) -> float:
+        started = time.perf_counter()
+        for _ in range(500):
+            await login()
+        return (time.perf_counter() - started) / 500
+
+    baseline, wrapped = [], []
+    for _ in range(100):
+        baseline.append(await per_call(lambda: bare(auth_service, *args)))
+        wrapped.append(await per_call(lambda: auth_service.login(*args)))
+
+    overhead = min(wrapped) - min(baseline)
+    print(
+        f"login {min(baseline) * 1e6:.1f}us bare, "
+        f"+{overhead * 1e9:.0f}ns with tracing at sample_rate={sample_rate}"
+    )
+    assert overhead < 0.2 * min(baseline)
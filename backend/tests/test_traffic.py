@@ -0,0 +1,274 @@
+"""Tests for AuthService traffic capture and replay."""
+
+import asyncio
+import math
+from collections import Counter
+from datetime import UTC, datetime
+from pathlib import Path
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from backend.exceptions import InvalidCredentialsError
+from backend.models.user import User
+from backend.services.auth_service import AuthService
+from backend.services.memory_database import InMemoryDatabase
+from backend.services.traffic import (
+    ReplayReport,
+    TrafficRecorder,
+    compare_reports,
+    read_log,
+    replay,
+)
+from tests.conftest import FakeTokenService
+
+pytestmark = pytest.mark.asyncio
+
+
+class SlowDatabase(InMemoryDatabase):
+    def __init__(self, latency: float) -> None:
+        super().__init__()
+        self.latency = latency
+
+    async def get_user_by_email(self, email: str) -> User | None:
+        await asyncio.sleep(self.latency)
+        return await super().get_user_by_email(email)
+
+
+class SlowEmailDatabase(InMemoryDatabase):
+    def __init__(self, latencies: dict[str, float]) -> None:
+        super().__init__()
+        self.latencies = latencies
+
+    async def get_user_by_email(self, email: str) -> User | None:
+        await asyncio.sleep(self.latencies.get(email, 0.0))
+        return await super().get_user_by_email(email)
+
+
+class StartRecordingDatabase(InMemoryDatabase):
+    def __init__(self) -> None:
+        super().__init__()
+        self.started: list[tuple[float, str]] = []
+
+    async def get_user_by_email(self, email: str) -> User | None:
+        self.started.append((asyncio.get_running_loop().time(), email))
+        return await super().get_user_by_email(email)
+
+
+def build(database: InMemoryDatabase | None = None) -> AuthService:
+    database = database if database is not None else InMemoryDatabase()
+    return AuthService(database, FakeTokenService(), AsyncMock())  # type: ignore[arg-type]
+
+
+async def record_traffic(path: Path) -> AuthService:
+    """Drive a skewed mix of calls through a recording service."""
+    service = build()
+    service.recorder = TrafficRecorder(path, secret=b"test-secret")
+    for i in range(3):
+        await service.database.create_user(
+            {
+                "id": f"user-{i}",
+                "email": f"user{i}@example.com",
+                "name": f"User {i}",
+                "hashed_password": "hashed:Password-123",
+                "created_at": datetime(2026, 1, 1, tzinfo=UTC),
+            }
+        )
+
+    for _ in range(6):
+        await service.login("user0@example.com", "Password-123")
+    with pytest.raises(InvalidCredentialsError):
+        await service.login(email="user1@example.com", password="Wrong-123")
+    await service.try_login("not-an-email", "Password-123")
+    await service.request_password_reset("user2@example.com")
+    await service.validate_token("access:user-0:user0@example.com")
+    await service.validate_token("garbage:x:y")
+    service.recorder.close()
+    return service
+
+
+class TestTrafficRecorder:
+    async def test_should_log_operations_and_outcomes(self, tmp_path: Path) -> None:
+        """
+        Given: A service with a recorder
+        When: Logins, a reset and token validations are made
+        Then: Each call is logged with its operation, outcome and a key digest
+        """
+        path = tmp_path / "traffic.log"
+        await record_traffic(path)
+
+        records = list(read_log(path))
+
+        assert Counter((r.operation, r.outcome) for r in records) == {
+            ("login", "OK"): 6,
+            ("login", "INVALID_CREDENTIALS"): 1,
+            ("try_login", "VALIDATION_ERROR"): 1,
+            ("request_password_reset", "OK"): 1,
+            ("validate_token", "OK"): 1,
+            ("validate_token", "INVALID_TOKEN"): 1,
+        }
+        assert len({r.key for r in records if r.operation == "login"}) == 2
+        assert [r.started_at_ns for r in records] == sorted(
+            r.started_at_ns for r in records
+        )
+
+    async def test_should_never_store_credentials(self, tmp_path: Path) -> None:
+        path = tmp_path / "traffic.log"
+        await record_traffic(path)
+
+        raw = path.read_bytes()
+
+        for secret in (b"user0@example.com", b"Password-123", b"Wrong-123", b"access:"):
+            assert secret not in raw
+
+    async def test_should_ignore_a_torn_final_record(self, tmp_path: Path) -> None:
+        path = tmp_path / "traffic.log"
+        await record_traffic(path)
+        path.write_bytes(path.read_bytes()[:-5])
+
+        assert len(list(read_log(path))) == 10
+
+    async def test_should_reject_foreign_files(self, tmp_path: Path) -> None:
+        path = tmp_path / "traffic.log"
+        path.write_bytes(b"not a log")
+
+        with pytest.raises(ValueError, match="traffic log"):
+            list(read_log(path))
+
+
+class TestReplay:
+    async def test_should_reproduce_schedule_and_outcomes(
+        self,
+        tmp_path: Path,
+    ) -> None:
+        """
+        Given: A recorded traffic log
+        When: It is replayed at full speed against a fresh local service
+        Then: Every call is re-driven with its recorded outcome
+        """
+        path = tmp_path / "traffic.log"
+        await record_traffic(path)
+
+        report = await replay(path, build(), speed=math.inf)
+
+        assert {op: len(v) for op, v in report.latencies.items()} == {
+            "login": 7,
+            "try_login": 1,
+            "request_password_reset": 1,
+            "validate_token": 2,
+        }
+        assert report.mismatches == 0
+
+    async def test_should_keep_recorded_pacing_at_scaled_speed(
+        self,
+        tmp_path: Path,
+    ) -> None:
+        path = tmp_path / "traffic.log"
+        service = build()
+        service.recorder = TrafficRecorder(path)
+        await service.request_password_reset("a@example.com")
+        await asyncio.sleep(0.2)
+        await service.request_password_reset("a@example.com")
+        service.recorder.close()
+
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        await replay(path, build(), speed=4.0)
+
+        assert 0.05 <= loop.time() - started < 0.2
+
+    async def test_should_replay_overlapping_calls_in_start_order(
+        self,
+        tmp_path: Path,
+    ) -> None:
+        """
+        Given: A slow login that is still running when a fast one starts and ends
+        When: The log, where the fast login comes first, is replayed
+        Then: The slow login is started first and the recorded gap is kept
+        """
+        path = tmp_path / "traffic.log"
+        database = SlowEmailDatabase({"slow@example.com": 0.1})
+        service = build(database)
+        service.recorder = TrafficRecorder(path)
+        for name in ("slow", "fast"):
+            await database.create_user(
+                {
+                    "id": name,
+                    "email": f"{name}@example.com",
+                    "name": name,
+                    "hashed_password": "hashed:Password-123",
+                    "created_at": datetime(2026, 1, 1, tzinfo=UTC),
+                }
+            )
+        slow = asyncio.create_task(service.login("slow@example.com", "Password-123"))
+        await asyncio.sleep(0.05)
+        await service.login("fast@example.com", "Password-123")
+        await slow
+        service.recorder.close()
+        fast, slow_record = read_log(path)
+
+        target = StartRecordingDatabase()
+        report = await replay(path, build(target), speed=1.0)
+
+        assert fast.started_at_ns > slow_record.started_at_ns
+        assert report.mismatches == 0
+        (first, first_email), (second, _) = target.started
+        assert first_email == f"{slow_record.key.hex()}@replay.example.com"
+        assert second - first >= 0.04
+
+    async def test_should_replay_unknown_emails_without_a_password_check(
+        self,
+        tmp_path: Path,
+    ) -> None:
+        """
+        Given: A log of logins for an unknown email and a wrong password
+        When: It is replayed
+        Then: Only the wrong-password login checks a password, as recorded
+        """
+        path = tmp_path / "traffic.log"
+        service = build()
+        service.recorder = TrafficRecorder(path)
+        await service.database.create_user(
+            {
+                "id": "user-0",
+                "email": "user0@example.com",
+                "name": "User 0",
+                "hashed_password": "hashed:Password-123",
+            }
+        )
+        for email in ("nobody@example.com", "user0@example.com"):
+            with pytest.raises(InvalidCredentialsError):
+                await service.login(email, "Wrong-123")
+        service.recorder.close()
+
+        target = build()
+        verify = Mock(wraps=target.token_service.verify_password)
+        target.token_service.verify_password = verify  # type: ignore[method-assign]
+        report = await replay(path, target, speed=math.inf)
+
+        outcomes = [r.outcome for r in read_log(path)]
+        assert outcomes == ["USER_NOT_FOUND", "INVALID_CREDENTIALS"]
+        assert report.mismatches == 0
+        assert verify.call_count == 1
+        assert len(await target.database.list_users()) == 1
+
+    async def test_should_compare_latency_between_builds(
+        self,
+        tmp_path: Path,
+    ) -> None:
+        path = tmp_path / "traffic.log"
+        await record_traffic(path)
+        baseline = await replay(path, build(), speed=math.inf)
+        baseline.save(tmp_path / "baseline.json")
+
+        candidate = await replay(path, build(SlowDatabase(0.005)), speed=math.inf)
+        report = compare_reports(
+            ReplayReport.load(tmp_path / "baseline.json"), candidate
+        )
+
+        login = candidate.summary()["login"]
+        assert login.count == 7
+        assert login.p50 >= 5.0
+        assert report.splitlines()[0].startswith("operation")
+        assert any(line.startswith("login ") for line in report.splitlines())
+        assert "outcome mismatches: 0 -> 0" in report
@@ -0,0 +1,121 @@
+"""Tests for the exception-free login API."""
+
+import dataclasses
+import time
+
+import pytest
+
+pytestmark = pytest.mark.asyncio
+
+from backend.exceptions import InvalidCredentialsError, ValidationError
+from backend.services.auth_service import (
+    INVALID_CREDENTIALS,
+    UNKNOWN_EMAIL,
+    LoginFailure,
+    LoginResult,
+)
+from tests.conftest import make_auth_service
+
+
+class TestTryLogin:
+    async def test_should_return_tokens_on_success(self) -> None:
+        auth_service = await make_auth_service()
+
+        result = await auth_service.try_login(
+            "john.doe@example.com", "ValidPassword123!"
+        )
+
+        assert isinstance(result, LoginResult)
+        assert result.access_token == "access:user123:john.doe@example.com"
+
+    async def test_should_return_shared_failures_without_raising(self) -> None:
+        """
+        Given: A registered user
+        When: Logins are attempted with a wrong password and an unknown email
+        Then: Both return an immutable failure with the same public code and
+            message, told apart only by their internal reason
+        """
+        auth_service = await make_auth_service()
+
+        wrong_password = await auth_service.try_login(
+            "john.doe@example.com", "WrongPassword123!"
+        )
+        unknown_user = await auth_service.try_login(
+            "nobody@example.com", "ValidPassword123!"
+        )
+
+        assert wrong_password is INVALID_CREDENTIALS
+        assert unknown_user is UNKNOWN_EMAIL
+        assert wrong_password == unknown_user
+        assert unknown_user.reason == "USER_NOT_FOUND"
+        assert not wrong_password.success
+        assert wrong_password.code == InvalidCredentialsError().code
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            wrong_password.message = "changed"  # type: ignore[misc]
+
+    @pytest.mark.parametrize(
+        ("email", "password", "message"),
+        [
+            ("", "ValidPassword123!", "Email is required"),
+            ("not-an-email", "ValidPassword123!", "Invalid email format"),
+            ("john.doe@example.com", "", "Password is required"),
+        ],
+    )
+    async def test_should_report_validation_failures(
+        self,
+        email: str,
+        password: str,
+        message: str,
+    ) -> None:
+        auth_service = await make_auth_service()
+
+        result = await auth_service.try_login(email, password)
+
+        assert isinstance(result, LoginFailure)
+        assert result.code == "VALIDATION_ERROR"
+        assert result.message == message
+
+    async def test_login_should_raise_the_matching_exception(self) -> None:
+        auth_service = await make_auth_service()
+
+        with pytest.raises(InvalidCredentialsError, match="Invalid email or password"):
+            await auth_service.login("john.doe@example.com", "WrongPassword123!")
+        with pytest.raises(ValidationError, match="Invalid email format") as exc_info:
+            await auth_service.login("not-an-email", "ValidPassword123!")
+
+        assert exc_info.value.field == "email"
+
+
+@pytest.mark.slow
+@pytest.mark.timing
+async def test_benchmark_failed_login_throughput() -> None:
+    """
+    Given: A credential-stuffing stream of logins for unknown users
+    When: The stream runs through login with try/except and through try_login
+    Then: try_login handles more failed logins per second
+    """
+    auth_service = await make_auth_service()
+    attempts = 20_000
+    rejected = 0
+
+    started = time.perf_counter()
+    for _ in range(attempts):
+        try:
+            await auth_service.login("nobody@example.com", "Password123!")
+        except InvalidCredentialsError:
+            rejected += 1
+    raising = attempts / (time.perf_counter() - started)
+
+    started = time.perf_counter()
+    for _ in range(attempts):
+        result = await auth_service.try_login("nobody@example.com", "Password123!")
+        if not result.success:
+            rejected += 1
+    returning = attempts / (time.perf_counter() - started)
+
+    print(
+        f"failed logins/s: login {raising:,.0f}, try_login {returning:,.0f} "
+        f"({returning / raising:.2f}x)"
+    )
+    assert rejected == 2 * attempts
+    assert returning > raising
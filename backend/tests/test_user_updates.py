@@ -0,0 +1,248 @@
+"""Tests for dirty-field tracking and minimal user updates."""
+
+from collections.abc import Iterator
+from datetime import UTC, datetime
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from backend.exceptions import UserNotFoundError, ValidationError
+from backend.models.user import User, merge_updates
+from backend.services.auth_service import AuthService
+from backend.services.memory_database import InMemoryDatabase
+from backend.services.sqlite_database import SQLiteDatabase, compile_update
+from backend.services.update_buffer import PendingUserUpdates
+
+
+def make_user() -> User:
+    return User(
+        id="user123",
+        email="john.doe@example.com",
+        name="John Doe",
+        hashed_password="hashed",
+        is_active=True,
+        created_at=datetime.now(UTC),
+    )
+
+
+@pytest.fixture
+def sqlite_db() -> Iterator[SQLiteDatabase]:
+    database = SQLiteDatabase()
+    yield database
+    database.close()
+
+
+class TestDirtyFieldTracking:
+    def test_should_start_clean_after_construction(self) -> None:
+        user = make_user()
+
+        assert user.dirty_fields == frozenset()
+        assert user.changes() == {}
+
+    def test_should_track_assigned_fields_only(self) -> None:
+        user = make_user()
+        now = datetime.now(UTC)
+
+        user.last_login = now
+        user.name = "Johnny"
+
+        assert user.dirty_fields == {"last_login", "name"}
+        assert user.changes() == {"last_login": now, "name": "Johnny"}
+
+    def test_should_forget_changes_when_marked_clean(self) -> None:
+        user = make_user()
+        user.is_active = False
+
+        user.mark_clean()
+
+        assert user.changes() == {}
+
+    def test_should_ignore_assignments_that_restore_loaded_value(self) -> None:
+        user = make_user()
+
+        user.name = "Johnny"
+        user.name = "John Doe"
+
+        assert user.changes() == {}
+
+    def test_should_not_leak_tracking_state_into_equality(self) -> None:
+        user = make_user()
+        other = make_user()
+        other.created_at = user.created_at
+        user.name = user.name
+
+        assert user == other
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def any_db(
+    request: pytest.FixtureRequest,
+) -> Iterator[InMemoryDatabase | SQLiteDatabase]:
+    if request.param == "memory":
+        yield InMemoryDatabase()
+        return
+    database = SQLiteDatabase()
+    yield database
+    database.close()
+
+
+@pytest.mark.asyncio
+class TestUniqueness:
+    async def test_should_reject_email_change_to_a_taken_email(
+        self,
+        any_db: InMemoryDatabase | SQLiteDatabase,
+    ) -> None:
+        """
+        Given: Two stored users
+        When: One user's email is changed to the other's
+        Then: The update is rejected and both users keep their emails
+        """
+        for i in (1, 2):
+            await any_db.create_user(
+                {
+                    "id": f"user-{i}",
+                    "email": f"user{i}@example.com",
+                    "name": f"User {i}",
+                    "hashed_password": "hashed",
+                }
+            )
+
+        with pytest.raises(ValidationError) as raised:
+            await any_db.update_user("user-2", {"email": "user1@example.com"})
+
+        assert raised.value.field == "email"
+        owner = await any_db.get_user_by_email("user1@example.com")
+        assert owner is not None
+        assert owner.id == "user-1"
+        assert await any_db.get_user_by_email("user2@example.com") is not None
+
+    async def test_should_report_duplicate_ids_as_ids(
+        self,
+        any_db: InMemoryDatabase | SQLiteDatabase,
+    ) -> None:
+        data = {"id": "user-1", "name": "User", "hashed_password": "hashed"}
+        await any_db.create_user({**data, "email": "first@example.com"})
+
+        with pytest.raises(ValidationError) as raised:
+            await any_db.create_user({**data, "email": "second@example.com"})
+
+        assert raised.value.field == "id"
+        user = await any_db.get_user_by_id("user-1")
+        assert user is not None
+        assert user.email == "first@example.com"
+        assert await any_db.get_user_by_email("second@example.com") is None
+
+
+class TestMergeUpdates:
+    def test_should_merge_with_later_values_winning(self) -> None:
+        first = datetime(2026, 1, 1, tzinfo=UTC)
+        second = datetime(2026, 1, 2, tzinfo=UTC)
+
+        merged = merge_updates(
+            {"last_login": first, "name": "A"},
+            {"last_login": second},
+        )
+
+        assert merged == {"last_login": second, "name": "A"}
+
+    def test_should_compile_one_statement_per_column_set(self) -> None:
+        sql = compile_update(("last_login",))
+
+        assert sql == "UPDATE users SET last_login = ? WHERE id = ?"
+        assert compile_update(("last_login",)) is sql
+
+    def test_should_refuse_to_compile_unknown_columns(self) -> None:
+        with pytest.raises(ValidationError):
+            compile_update(("id; DROP TABLE users",))
+
+
+@pytest.mark.asyncio
+class TestMinimalWrites:
+    async def test_should_write_only_changed_columns(
+        self,
+        sqlite_db: SQLiteDatabase,
+    ) -> None:
+        """
+        Given: A user loaded from SQLite
+        When: Only last_login is changed and written back
+        Then: The UPDATE statement touches only last_login
+        """
+        await sqlite_db.create_user(
+            {
+                "id": "user123",
+                "email": "john.doe@example.com",
+                "name": "John Doe",
+                "hashed_password": "hashed",
+            }
+        )
+        statements: list[str] = []
+        sqlite_db.connection.set_trace_callback(statements.append)
+        user = await sqlite_db.get_user_by_id("user123")
+        assert user is not None
+
+        user.last_login = datetime.now(UTC)
+        await sqlite_db.update_user(user.id, user.changes())
+
+        updates = [sql for sql in statements if sql.startswith("UPDATE")]
+        assert len(updates) == 1
+        assert "SET last_login = " in updates[0]
+        assert "name" not in updates[0]
+        stored = await sqlite_db.get_user_by_id("user123")
+        assert stored is not None
+        assert stored.last_login == user.last_login
+
+    async def test_should_coalesce_pending_updates_into_one_write(self) -> None:
+        database = InMemoryDatabase()
+        await database.create_user(
+            {
+                "id": "user123",
+                "email": "john.doe@example.com",
+                "name": "John Doe",
+                "hashed_password": "hashed",
+            }
+        )
+        calls = []
+        original = database.update_user
+
+        async def recording_update(user_id, data):  # noqa: ANN001, ANN202
+            calls.append((user_id, dict(data)))
+            await original(user_id, data)
+
+        database.update_user = recording_update
+        pending = PendingUserUpdates()
+        user = await database.get_user_by_id("user123")
+
+        user.last_login = datetime.now(UTC)
+        pending.stage_user(user)
+        user.name = "Johnny"
+        pending.stage_user(user)
+        written = await pending.flush(database)
+
+        assert written == 1
+        assert calls == [("user123", {"last_login": user.last_login, "name": "Johnny"})]
+        assert len(pending) == 0
+
+    async def test_should_restage_failed_updates(self) -> None:
+        pending = PendingUserUpdates()
+        pending.stage("missing", {"name": "Ghost"})
+
+        with pytest.raises(UserNotFoundError):
+            await pending.flush(InMemoryDatabase())
+
+        assert len(pending) == 1
+
+    async def test_should_write_only_last_login_on_login(self) -> None:
+        user = make_user()
+        database = Mock()
+        database.get_user_by_email = AsyncMock(return_value=user)
+        database.update_user = AsyncMock()
+        token_service = Mock()
+        token_service.verify_password.return_value = True
+        auth_service = AuthService(database, token_service, Mock())
+
+        result = await auth_service.login("john.doe@example.com", "ValidPassword123!")
+
+        _, update = database.update_user.call_args[0]
+        assert set(update) == {"last_login"}
+        assert result.user.last_login == update["last_login"]
+        assert result.user.dirty_fields == frozenset()
@@ -2,26 +2,251 @@
 """
 Python品質分析スクリプト
 quality-analysis.yml ワークフローから抽出
+
+レポートはストリーミングで走査するため、サイズに関係なくメモリ使用量は一定。
+内容のハッシュが前回と同じレポートは再解析せず、前回の値を再利用する。
+集計結果は python-summary.json に加えて SQLite の履歴テーブルに蓄積する。
+
+使い方:
+    python3 analyze-python-quality.py
+    python3 analyze-python-quality.py --query ruff_violations --since 2025-01-01
 """
 
+import argparse
+import hashlib
 import json
 import os
+import re
+import sqlite3
 import sys
 from datetime import datetime
 
+REPORTS_DIR = "quality-reports"
+HISTORY_DB = os.path.join(REPORTS_DIR, "quality-history.sqlite")
+CHUNK_SIZE = 1 << 20
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_NUMBER_TAIL = re.compile(r"[0-9.eE+-]*\Z")
+_DECODER = json.JSONDecoder()
+
+
+class JsonStream:
+    """チャンク単位で読み進める最小限の JSON ストリームパーサー
+
+    バッファに収まる値は json の C 実装でまとめて読み飛ばし、
+    収まらない配列・オブジェクトだけを要素単位で走査する。
+    """
+
+    def __init__(self, file, chunk_size=CHUNK_SIZE):
+        self.file = file
+        self.chunk_size = chunk_size
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self):
+        """次のチャンクを読み込む。読み込めなければ False"""
+        if self.eof:
+            return False
+        chunk = self.file.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self):
+        """空白を読み飛ばし、次の文字を返す（終端では空文字）"""
+        while True:
+            self.pos = _WHITESPACE.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf) or not self._fill():
+                return self.buf[self.pos:self.pos + 1]
+
+    def expect(self, char):
+        if self.peek() != char:
+            raise ValueError(f"'{char}' が必要です (offset {self.pos})")
+        self.pos += 1
+
+    def _decode(self, fallback=False):
+        """バッファ上の次の値をデコードし、(値, 終端) を返す
+
+        fallback が真のとき、バッファに収まらないコンテナでは None を返す。
+        """
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                if fallback and len(self.buf) - self.pos >= self.chunk_size:
+                    return None
+                if not self._fill():
+                    raise
+                continue
+            # バッファ末尾で終わる数値は途中で切れている可能性がある
+            if not _NUMBER_TAIL.match(self.buf, end) or not self._fill():
+                return value, end
+
+    def value(self):
+        """次の値を丸ごとデコードする（小さい値専用）"""
+        self.peek()
+        value, self.pos = self._decode()
+        return value
+
+    def skip(self):
+        """次の値をメモリに溜めずに読み飛ばす"""
+        char = self.peek()
+        decoded = self._decode(fallback=char in ("[", "{"))
+        if decoded is not None:
+            self.pos = decoded[1]
+        elif char == "[":
+            for _ in self.items():
+                self.skip()
+        else:
+            for _ in self.members():
+                self.skip()
+
+    def items(self):
+        """配列の各要素の直前で停止する。呼び出し側が要素を消費すること"""
+        self.expect("[")
+        if self.peek() == "]":
+            self.pos += 1
+            return
+        while True:
+            yield
+            if self.peek() == "]":
+                self.pos += 1
+                return
+            self.expect(",")
+
+    def members(self):
+        """オブジェクトのキーを順に返す。呼び出し側が値を消費すること"""
+        self.expect("{")
+        if self.peek() == "}":
+            self.pos += 1
+            return
+        while True:
+            key = self.value()
+            self.expect(":")
+            yield key
+            if self.peek() == "}":
+                self.pos += 1
+                return
+            self.expect(",")
+
+
+def count_items(stream):
+    """配列の要素数を数える"""
+    count = 0
+    for _ in stream.items():
+        stream.skip()
+        count += 1
+    return count
+
+
+def count_ruff(stream):
+    """Ruff: トップレベル配列の要素数"""
+    return count_items(stream) if stream.peek() == "[" else 0
+
+
+def count_member_items(name):
+    """トップレベルオブジェクトの name 配列の要素数を数える関数を返す"""
+    def count(stream):
+        if stream.peek() != "{":
+            return 0
+        total = 0
+        for key in stream.members():
+            if key == name and stream.peek() == "[":
+                total = count_items(stream)
+            else:
+                stream.skip()
+        return total
+    return count
 
-def load_json_safe(filepath):
-    """JSONファイルを安全に読み込む"""
+
+def coverage_percent(stream):
+    """カバレッジ: totals.percent_covered（files は読み飛ばす）"""
+    if stream.peek() != "{":
+        return 0
+    percent = 0
+    for key in stream.members():
+        if key == "totals" and stream.peek() == "{":
+            for total_key in stream.members():
+                if total_key == "percent_covered":
+                    percent = round(stream.value(), 2)
+                else:
+                    stream.skip()
+        else:
+            stream.skip()
+    return percent
+
+
+# メトリクス名 -> (レポートファイル, 集計関数)
+METRICS = {
+    "ruff_violations": ("ruff-detailed.json", count_ruff),
+    "mypy_errors": ("mypy-report.json", count_member_items("messages")),
+    "bandit_issues": ("bandit-report.json", count_member_items("results")),
+    "test_coverage": ("coverage.json", coverage_percent),
+}
+
+
+def file_digest(filepath):
+    """ファイル内容の SHA-256 をチャンク単位で計算する"""
+    digest = hashlib.sha256()
+    with open(filepath, "rb") as f:
+        while chunk := f.read(CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def open_history(path=HISTORY_DB):
+    """履歴データベースを開き、必要ならテーブルとインデックスを作成する"""
+    conn = sqlite3.connect(path)
+    conn.executescript(
+        """
+        CREATE TABLE IF NOT EXISTS quality_history (
+            date   TEXT NOT NULL,
+            metric TEXT NOT NULL,
+            value  REAL NOT NULL,
+            PRIMARY KEY (metric, date)
+        ) WITHOUT ROWID;
+        CREATE INDEX IF NOT EXISTS quality_history_date
+            ON quality_history (date);
+        CREATE TABLE IF NOT EXISTS report_digests (
+            report TEXT PRIMARY KEY,
+            sha256 TEXT NOT NULL,
+            value  REAL NOT NULL
+        );
+        """
+    )
+    return conn
+
+
+def measure(conn, metric, filepath, analyze):
+    """レポートを集計する。内容が前回と同じなら前回の値を返す"""
+    if not os.path.exists(filepath):
+        return 0, False
+    digest = file_digest(filepath)
+    row = conn.execute(
+        "SELECT sha256, value FROM report_digests WHERE report = ?", (metric,)
+    ).fetchone()
+    if row is not None and row[0] == digest:
+        return row[1], True
     try:
-        with open(filepath, 'r') as f:
-            return json.load(f)
-    except Exception:
-        return {}
+        with open(filepath, encoding="utf-8") as f:
+            value = analyze(JsonStream(f))
+    except (ValueError, UnicodeDecodeError):
+        # 壊れた・空のレポートは従来どおり 0 件として扱う
+        value = 0
+    conn.execute(
+        "INSERT OR REPLACE INTO report_digests (report, sha256, value) VALUES (?, ?, ?)",
+        (metric, digest, value),
+    )
+    return value, False
 
 
-def analyze_python_quality():
-    """Python品質レポートを集計し、サマリーを生成する"""
-    
+def analyze_python_quality(reports_dir=REPORTS_DIR, history_db=HISTORY_DB):
+    """Python品質レポートを集計し、サマリーを生成して履歴に記録する"""
+
     # レポート集計
     summary = {
         "timestamp": datetime.now().strftime('%Y-%m-%d'),
@@ -32,43 +257,71 @@ def analyze_python_quality():
         "complexity_score": "N/A",
         "security_vulnerabilities": 0
     }
-    
-    # Ruff統計
-    ruff_data = load_json_safe("quality-reports/ruff-detailed.json")
-    if isinstance(ruff_data, list):
-        summary["ruff_violations"] = len(ruff_data)
-    
-    # MyPy統計
-    mypy_data = load_json_safe("quality-reports/mypy-report.json")
-    if "messages" in mypy_data:
-        summary["mypy_errors"] = len(mypy_data["messages"])
-    
-    # Bandit統計
-    bandit_data = load_json_safe("quality-reports/bandit-report.json")
-    if "results" in bandit_data:
-        summary["bandit_issues"] = len(bandit_data["results"])
-    
-    # カバレッジ統計
-    coverage_data = load_json_safe("quality-reports/coverage.json")
-    if "totals" in coverage_data and "percent_covered" in coverage_data["totals"]:
-        summary["test_coverage"] = round(coverage_data["totals"]["percent_covered"], 2)
-    
-    # サマリーファイル出力
-    with open("quality-reports/python-summary.json", "w") as f:
+
+    conn = open_history(history_db)
+    try:
+        with conn:
+            for metric, (filename, analyze) in METRICS.items():
+                value, cached = measure(
+                    conn, metric, os.path.join(reports_dir, filename), analyze
+                )
+                summary[metric] = value if metric == "test_coverage" else int(value)
+                if cached:
+                    print(f"⏭️  {filename}: 前回から変更なし")
+            conn.executemany(
+                "INSERT OR REPLACE INTO quality_history (date, metric, value) "
+                "VALUES (?, ?, ?)",
+                [(summary["timestamp"], metric, summary[metric]) for metric in METRICS],
+            )
+    finally:
+        conn.close()
+
+    # サマリーファイル出力（既存のワークフロー向け）
+    with open(os.path.join(reports_dir, "python-summary.json"), "w") as f:
         json.dump(summary, f, indent=2)
-    
+
     print(f"Python品質サマリー: {summary}")
     return summary
 
 
+def query_history(conn, metric, since="0000-00-00", until="9999-99-99"):
+    """トレンドチャート用に期間内の (date, value) を日付順で返す"""
+    return conn.execute(
+        "SELECT date, value FROM quality_history "
+        "WHERE metric = ? AND date BETWEEN ? AND ? ORDER BY date",
+        (metric, since, until),
+    ).fetchall()
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="Python品質レポートの集計と履歴参照")
+    parser.add_argument("--reports-dir", default=REPORTS_DIR)
+    parser.add_argument("--history-db", help="既定: <reports-dir>/quality-history.sqlite")
+    parser.add_argument("--query", metavar="METRIC", choices=sorted(METRICS),
+                        help="集計せずに履歴を JSON で出力する")
+    parser.add_argument("--since", default="0000-00-00", help="YYYY-MM-DD")
+    parser.add_argument("--until", default="9999-99-99", help="YYYY-MM-DD")
+    return parser.parse_args(argv)
+
+
 if __name__ == "__main__":
-    if not os.path.exists("quality-reports"):
-        print("Error: quality-reports ディレクトリが見つかりません", file=sys.stderr)
+    args = parse_args(sys.argv[1:])
+    history_db = args.history_db or os.path.join(args.reports_dir, "quality-history.sqlite")
+
+    if not os.path.exists(args.reports_dir):
+        print(f"Error: {args.reports_dir} ディレクトリが見つかりません", file=sys.stderr)
         sys.exit(1)
-    
+
+    if args.query:
+        conn = open_history(history_db)
+        rows = query_history(conn, args.query, args.since, args.until)
+        conn.close()
+        print(json.dumps([{"date": d, "value": v} for d, v in rows]))
+        sys.exit(0)
+
     try:
-        summary = analyze_python_quality()
+        summary = analyze_python_quality(args.reports_dir, history_db)
         print("✅ Python品質分析完了")
     except Exception as e:
         print(f"❌ Python品質分析エラー: {e}", file=sys.stderr)
-        sys.exit(1)
\ No newline at end of file
+        sys.exit(1)
@@ -17,6 +17,18 @@ NC='\033[0m'
 DAYS_BACK=${1:-30}
 OUTPUT_DIR="quality-metrics"
 HTML_FILE="$OUTPUT_DIR/dashboard.html"
+SCRIPT_DIR="$(cd "$(dirname "$0")" && pwd)"
+SINCE=$(date -I -d "$DAYS_BACK days ago")
+
+# 品質履歴（analyze-python-quality.py が蓄積する SQLite）の場所
+# CIでは成果物を展開した quality-reports/、ローカルでは backend/quality-reports/
+if [ -n "${QUALITY_REPORTS_DIR:-}" ]; then
+    REPORTS_DIR="$QUALITY_REPORTS_DIR"
+elif [ -f "quality-reports/quality-history.sqlite" ]; then
+    REPORTS_DIR="quality-reports"
+else
+    REPORTS_DIR="backend/quality-reports"
+fi
 
 echo -e "${CYAN}📊 品質メトリクスダッシュボード生成${NC}"
 echo -e "${BLUE}📅 分析期間: 過去${DAYS_BACK}日間${NC}"
@@ -24,6 +36,12 @@ echo -e "${BLUE}📅 分析期間: 過去${DAYS_BACK}日間${NC}"
 # 出力ディレクトリ作成
 mkdir -p "$OUTPUT_DIR"
 
+# 履歴の期間クエリ: [{"date": ..., "value": ...}, ...] を日付順で返す
+query_history() {
+    python3 "$SCRIPT_DIR/analyze-python-quality.py" \
+        --reports-dir "$REPORTS_DIR" --query "$1" --since "$SINCE" 2>/dev/null || echo "[]"
+}
+
 # データ収集関数
 collect_git_metrics() {
     echo -e "${BLUE}📈 Gitメトリクス収集中...${NC}"
@@ -60,21 +78,17 @@ collect_quality_metrics() {
         # コード行数
         local python_loc=$(find src -name "*.py" -exec wc -l {} \; 2>/dev/null | awk '{sum+=$1} END {print sum+0}')
         
-        # テストカバレッジ
-        local coverage_percent="0"
-        if [ -f "coverage.xml" ]; then
-            coverage_percent=$(grep -o 'line-rate="[0-9.]*"' coverage.xml | head -1 | cut -d'"' -f2 | awk '{print int($1*100)}')
-        fi
+        cd ..
         
-        # Ruffエラー数
-        local ruff_errors=$(uv run ruff check . --output-format=json 2>/dev/null | jq '. | length' || echo "0")
+        # カバレッジ・Ruff違反数は履歴の最新値（レポートの再走査はしない）
+        local coverage_percent=$(jq '.[-1].value // 0 | floor' "$OUTPUT_DIR/coverage-trend.json")
+        local ruff_errors=$(jq '.[-1].value // 0 | floor' "$OUTPUT_DIR/ruff-trend.json")
         
         python_metrics="{
             \"lines_of_code\": $python_loc,
             \"test_coverage\": $coverage_percent,
             \"ruff_violations\": $ruff_errors
         }"
-        cd ..
     else
         python_metrics="{\"lines_of_code\": 0, \"test_coverage\": 0, \"ruff_violations\": 0}"
     fi
@@ -115,6 +129,18 @@ collect_quality_metrics() {
 EOF
 }
 
+collect_history_metrics() {
+    echo -e "${BLUE}🗂️ 品質履歴取得中 ($SINCE 以降)...${NC}"
+    
+    query_history test_coverage > "$OUTPUT_DIR/coverage-trend.json"
+    query_history ruff_violations > "$OUTPUT_DIR/ruff-trend.json"
+    
+    jq -c -n \
+        --slurpfile coverage "$OUTPUT_DIR/coverage-trend.json" \
+        --slurpfile ruff "$OUTPUT_DIR/ruff-trend.json" \
+        '{test_coverage: $coverage[0], ruff_violations: $ruff[0]}' > "$OUTPUT_DIR/trend-data.json"
+}
+
 collect_ci_metrics() {
     echo -e "${BLUE}🏗️ CI/CDメトリクス収集中...${NC}"
     
@@ -149,6 +175,7 @@ generate_html_dashboard() {
     local git_data=$(cat "$OUTPUT_DIR/git-metrics.json")
     local quality_data=$(cat "$OUTPUT_DIR/quality-metrics.json")
     local ci_data=$(cat "$OUTPUT_DIR/ci-metrics.json")
+    local trend_data=$(cat "$OUTPUT_DIR/trend-data.json")
     
     cat > "$HTML_FILE" <<'EOF'
 <!DOCTYPE html>
@@ -237,7 +264,7 @@ generate_html_dashboard() {
         </div>
 
         <div class="chart-container">
-            <h3>📊 品質トレンド（模擬データ）</h3>
+            <h3>📊 品質トレンド</h3>
             <canvas id="qualityChart" width="400" height="200"></canvas>
         </div>
 
@@ -252,6 +279,7 @@ generate_html_dashboard() {
         const gitData = GIT_DATA_PLACEHOLDER;
         const qualityData = QUALITY_DATA_PLACEHOLDER;
         const ciData = CI_DATA_PLACEHOLDER;
+        const trendData = TREND_DATA_PLACEHOLDER;
 
         // 生成時刻表示
         document.getElementById('generation-time').textContent = new Date().toLocaleString('ja-JP');
@@ -298,20 +326,20 @@ generate_html_dashboard() {
         
         badgesContainer.innerHTML = badges;
 
-        // 品質トレンドチャート（模擬データ）
+        // 品質トレンドチャート（品質履歴の期間クエリ結果）
         const ctx1 = document.getElementById('qualityChart').getContext('2d');
         new Chart(ctx1, {
             type: 'line',
             data: {
-                labels: ['1週前', '6日前', '5日前', '4日前', '3日前', '2日前', '昨日', '今日'],
+                labels: trendData.test_coverage.map(point => point.date),
                 datasets: [{
                     label: 'テストカバレッジ %',
-                    data: [75, 78, 80, 82, 81, 83, 85, coverage],
+                    data: trendData.test_coverage.map(point => point.value),
                     borderColor: '#27ae60',
                     tension: 0.1
                 }, {
                     label: 'Ruff違反数',
-                    data: [15, 12, 8, 6, 4, 2, 1, qualityData.python.ruff_violations],
+                    data: trendData.ruff_violations.map(point => point.value),
                     borderColor: '#e74c3c',
                     tension: 0.1
                 }]
@@ -356,10 +384,12 @@ EOF
     sed -i "s/GIT_DATA_PLACEHOLDER/$git_data/g" "$HTML_FILE"
     sed -i "s/QUALITY_DATA_PLACEHOLDER/$quality_data/g" "$HTML_FILE"
     sed -i "s/CI_DATA_PLACEHOLDER/$ci_data/g" "$HTML_FILE"
+    sed -i "s/TREND_DATA_PLACEHOLDER/$trend_data/g" "$HTML_FILE"
 }
 
 # メイン実行
 collect_git_metrics
+collect_history_metrics
 collect_quality_metrics
 collect_ci_metrics
 generate_html_dashboard